@@ -0,0 +1,65 @@
+"""Benchmark the import time of brendapy.
+
+`import brendapy` is run in fresh interpreters, the best run is reported.
+The import must not load the lazily loaded resources (taxonomy, ChEBI, BTO).
+With `--budget` the exit code is 1 if the import takes longer than the
+budget in seconds.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 10 --budget 0.5
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+
+IMPORT_SCRIPT = """
+import json, sys, time
+t_start = time.perf_counter()
+import brendapy
+seconds = time.perf_counter() - t_start
+from brendapy import registry
+print(json.dumps({
+    "seconds": seconds,
+    "loaded": [name for name in registry._RESOURCES if registry.is_loaded(name)],
+    "modules": [m for m in ("pronto", "depinfo", "requests") if m in sys.modules],
+}))
+"""
+
+
+def bench_import(repeat: int = 5) -> Dict:
+    """Benchmark import of brendapy in fresh interpreters.
+
+    :param repeat: number of runs
+    :return: dict with the time of the best run, the loaded resources and the
+             loaded optional modules
+    """
+    results: List[Dict] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    return min(results, key=lambda result: result["seconds"])
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--budget", type=float, help="budget in seconds")
+    args = arg_parser.parse_args()
+
+    result = bench_import(repeat=args.repeat)
+    print(
+        f"import brendapy: {result['seconds']:.3f} s, "
+        f"loaded resources: {result['loaded']}, "
+        f"loaded modules: {result['modules']}"
+    )
+    if args.budget is not None and result["seconds"] > args.budget:
+        print(f"import exceeds budget of {args.budget:.3f} s")
+        sys.exit(1)
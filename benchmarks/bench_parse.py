@@ -0,0 +1,79 @@
+"""Benchmark parse throughput of `BrendaParser._parse_info_dict`.
+
+All entries of the BRENDA file are parsed `--repeat` times, the best run is
+reported as entries/s and MB/s of entry text.
+
+    python benchmarks/bench_parse.py
+    python benchmarks/bench_parse.py --brenda-file brenda_download.txt --repeat 5
+    python benchmarks/bench_parse.py --fields KM TN
+    python benchmarks/bench_parse.py --metrics metrics.json
+"""
+import argparse
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from brendapy import BrendaParser
+from brendapy.settings import BRENDA_FILE
+
+
+def bench_parse(
+    brenda_file: str,
+    repeat: int = 3,
+    fields: Optional[Sequence[str]] = None,
+    metrics: Optional[str] = None,
+) -> Dict[str, float]:
+    """Benchmark parsing of all entries of the BRENDA file.
+
+    :param brenda_file: BRENDA text file
+    :param repeat: number of runs
+    :param fields: BRENDA keys to parse, all keys if None
+    :param metrics: JSON file for the metrics of the parse stages of all runs,
+                    metrics are not collected if None
+    :return: dict with the timings of the best run
+    """
+    parser = BrendaParser(
+        brenda_file=brenda_file, fields=fields, metrics=metrics is not None
+    )
+    entries: List[Tuple[str, str]] = list(parser.ec_text.items())
+    n_bytes = sum(len(ec_str.encode("utf-8")) for _, ec_str in entries)
+
+    times = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        for ec, ec_str in entries:
+            BrendaParser._parse_info_dict(
+                ec, ec_str, fields=parser.fields, metrics=parser.metrics
+            )
+        times.append(time.perf_counter() - t_start)
+
+    best = min(times)
+    if parser.metrics is not None:
+        parser.metrics.to_json(metrics)
+    return {
+        "entries": len(entries),
+        "bytes": n_bytes,
+        "seconds": best,
+        "entries_per_s": len(entries) / best,
+        "mb_per_s": n_bytes / 1024**2 / best,
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--brenda-file", default=str(BRENDA_FILE))
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--fields", nargs="+", help="BRENDA keys to parse")
+    arg_parser.add_argument("--metrics", help="JSON file for the parse metrics")
+    args = arg_parser.parse_args()
+
+    # logging of the parsed items is not part of the benchmark
+    logging.disable(logging.CRITICAL)
+    result = bench_parse(
+        args.brenda_file, repeat=args.repeat, fields=args.fields, metrics=args.metrics
+    )
+    print(
+        f"{result['entries']} entries, {result['bytes'] / 1024**2:.2f} MB in "
+        f"{result['seconds']:.3f} s: {result['entries_per_s']:.1f} entries/s, "
+        f"{result['mb_per_s']:.2f} MB/s"
+    )
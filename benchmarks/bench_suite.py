@@ -0,0 +1,171 @@
+"""Benchmark suite on synthetic BRENDA files from 1x to 10x size.
+
+Synthetic BRENDA files and an NCBI taxonomy dump are written with
+`brendapy.synthetic`, so that the benchmarks run offline and are
+reproducible. For every scale the suite measures
+
+    parse_entry_strings    splitting of the BRENDA file in entries
+    parse_info_dict        parsing of all entries (`_parse_info_dict`)
+    get_proteins           parsing and creating the proteins of all ECs
+    taxonomy_ids           taxonomy id lookup for the organisms of all proteins
+    taxonomy_common_nodes  common nodes of all proteins with a reference
+    taxonomy_rank          ancestors at rank family of all proteins
+
+A scale of 1 corresponds to `--ecs` EC numbers, the full BRENDA release has
+around 8000 EC numbers.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --scales 1 2 5 10 --ecs 1000 --json suite.json
+"""
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from brendapy import BrendaParser, registry, synthetic
+from brendapy.taxonomy import parse_taxonomy_data
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    """Best wall time of function in seconds."""
+    times = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t_start)
+    return min(times)
+
+
+def bench_scale(brenda_file: Path, repeat: int = 3) -> Dict[str, float]:
+    """Benchmark the parsing and taxonomy lookups for BRENDA file.
+
+    :param brenda_file: synthetic BRENDA file
+    :param repeat: number of runs, the best run is reported
+    :return: dict of benchmark and time in seconds
+    """
+    results: Dict[str, float] = {}
+    results["parse_entry_strings"] = _best_time(
+        lambda: BrendaParser.parse_entry_strings(brenda_file), repeat
+    )
+
+    parser = BrendaParser(brenda_file=brenda_file, index=False)
+    entries = list(parser.ec_text.items())
+    results["parse_info_dict"] = _best_time(
+        lambda: [BrendaParser._parse_info_dict(ec, ec_str) for ec, ec_str in entries],
+        repeat,
+    )
+
+    def get_proteins() -> None:
+        parser.ec_data.clear()
+        parser.proteins.clear()
+        for ec in parser.keys():
+            parser.get_proteins(ec)
+
+    results["get_proteins"] = _best_time(get_proteins, repeat)
+
+    taxonomy = registry.get_resource("taxonomy")
+    organisms = [
+        protein.organism
+        for ec in parser.keys()
+        for protein in parser.get_proteins(ec).values()
+    ]
+    results["taxonomy_ids"] = _best_time(
+        lambda: [taxonomy.get_taxonomy_id(name, warn=False) for name in organisms],
+        repeat,
+    )
+    tax_ids = [taxonomy.get_taxonomy_id(name, warn=False) for name in organisms]
+    tax_id_ref = taxonomy.get_taxonomy_id(synthetic.organism_names(1)[0])
+    results["taxonomy_common_nodes"] = _best_time(
+        lambda: taxonomy.find_common_nodes(tax_ids, tax_id_ref), repeat
+    )
+    results["taxonomy_rank"] = _best_time(
+        lambda: taxonomy.ancestor_at_rank(tax_ids, "family"), repeat
+    )
+    results["proteins"] = len(organisms)
+    results["mb"] = brenda_file.stat().st_size / 1024**2
+    return results
+
+
+def bench_suite(
+    scales: Sequence[int] = (1, 2, 5, 10),
+    n_ecs: int = 200,
+    proteins_per_ec: int = 10,
+    n_species: int = 10000,
+    repeat: int = 3,
+    directory: Path = None,
+) -> List[Dict[str, float]]:
+    """Run the benchmarks for synthetic BRENDA files of the scales.
+
+    :param scales: multiples of n_ecs
+    :param n_ecs: number of EC numbers of scale 1
+    :param proteins_per_ec: number of proteins per EC number
+    :param n_species: number of species of the synthetic taxonomy
+    :param repeat: number of runs, the best run is reported
+    :param directory: directory for the synthetic files, temporary if None
+    :return: list of results per scale
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(directory or tmp_dir)
+        taxdmp = synthetic.write_taxdmp(directory / "taxdmp.zip", n_species=n_species)
+        taxonomy_file = directory / "taxonomy.bin"
+        parse_taxonomy_data(f_zip=taxdmp, f_out=taxonomy_file)
+        synthetic.register_resources(taxonomy_file=taxonomy_file)
+
+        results = []
+        for scale in scales:
+            brenda_file = synthetic.write_brenda_file(
+                directory / f"brenda_{scale}x.txt",
+                n_ecs=scale * n_ecs,
+                proteins_per_ec=proteins_per_ec,
+                n_species=n_species,
+            )
+            result = bench_scale(brenda_file, repeat=repeat)
+            result["scale"] = scale
+            results.append(result)
+        return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 5, 10])
+    arg_parser.add_argument("--ecs", type=int, default=200, help="ECs of scale 1")
+    arg_parser.add_argument("--proteins", type=int, default=10, help="per EC")
+    arg_parser.add_argument("--species", type=int, default=10000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--directory", help="directory for synthetic files")
+    arg_parser.add_argument("--json", help="JSON file for the results")
+    args = arg_parser.parse_args()
+
+    # logging of the parsed items is not part of the benchmark
+    logging.disable(logging.CRITICAL)
+    suite = bench_suite(
+        scales=args.scales,
+        n_ecs=args.ecs,
+        proteins_per_ec=args.proteins,
+        n_species=args.species,
+        repeat=args.repeat,
+        directory=args.directory,
+    )
+    columns = [
+        "parse_entry_strings",
+        "parse_info_dict",
+        "get_proteins",
+        "taxonomy_ids",
+        "taxonomy_common_nodes",
+        "taxonomy_rank",
+    ]
+    print(
+        f"{'scale':>5} {'MB':>7} {'proteins':>9} "
+        + " ".join(f"{c:>22}" for c in columns)
+    )
+    for result in suite:
+        print(
+            f"{result['scale']:>5} {result['mb']:>7.1f} {result['proteins']:>9} "
+            + " ".join(f"{result[c]:>20.4f} s" for c in columns)
+        )
+    if args.json:
+        with open(args.json, "w") as f_json:
+            json.dump(suite, f_json, indent=2)
@@ -7,9 +7,8 @@ __author__ = "Matthias Koenig"
 __version__ = "0.5.0"
 
 
-from depinfo import print_dependencies  # type: ignore
-
-
 def show_versions() -> None:
     """Print dependency information."""
+    from depinfo import print_dependencies  # type: ignore
+
     print_dependencies("pymetadata")
@@ -0,0 +1,173 @@
+"""Bounded cache for parsed BRENDA information.
+
+The parser caches the parsed info dicts and the proteins of the EC numbers.
+The caches are least recently used (LRU) caches which are bounded by the
+number of entries and/or by an approximate size in bytes. Hits, misses and
+evictions are counted to tune memory against latency.
+
+    parser = BrendaParser(cache_entries=100, cache_bytes=500 * 1024**2)
+    parser.get_proteins("1.1.1.1")
+    parser.cache_info()
+"""
+import sys
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterator,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+
+def approximate_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate size of object in bytes.
+
+    The sizes of the contained objects of dicts, lists, tuples and sets are
+    added, objects referenced multiple times are counted once.
+
+    :param obj: object
+    :param seen: ids of objects already counted
+    :return: size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approximate_size(key, seen) + approximate_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approximate_size(item, seen)
+    return size
+
+
+class LRUCache(MutableMapping):
+    """Mapping with least recently used eviction.
+
+    Entries are evicted if the cache has more than `max_entries` entries or
+    if the approximate size of the entries exceeds `max_bytes`. An entry
+    larger than `max_bytes` is not kept. Without limits the cache is
+    unbounded.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = approximate_size,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        """Initialize cache.
+
+        :param max_entries: maximal number of entries, unbounded if None
+        :param max_bytes: maximal approximate size in bytes, unbounded if None
+        :param sizeof: function for the size of a value in bytes, only used
+                       with `max_bytes`
+        :param on_evict: function called with key and value of evicted entries
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, key: Hashable) -> Any:
+        """Get value and mark entry as recently used."""
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def touch(self, key: Hashable) -> None:
+        """Mark entry as recently used, does not count as access."""
+        self._data.move_to_end(key)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        """Set value and evict least recently used entries."""
+        if key in self._data:
+            _, size = self._data.pop(key)
+            self.size -= size
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        self._data[key] = (value, size)
+        self.size += size
+        self._evict()
+
+    def __delitem__(self, key: Hashable) -> None:
+        """Remove entry."""
+        _, size = self._data.pop(key)
+        self.size -= size
+
+    def evict(self, key: Hashable) -> None:
+        """Remove entry and count it as eviction, e.g. with a dependent entry."""
+        value, size = self._data.pop(key)
+        self.size -= size
+        self.evictions += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def __contains__(self, key: object) -> bool:
+        """Check if entry exists, does not count as access."""
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over keys from least to most recently used."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Get number of entries."""
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Remove all entries, the statistics are kept."""
+        self._data.clear()
+        self.size = 0
+
+    def _is_full(self) -> bool:
+        if self.max_entries is not None and len(self._data) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def _evict(self) -> None:
+        while self._data and self._is_full():
+            self.evict(next(iter(self._data)))
+
+    def cache_info(self) -> CacheInfo:
+        """Get statistics of the cache."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._data),
+            size=self.size,
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+        )
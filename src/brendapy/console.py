@@ -14,4 +14,4 @@ custom_theme = Theme(
     }
 )
 
-console = Console(record=True, theme=custom_theme)
+console = Console(theme=custom_theme)
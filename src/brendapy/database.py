@@ -0,0 +1,537 @@
+"""SQLite database of the parsed BRENDA information.
+
+The parsed info dicts and the protein information are stored in normalized
+tables, so that questions over all EC numbers (e.g. all KM values for ATP)
+are indexed queries instead of parsing all entries.
+
+Tables:
+
+    entries         ec, ID and checksum of the BRENDA entry
+    names           RN, RE, RT and SN information of the EC
+    proteins        PR information with organism, taxonomy and uniprot
+    ec_references   RF information
+    items           items of all other BRENDA keys (KM, KI, ST, ...), the
+                    key is stored in the `bid` column
+    item_proteins   proteins the items belong to
+
+The database is built or updated for a new BRENDA release via
+
+    python -m brendapy.database
+
+For a new release only the changed entries are parsed, see `update_database`.
+"""
+import heapq
+import json
+import os
+import sqlite3
+from collections import OrderedDict, defaultdict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from brendapy.flatfile import ReleaseDiff
+from brendapy.log import get_logger
+
+
+logger = get_logger(__name__)
+
+DATABASE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entries (
+    ec TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    id TEXT,
+    checksum TEXT
+);
+CREATE TABLE names (
+    ec TEXT NOT NULL,
+    bid TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE proteins (
+    ec TEXT NOT NULL,
+    protein_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    organism TEXT,
+    taxonomy INTEGER,
+    uniprot TEXT,
+    data TEXT,
+    comment TEXT,
+    refs TEXT,
+    PRIMARY KEY (ec, protein_id)
+);
+CREATE TABLE ec_references (
+    ec TEXT NOT NULL,
+    rid INTEGER NOT NULL,
+    info TEXT,
+    pubmed INTEGER,
+    PRIMARY KEY (ec, rid)
+);
+CREATE TABLE items (
+    item_id INTEGER PRIMARY KEY,
+    ec TEXT NOT NULL,
+    bid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT,
+    comment TEXT,
+    refs TEXT,
+    units TEXT,
+    value REAL,
+    substrate TEXT,
+    chebi TEXT
+);
+CREATE TABLE item_proteins (
+    item_id INTEGER NOT NULL,
+    ec TEXT NOT NULL,
+    protein_id INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX idx_names_ec ON names (ec);
+CREATE INDEX idx_proteins_organism ON proteins (organism);
+CREATE INDEX idx_proteins_taxonomy ON proteins (taxonomy);
+CREATE INDEX idx_proteins_uniprot ON proteins (uniprot);
+CREATE INDEX idx_items_ec ON items (ec, bid);
+CREATE INDEX idx_items_bid ON items (bid);
+CREATE INDEX idx_items_substrate ON items (substrate);
+CREATE INDEX idx_items_chebi ON items (chebi);
+CREATE INDEX idx_item_proteins_item ON item_proteins (item_id);
+CREATE INDEX idx_item_proteins_protein ON item_proteins (ec, protein_id);
+"""
+
+# optional fields of the items
+ITEM_FIELDS = ["comment", "units", "value", "substrate", "chebi"]
+
+
+def build_database(parser: Any, path: Union[Path, str]) -> "BrendaDatabase":
+    """Parse all EC numbers of the parser and write the SQLite database.
+
+    The database is written to a temporary file which replaces an existing
+    database when complete.
+    All BRENDA keys are stored, independent of the fields of the parser.
+
+    :param parser: BrendaParser for the BRENDA file
+    :param path: path of the database
+    :return: database
+    """
+    logger.info(f"Building BRENDA database `{path}`")
+    path = Path(path)
+    path_tmp = Path(f"{path}.tmp")
+    if path_tmp.exists():
+        path_tmp.unlink()
+
+    entry_index = parser.entry_index
+    try:
+        with closing(sqlite3.connect(path_tmp)) as con:
+            with con:
+                con.executescript(SCHEMA)
+                con.execute(
+                    "INSERT INTO info VALUES (?, ?)",
+                    ("version", str(DATABASE_VERSION)),
+                )
+                con.execute(
+                    "INSERT INTO info VALUES (?, ?)",
+                    ("sha256", entry_index.sha256 if entry_index else None),
+                )
+                for position, (ec, ec_data) in enumerate(
+                    parser.iter_entries(fields=parser.BRENDA_KEYS)
+                ):
+                    checksum = entry_index.checksums.get(ec) if entry_index else None
+                    _insert_entry(
+                        con, ec, ec_data, position=position, checksum=checksum
+                    )
+    except BaseException:
+        # no half-written database is left behind
+        if path_tmp.exists():
+            path_tmp.unlink()
+        raise
+    os.replace(path_tmp, path)
+    return BrendaDatabase(path)
+
+
+def update_database(
+    parser: Any, path: Union[Path, str]
+) -> Tuple["BrendaDatabase", ReleaseDiff]:
+    """Update the database for a new BRENDA release.
+
+    Only the added and changed entries are parsed and inserted, the rows of
+    removed and changed entries are deleted. If no valid database exists the
+    database is built.
+
+    :param parser: BrendaParser for the BRENDA file of the new release
+    :param path: path of the database
+    :return: database, release diff to the entries of the existing database
+    """
+    checksums: Dict[str, Optional[str]] = {}
+    valid = False
+    if Path(path).exists():
+        try:
+            with closing(sqlite3.connect(path)) as con:
+                info = dict(con.execute("SELECT key, value FROM info").fetchall())
+                if info.get("version") == str(DATABASE_VERSION):
+                    checksums = dict(con.execute("SELECT ec, checksum FROM entries"))
+                    valid = True
+        except sqlite3.DatabaseError:
+            pass
+        if not valid:
+            logger.warning(f"BRENDA database is rebuilt: `{path}`")
+
+    diff = parser.release_diff(checksums)
+    if not valid:
+        return build_database(parser, path), diff
+
+    logger.info(
+        f"Updating BRENDA database `{path}`: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {len(diff.changed)} changed"
+    )
+    entry_index = parser.entry_index
+    positions = {ec: k for k, ec in enumerate(parser.keys())}
+    # the update is rolled back if it fails
+    with closing(sqlite3.connect(path)) as con:
+        with con:
+            for ec in diff.removed + diff.changed:
+                _delete_entry(con, ec)
+            con.executemany(
+                "UPDATE entries SET position = ? WHERE ec = ?",
+                [(positions[ec], ec) for ec in diff.unchanged],
+            )
+            for ec, ec_data in parser.iter_entries(
+                ecs=diff.outdated, fields=parser.BRENDA_KEYS
+            ):
+                checksum = entry_index.checksums.get(ec) if entry_index else None
+                _insert_entry(
+                    con, ec, ec_data, position=positions[ec], checksum=checksum
+                )
+            con.execute(
+                "UPDATE info SET value = ? WHERE key = 'sha256'",
+                (entry_index.sha256 if entry_index else None,),
+            )
+    return BrendaDatabase(path), diff
+
+
+def _insert_entry(
+    con: sqlite3.Connection,
+    ec: str,
+    ec_data: Dict,
+    position: int,
+    checksum: Optional[str] = None,
+) -> None:
+    """Insert parsed info dict and protein information of EC."""
+    from brendapy.parser import BrendaProtein
+
+    _insert_info_dict(con, ec, ec_data, position=position, checksum=checksum)
+    proteins = [
+        BrendaProtein(ec=ec, key=key, data=ec_data) for key in ec_data["PR"].keys()
+    ]
+    con.executemany(
+        "UPDATE proteins SET organism = ?, taxonomy = ?, uniprot = ? "
+        "WHERE ec = ? AND protein_id = ?",
+        [(p.organism, p.taxonomy, p.uniprot, ec, p.protein_id) for p in proteins],
+    )
+
+
+def _delete_entry(con: sqlite3.Connection, ec: str) -> None:
+    """Delete all rows of EC."""
+    for table in [
+        "item_proteins",
+        "items",
+        "ec_references",
+        "proteins",
+        "names",
+        "entries",
+    ]:
+        con.execute(f"DELETE FROM {table} WHERE ec = ?", (ec,))
+
+
+def _insert_info_dict(
+    con: sqlite3.Connection,
+    ec: str,
+    ec_data: Dict,
+    position: int,
+    checksum: Optional[str] = None,
+) -> None:
+    """Insert parsed info dict of EC in the tables."""
+    con.execute(
+        "INSERT INTO entries VALUES (?, ?, ?, ?)",
+        (ec, position, ec_data.get("ID"), checksum),
+    )
+    for bid, values in ec_data.items():
+        if bid == "ID":
+            continue
+        elif bid in {"RN", "RE", "RT", "SN"}:
+            con.executemany(
+                "INSERT INTO names VALUES (?, ?, ?)",
+                [(ec, bid, name) for name in sorted(values)],
+            )
+        elif bid == "PR":
+            con.executemany(
+                "INSERT INTO proteins (ec, protein_id, position, data, comment, "
+                "refs) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        ec,
+                        pid,
+                        k,
+                        info["data"],
+                        info.get("comment"),
+                        json.dumps(info["refs"]),
+                    )
+                    for k, (pid, info) in enumerate(values.items())
+                ],
+            )
+        elif bid == "RF":
+            con.executemany(
+                "INSERT INTO ec_references VALUES (?, ?, ?, ?)",
+                [
+                    (ec, rid, info["info"], info.get("pubmed"))
+                    for rid, info in values.items()
+                ],
+            )
+        else:
+            # items are shared between proteins, the order of the items
+            # and the proteins is restored from the positions.
+            items = _item_order(values)
+            item_ids: Dict[int, int] = {}
+            for k, info in enumerate(items):
+                cursor = con.execute(
+                    "INSERT INTO items (ec, bid, position, data, refs, "
+                    "comment, units, value, substrate, chebi) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        ec,
+                        bid,
+                        k,
+                        info["data"],
+                        json.dumps(info["refs"]),
+                        *(info.get(key) for key in ITEM_FIELDS),
+                    ),
+                )
+                item_ids[id(info)] = cursor.lastrowid  # type: ignore
+            con.executemany(
+                "INSERT INTO item_proteins VALUES (?, ?, ?, ?)",
+                [
+                    (item_ids[id(info)], ec, pid, k)
+                    for k, (pid, infos) in enumerate(values.items())
+                    for info in infos
+                ],
+            )
+
+
+def _item_order(values: Mapping[int, List[Dict]]) -> List[Dict]:
+    """Get order in which the items were stored for the proteins.
+
+    Items are shared between the lists of the proteins. The order has to
+    keep the order of every list and the order in which the proteins were
+    added, i.e. the first items of the proteins are in protein order.
+    """
+    items: Dict[int, Dict] = {}
+    edges: Dict[int, List[int]] = defaultdict(list)
+    indegree: Dict[int, int] = defaultdict(int)
+
+    def add_edge(a: Dict, b: Dict) -> None:
+        if a is not b:
+            edges[id(a)].append(id(b))
+            indegree[id(b)] += 1
+
+    first_items = []
+    for infos in values.values():
+        for info in infos:
+            items.setdefault(id(info), info)
+        for a, b in zip(infos, infos[1:]):
+            add_edge(a, b)
+        first_items.append(infos[0])
+    for a, b in zip(first_items, first_items[1:]):
+        add_edge(a, b)
+
+    # topological sort, ties resolved by first occurrence
+    rank = {key: k for k, key in enumerate(items)}
+    heap = [(rank[key], key) for key in items if indegree[key] == 0]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        _, key = heapq.heappop(heap)
+        order.append(items[key])
+        for key_next in edges[key]:
+            indegree[key_next] -= 1
+            if indegree[key_next] == 0:
+                heapq.heappush(heap, (rank[key_next], key_next))
+    return order
+
+
+class BrendaDatabase(Mapping):
+    """SQLite database of parsed BRENDA information.
+
+    Read-only mapping of EC numbers to the info dicts, which are restored
+    from the tables. Use `query` for queries over all EC numbers.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """Open database.
+
+        :param path: path of the database
+        """
+        self.path = path
+        if not Path(path).exists():
+            raise IOError(f"BRENDA database does not exist: `{path}`")
+        self.con = sqlite3.connect(f"{Path(path).as_uri()}?mode=ro", uri=True)
+        self.con.row_factory = sqlite3.Row
+        info = dict(self.con.execute("SELECT key, value FROM info").fetchall())
+        if info.get("version") != str(DATABASE_VERSION):
+            raise IOError(
+                f"BRENDA database version `{info.get('version')}` is not "
+                f"supported, rebuild the database: `{path}`"
+            )
+        self.sha256: Optional[str] = info.get("sha256")
+        self._ecs: List[str] = [
+            row["ec"]
+            for row in self.con.execute("SELECT ec FROM entries ORDER BY position")
+        ]
+        self._ec_set = set(self._ecs)
+
+    @property
+    def checksums(self) -> Dict[str, Optional[str]]:
+        """Checksums of the BRENDA entries the info dicts were parsed from."""
+        return dict(
+            self.con.execute("SELECT ec, checksum FROM entries ORDER BY position")
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.con.close()
+
+    def query(self, sql: str, parameters: Any = ()) -> List[sqlite3.Row]:
+        """Run SQL query on the database.
+
+        :param sql: SQL query
+        :param parameters: parameters of the query
+        :return: list of rows
+        """
+        return self.con.execute(sql, parameters).fetchall()
+
+    def kinetics(
+        self,
+        bid: str = "KM",
+        substrate: Optional[str] = None,
+        chebi: Optional[str] = None,
+        organism: Optional[str] = None,
+        taxonomy: Optional[int] = None,
+        ec: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query kinetic values of all proteins.
+
+        :param bid: BRENDA key, e.g. KM, KI, TN, IC50, KKM, SA
+        :param substrate: substrate name
+        :param chebi: ChEBI id of substrate
+        :param organism: organism of protein
+        :param taxonomy: NCBI taxonomy id of protein
+        :param ec: EC number
+        :return: list of values with ec, protein_id, organism and taxonomy
+        """
+        sql = (
+            "SELECT i.ec, ip.protein_id, p.organism, p.taxonomy, i.value, "
+            "i.units, i.substrate, i.chebi, i.data, i.comment "
+            "FROM items i "
+            "JOIN item_proteins ip ON ip.item_id = i.item_id "
+            "JOIN proteins p ON p.ec = ip.ec AND p.protein_id = ip.protein_id "
+            "WHERE i.bid = ?"
+        )
+        parameters: List[Any] = [bid]
+        for column, value in [
+            ("i.substrate", substrate),
+            ("i.chebi", chebi),
+            ("p.organism", organism),
+            ("p.taxonomy", taxonomy),
+            ("i.ec", ec),
+        ]:
+            if value is not None:
+                sql += f" AND {column} = ?"
+                parameters.append(value)
+        sql += " ORDER BY i.item_id, ip.position"
+        return [dict(row) for row in self.query(sql, parameters)]
+
+    def info_dict(self, ec: str) -> Dict:
+        """Restore the parsed info dict for EC.
+
+        :param ec: EC number
+        :return: info dict as returned by `BrendaParser._parse_info_dict`
+        """
+        if ec not in self._ec_set:
+            raise KeyError(ec)
+
+        results: Dict = defaultdict(OrderedDict)
+        row = self.con.execute("SELECT id FROM entries WHERE ec = ?", (ec,)).fetchone()
+        if row["id"] is not None:
+            results["ID"] = row["id"]
+
+        for row in self.con.execute(
+            "SELECT bid, name FROM names WHERE ec = ? ORDER BY rowid", (ec,)
+        ):
+            if isinstance(results[row["bid"]], OrderedDict):
+                results[row["bid"]] = set()
+            results[row["bid"]].add(row["name"])
+
+        for row in self.con.execute(
+            "SELECT protein_id, data, comment, refs FROM proteins WHERE ec = ? "
+            "ORDER BY position",
+            (ec,),
+        ):
+            info = {"data": row["data"], "refs": json.loads(row["refs"])}
+            if row["comment"] is not None:
+                info["comment"] = row["comment"]
+            results["PR"][row["protein_id"]] = info
+
+        for row in self.con.execute(
+            "SELECT rid, info, pubmed FROM ec_references WHERE ec = ? ORDER BY rowid",
+            (ec,),
+        ):
+            info = {"info": row["info"]}
+            if row["pubmed"] is not None:
+                info["pubmed"] = row["pubmed"]
+            results["RF"][row["rid"]] = info
+
+        items: Dict[int, Dict] = {}
+        for row in self.con.execute(
+            "SELECT i.item_id, i.bid, i.data, i.refs, i.comment, i.units, i.value, "
+            "i.substrate, i.chebi, ip.protein_id FROM items i "
+            "JOIN item_proteins ip ON ip.item_id = i.item_id "
+            "WHERE i.ec = ? ORDER BY i.bid, i.position, ip.position",
+            (ec,),
+        ):
+            item = items.get(row["item_id"])
+            if item is None:
+                item = {"data": row["data"], "refs": json.loads(row["refs"])}
+                for key in ITEM_FIELDS:
+                    if row[key] is not None:
+                        item[key] = row[key]
+                items[row["item_id"]] = item
+            pid = row["protein_id"]
+            if pid in results[row["bid"]]:
+                results[row["bid"]][pid].append(item)
+            else:
+                results[row["bid"]][pid] = [item]
+
+        return results
+
+    def __getitem__(self, ec: str) -> Dict:
+        """Restore info dict for EC."""
+        return self.info_dict(ec)
+
+    def __contains__(self, ec: object) -> bool:
+        """Check if EC exists in database."""
+        return ec in self._ec_set
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over EC numbers."""
+        return iter(self._ecs)
+
+    def __len__(self) -> int:
+        """Get number of EC numbers."""
+        return len(self._ecs)
+
+
+if __name__ == "__main__":
+    from brendapy import BrendaParser
+    from brendapy.settings import BRENDA_DATABASE
+
+    update_database(BrendaParser(mmap=True), BRENDA_DATABASE)
@@ -0,0 +1,186 @@
+"""Diagnostics of the parsing of BRENDA information.
+
+Issues found during parsing (e.g. `more` items, `-999` values, substrates
+which are not in ChEBI or tissues which are not in BTO) are counted by
+(ec, bid, category) instead of being logged one by one. A bounded number of
+sample messages is kept per category. Messages are only formatted for the
+samples and for debug logging.
+
+    parser = BrendaParser()
+    parser.parse_info_dicts()
+    print(parser.diagnostics.report())
+
+At the end of `parse_info_dicts` and `iter_entries` one line per category is
+logged for the issues of the parse.
+"""
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from brendapy.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# category: (log level, message template for the detail of the issue)
+CATEGORIES: Dict[str, Tuple[int, str]] = {
+    "key_not_supported": (logging.ERROR, "BRENDA key not supported in line: `{}`"),
+    "reference_not_parsed": (logging.ERROR, "Reference could not be parsed: `{}`"),
+    "comment_not_parsed": (logging.ERROR, "comment could not be parsed: '{}'"),
+    "empty_data": (logging.WARNING, "empty information not stored: '{}'"),
+    "more_data": (logging.INFO, "'more' data not stored: {}"),
+    "value_999": (logging.INFO, "'-999' values not parsed: {}"),
+    "substrate_not_in_chebi": (logging.INFO, "Substrate not found in CHEBI: '{}'"),
+    "value_not_float": (logging.ERROR, "data could not be converted to float: {}"),
+    "generic_synonym": (logging.INFO, "generic synonyms are not stored: {}"),
+    "item_not_parsed": (logging.ERROR, "could not be parsed: `{}`"),
+    "organism_not_parsed": (logging.WARNING, "Organism could not be parsed from: '{}'"),
+    "taxonomy_not_resolved": (
+        logging.WARNING,
+        "Taxonomy id could not be resolved for species/organism: {}",
+    ),
+    "tissue_not_in_bto": (
+        logging.ERROR,
+        "Source/Tissue not found in Brenda Tissue Ontology (BTO): '{}'",
+    ),
+}
+
+
+class DiagnosticsCollector(object):
+    """Collector of parse issues.
+
+    Issues are counted by (ec, bid, category), the first `max_samples`
+    messages of every category are kept.
+    """
+
+    def __init__(self, max_samples: int = 10):
+        """Initialize collector.
+
+        :param max_samples: maximal number of sample messages per category
+        """
+        self.max_samples = max_samples
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = {}
+
+    def add(
+        self,
+        category: str,
+        detail: Any,
+        ec: Optional[str] = None,
+        bid: Optional[str] = None,
+    ) -> None:
+        """Add issue.
+
+        :param category: category of the issue, see `CATEGORIES`
+        :param detail: detail of the issue, e.g. the item which was not parsed
+        :param ec: EC number
+        :param bid: BRENDA key
+        """
+        self.counts[(ec, bid, category)] += 1
+        samples = self.samples.setdefault(category, [])
+        if len(samples) < self.max_samples:
+            samples.append(self.message(category, detail, ec=ec, bid=bid))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(self.message(category, detail, ec=ec, bid=bid))
+
+    @staticmethod
+    def message(
+        category: str,
+        detail: Any,
+        ec: Optional[str] = None,
+        bid: Optional[str] = None,
+    ) -> str:
+        """Format message of issue."""
+        message = CATEGORIES[category][1].format(detail)
+        if ec is not None or bid is not None:
+            message = f"{ec}_{bid}: {message}"
+        return message
+
+    def merge(self, other: "DiagnosticsCollector") -> None:
+        """Add the issues of other collector, e.g. of a worker process."""
+        self.counts.update(other.counts)
+        for category, samples in other.samples.items():
+            own = self.samples.setdefault(category, [])
+            own.extend(samples[: max(0, self.max_samples - len(own))])
+
+    def clear(self) -> None:
+        """Remove all issues."""
+        self.counts.clear()
+        self.samples.clear()
+
+    def __len__(self) -> int:
+        """Get total number of issues."""
+        return sum(self.counts.values())
+
+    def snapshot(self) -> Counter:
+        """Get copy of the counts, e.g. to summarize the issues of a parse."""
+        return Counter(self.counts)
+
+    def _counts_since(self, since: Optional[Counter] = None) -> Counter:
+        """Get counts of the issues added after the snapshot."""
+        return self.counts if since is None else self.counts - since
+
+    def category_counts(self, since: Optional[Counter] = None) -> Counter:
+        """Get number of issues per category.
+
+        :param since: snapshot of the counts, only later issues are counted
+        """
+        counts: Counter = Counter()
+        for (_, _, category), count in self._counts_since(since).items():
+            counts[category] += count
+        return counts
+
+    def summary(self, since: Optional[Counter] = None) -> Dict[str, Dict[str, Any]]:
+        """Get summary of the issues.
+
+        :param since: snapshot of the counts, only later issues are summarized
+        :return: dict of category and dict with the log level, the number of
+                 issues, the number of affected EC numbers and the samples,
+                 sorted by number of issues
+        """
+        counts = self._counts_since(since)
+        ecs: Dict[str, set] = {}
+        for ec, _, category in counts:
+            if ec is not None:
+                ecs.setdefault(category, set()).add(ec)
+        return {
+            category: {
+                "level": logging.getLevelName(CATEGORIES[category][0]),
+                "count": count,
+                "ecs": len(ecs.get(category, ())),
+                "samples": list(self.samples.get(category, [])),
+            }
+            for category, count in self.category_counts(since).most_common()
+        }
+
+    def report(self, samples: int = 3) -> str:
+        """Get text report of the issues.
+
+        :param samples: number of sample messages per category
+        :return: report
+        """
+        lines = [f"{len(self)} parse issues"]
+        for category, info in self.summary().items():
+            lines.append(
+                f"{info['level']:<8} {category}: {info['count']} "
+                f"in {info['ecs']} EC numbers"
+            )
+            lines.extend(f"    {message}" for message in info["samples"][:samples])
+        return "\n".join(lines)
+
+    def log_summary(self, since: Optional[Counter] = None) -> None:
+        """Log one line per category with the number of issues.
+
+        :param since: snapshot of the counts, only later issues are logged
+        """
+        for category, info in self.summary(since=since).items():
+            logger.log(
+                CATEGORIES[category][0],
+                f"{category}: {info['count']} issues in {info['ecs']} EC numbers, "
+                f"e.g. {info['samples'][0] if info['samples'] else ''}",
+            )
+
+
+# collector for the parse issues of all parsers and proteins
+DIAGNOSTICS = DiagnosticsCollector()
@@ -45,25 +45,26 @@ def parse_proteins_by_taxonomy() -> None:
     tax_id_ref = tax.get_taxonomy_id("Homo sapiens")  # tax id of target species
 
     proteins = BRENDA_PARSER.get_proteins(ec)
-
-    results = []
-    for key, p in proteins.items():
+    for p in proteins.values():
         if p.taxonomy is None:
             logger.error(
                 f"Taxonomy could not be resolved for protein "
                 f"<{p.protein_id}>: '{p.organism}': '{p.taxonomy}'"
             )
-            continue
+    proteins_tax = [p for p in proteins.values() if p.taxonomy is not None]
 
-        [common_node_id, common_name, common_dist] = tax.find_common_node(
-            tax_id=p.taxonomy, tax_id_ref=tax_id_ref
-        )
+    # common nodes of all proteins with the target species
+    common_nodes, common_dists = tax.find_common_nodes(
+        [p.taxonomy for p in proteins_tax], tax_id_ref=tax_id_ref
+    )
+    results = []
+    for p, common_node_id, common_dist in zip(proteins_tax, common_nodes, common_dists):
         results.append(
             {
-                "protein_id": key,
+                "protein_id": p.protein_id,
                 "organism": p.organism,
                 "taxonomy": p.taxonomy,
-                "common_name": common_name,
+                "common_name": tax.get_scientific_name(int(common_node_id)),
                 "common_dist": common_dist,
             }
         )
@@ -83,8 +84,23 @@ def parse_all_proteins_for_all_ecs() -> Dict[int, BrendaProtein]:
     return proteins
 
 
+def count_all_proteins_for_all_ecs() -> int:
+    """Count all proteins for all ECs.
+
+    The proteins are streamed, so the parsed ECs are not kept in memory.
+
+    :return: number of proteins
+    """
+    n_proteins = 0
+    for _ in BRENDA_PARSER.iter_proteins():
+        n_proteins += 1
+    console.print(f"{n_proteins} proteins in BRENDA")
+    return n_proteins
+
+
 if __name__ == "__main__":
     parse_proteins_for_ec(ec="1.1.1.1")
     parse_human_proteins_for_ec(ec="1.1.1.1")
     parse_proteins_by_taxonomy()
     parse_all_proteins_for_all_ecs()
+    count_all_proteins_for_all_ecs()
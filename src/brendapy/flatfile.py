@@ -0,0 +1,391 @@
+"""Offset based access to the BRENDA flat file.
+
+The BRENDA flat file consists of entries for the individual EC numbers.
+Instead of holding the text of all entries in memory only the byte offsets
+of the entries are indexed and the file is memory-mapped. The text of an
+entry is decoded on access.
+
+The offsets are stored with per-entry checksums in a sidecar index next to
+the BRENDA file (`brenda_download.txt.index.json`). The index is keyed by
+size, mtime and content hash of the file and only rebuilt if the file changed.
+
+The per-entry checksums are stored in the derived artifacts (store, database,
+indexes). Between BRENDA releases only the entries with changed checksums
+have to be parsed, see `release_diff`.
+"""
+import hashlib
+import json
+import mmap
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from brendapy import utils
+from brendapy.log import get_logger
+
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+
+def ec_from_id_line(line: str) -> Optional[str]:
+    r"""Get EC number from ID line of an entry.
+
+    :param line: ID line, e.g. `ID\t1.1.1.1`
+    :return: EC number, None if no valid EC number
+    """
+    ec = line.strip().split("\t")[1].strip()
+    ec = ec.split(" ")[0]
+    if utils.is_ec_number(ec):
+        return ec
+    else:
+        return None
+
+
+def decode_entry(data: bytes) -> str:
+    r"""Decode entry string from the bytes of the BRENDA file.
+
+    Newlines are normalized like in text mode, i.e. `\r\n` and `\r` are
+    replaced with `\n`.
+
+    :param data: bytes of the entry
+    :return: entry string
+    """
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def scan_entry_offsets(
+    filename: Union[Path, str],
+) -> "OrderedDict[Optional[str], Tuple[int, int]]":
+    """Scan the BRENDA file for the byte ranges of the EC entries.
+
+    An entry starts with the `ID` line and ends with the `///` line.
+
+    :param filename: BRENDA database download
+    :return: OrderedDict (ec, (offset, length))
+    """
+    return EntryIndex.from_file(filename).offsets
+
+
+def index_path(filename: Union[Path, str]) -> Path:
+    """Path of the sidecar index for the BRENDA file."""
+    return Path(f"{filename}.index.json")
+
+
+def file_hash(filename: Union[Path, str]) -> str:
+    """Content hash (sha256) of the file."""
+    sha = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class EntryIndex(object):
+    """Index of the entries in the BRENDA file.
+
+    Stores the (offset, length) and a checksum of every EC entry together
+    with size, mtime and content hash of the indexed file.
+    """
+
+    def __init__(
+        self,
+        offsets: "OrderedDict[Optional[str], Tuple[int, int]]",
+        checksums: Dict[Optional[str], str],
+        size: int,
+        mtime_ns: int,
+        sha256: str,
+    ):
+        """Initialize entry index."""
+        self.offsets = offsets
+        self.checksums = checksums
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = sha256
+
+    @staticmethod
+    def from_file(filename: Union[Path, str]) -> "EntryIndex":
+        """Build index by scanning the BRENDA file.
+
+        :param filename: BRENDA database download
+        :return: entry index
+        """
+        offsets: "OrderedDict[Optional[str], Tuple[int, int]]" = OrderedDict()
+        checksums: Dict[Optional[str], str] = {}
+        sha = hashlib.sha256()
+        entry_hash = None
+        ec: Optional[str] = None
+        start: Optional[int] = None
+        position = 0
+
+        stat = Path(filename).stat()
+        with open(filename, "rb") as bf:
+            for line in bf:
+                sha.update(line)
+                # start of entry
+                if line.startswith(b"ID\t"):
+                    ec = ec_from_id_line(line.decode("utf-8"))
+                    start = position
+                    entry_hash = hashlib.blake2b(digest_size=8)
+                if entry_hash is not None:
+                    entry_hash.update(line)
+                # end of entry
+                if start is not None and line.startswith(b"///"):
+                    offsets[ec] = (start, position + len(line) - start)
+                    checksums[ec] = entry_hash.hexdigest()  # type: ignore
+                    start = None
+                    entry_hash = None
+                position += len(line)
+
+        return EntryIndex(
+            offsets=offsets,
+            checksums=checksums,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=sha.hexdigest(),
+        )
+
+    def matches(self, filename: Union[Path, str]) -> bool:
+        """Check if index is valid for the file.
+
+        Size and mtime are compared first. If only the mtime changed the
+        content hash decides, so that touched or copied files keep the index.
+        """
+        stat = Path(filename).stat()
+        if stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+        if file_hash(filename) == self.sha256:
+            self.mtime_ns = stat.st_mtime_ns
+            return True
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON serializable dictionary."""
+        return {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "sha256": self.sha256,
+            "entries": [
+                [ec, offset, length, self.checksums[ec]]
+                for ec, (offset, length) in self.offsets.items()
+            ],
+        }
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "EntryIndex":
+        """Create index from dictionary."""
+        offsets: "OrderedDict[Optional[str], Tuple[int, int]]" = OrderedDict()
+        checksums: Dict[Optional[str], str] = {}
+        for ec, offset, length, checksum in d["entries"]:
+            offsets[ec] = (offset, length)
+            checksums[ec] = checksum
+        return EntryIndex(
+            offsets=offsets,
+            checksums=checksums,
+            size=d["size"],
+            mtime_ns=d["mtime_ns"],
+            sha256=d["sha256"],
+        )
+
+    def save(self, path: Path) -> None:
+        """Store index as JSON."""
+        with open(path, "w") as f_index:
+            json.dump(self.to_dict(), f_index)
+
+    @staticmethod
+    def load(path: Path) -> Optional["EntryIndex"]:
+        """Load index from JSON.
+
+        :return: entry index, None if no index of the current version exists
+        """
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f_index:
+                d = json.load(f_index)
+        except (OSError, ValueError) as err:
+            logger.warning(f"Index could not be read: `{path}`: {err}")
+            return None
+        if d.get("version") != INDEX_VERSION:
+            return None
+        return EntryIndex.from_dict(d)
+
+    def read_entries(
+        self, filename: Union[Path, str]
+    ) -> "OrderedDict[Optional[str], str]":
+        """Read all entry strings from the file, newlines are normalized.
+
+        :return: OrderedDict (ec, brenda_info)
+        """
+        with open(filename, "rb") as bf:
+            data = bf.read()
+        return OrderedDict(
+            (ec, decode_entry(data[offset : offset + length]))
+            for ec, (offset, length) in self.offsets.items()
+        )
+
+
+def load_entry_index(filename: Union[Path, str], cache: bool = True) -> EntryIndex:
+    """Load entry index for the BRENDA file.
+
+    The sidecar index is used if it matches the file, otherwise the file
+    is scanned and the sidecar index is (re)written.
+
+    :param filename: BRENDA database download
+    :param cache: read and write the sidecar index
+    :return: entry index
+    """
+    if not cache:
+        return EntryIndex.from_file(filename)
+
+    path = index_path(filename)
+    entry_index = EntryIndex.load(path)
+    if entry_index is not None:
+        mtime_ns = entry_index.mtime_ns
+        if entry_index.matches(filename):
+            if entry_index.mtime_ns != mtime_ns:
+                _save_entry_index(entry_index, path)
+            return entry_index
+
+    logger.info(f"Indexing BRENDA file `{filename}`")
+    entry_index = EntryIndex.from_file(filename)
+    _save_entry_index(entry_index, path)
+    return entry_index
+
+
+def _save_entry_index(entry_index: EntryIndex, path: Path) -> None:
+    """Write sidecar index, the index is optional so failures are only logged."""
+    try:
+        entry_index.save(path)
+    except OSError as err:
+        logger.warning(f"Index could not be written: `{path}`: {err}")
+
+
+class ReleaseDiff(NamedTuple):
+    """Difference of the entries between two BRENDA releases.
+
+    EC numbers of added, changed and unchanged entries are in the order of
+    the new release, removed entries in the order of the old release.
+    """
+
+    added: List[Optional[str]]
+    removed: List[Optional[str]]
+    changed: List[Optional[str]]
+    unchanged: List[Optional[str]]
+
+    @property
+    def outdated(self) -> List[Optional[str]]:
+        """EC numbers which have to be parsed for the new release."""
+        return self.added + self.changed
+
+    def is_empty(self) -> bool:
+        """Check if releases contain identical entries."""
+        return not (self.added or self.removed or self.changed)
+
+
+def release_diff(
+    old: Mapping[Optional[str], Optional[str]],
+    new: Mapping[Optional[str], Optional[str]],
+) -> ReleaseDiff:
+    """Compare the entry checksums of two BRENDA releases.
+
+    Entries without checksum are changed.
+
+    :param old: checksums of the entries of the old release
+    :param new: checksums of the entries of the new release
+    :return: release diff
+    """
+    added, changed, unchanged = [], [], []
+    for ec, checksum in new.items():
+        if ec not in old:
+            added.append(ec)
+        elif checksum is None or old[ec] != checksum:
+            changed.append(ec)
+        else:
+            unchanged.append(ec)
+    removed = [ec for ec in old if ec not in new]
+    return ReleaseDiff(
+        added=added, removed=removed, changed=changed, unchanged=unchanged
+    )
+
+
+class EntryTextMap(Mapping):
+    """Read-only mapping of EC numbers to entry strings.
+
+    The BRENDA file is memory-mapped and only the (offset, length) of every
+    entry is stored. The entry string is decoded from the mapped file on
+    every access, so the operating system decides which pages stay resident.
+    """
+
+    def __init__(
+        self,
+        filename: Union[Path, str],
+        offsets: Optional[Mapping[Optional[str], Tuple[int, int]]] = None,
+    ):
+        """Initialize mapping for BRENDA file.
+
+        :param filename: BRENDA database download
+        :param offsets: (ec, (offset, length)) index, scanned if not provided
+        """
+        self.filename = filename
+        if offsets is None:
+            offsets = scan_entry_offsets(filename)
+        self.offsets = offsets
+        self._mmap: Optional[mmap.mmap] = None
+
+    def _open(self) -> mmap.mmap:
+        """Memory-map the BRENDA file on first access."""
+        if self._mmap is None:
+            with open(self.filename, "rb") as bf:
+                self._mmap = mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def get_bytes(self, ec: Optional[str]) -> bytes:
+        """Get raw bytes of entry for EC."""
+        offset, length = self.offsets[ec]
+        return self._open()[offset : offset + length]
+
+    def close(self) -> None:
+        """Close the memory-mapped file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __getitem__(self, ec: Optional[str]) -> str:
+        """Decode entry string for EC, newlines are normalized."""
+        return decode_entry(self.get_bytes(ec))
+
+    def __contains__(self, ec: object) -> bool:
+        """Check if entry exists for EC."""
+        return ec in self.offsets
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        """Iterate over EC numbers in file order."""
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        """Get number of entries."""
+        return len(self.offsets)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get state for pickling, the memory map is reopened on access."""
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        return state
@@ -0,0 +1,404 @@
+"""Indexes over all EC numbers of the BRENDA file.
+
+The indexes map information (e.g. ChEBI ids of substrates) to the proteins
+in the BRENDA file. Indexes are built once from the parser and stored as
+JSON next to the BRENDA file (`brenda_download.txt.<name>.json`). A stored
+index is used as long as the content hash of the BRENDA file does not change.
+For a new BRENDA release only the postings of the changed entries are
+updated, based on the checksums of the entries stored with the index.
+
+    parser = BrendaParser(mmap=True)
+    index = SubstrateIndex.from_parser(parser)
+    index.proteins_for_substrate("CHEBI:15422")
+"""
+import json
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+
+from brendapy.diagnostics import DIAGNOSTICS
+from brendapy.flatfile import ReleaseDiff
+from brendapy.log import get_logger
+from brendapy.parser import BrendaProtein
+from brendapy.registry import get_resource
+from brendapy.taxonomy import Taxonomy
+
+
+logger = get_logger(__name__)
+
+IndexType = TypeVar("IndexType", bound="BrendaIndex")
+
+
+class BrendaIndex(ABC):
+    """Base class for indexes over all EC numbers.
+
+    An index consists of named tables which map keys to lists of postings.
+    Every posting is a tuple starting with (ec, protein_id).
+    """
+
+    name = "index"
+    version = 2
+
+    def __init__(
+        self,
+        tables: Dict[str, Dict[Any, List[Tuple]]],
+        sha256: Optional[str] = None,
+        checksums: Optional[Dict[str, Optional[str]]] = None,
+    ):
+        """Initialize index.
+
+        :param tables: tables of the index
+        :param sha256: content hash of the indexed BRENDA file
+        :param checksums: checksums of the indexed BRENDA entries
+        """
+        self.tables = tables
+        self.sha256 = sha256
+        self.checksums = checksums
+
+    @classmethod
+    @abstractmethod
+    def build(
+        cls: Type[IndexType], parser: Any, ecs: Optional[Iterable[Optional[str]]] = None
+    ) -> IndexType:
+        """Build index from the parser.
+
+        :param parser: BrendaParser
+        :param ecs: EC numbers to index, all EC numbers if None
+        """
+
+    def update(self, parser: Any, diff: ReleaseDiff) -> None:
+        """Update the postings for the changes between BRENDA releases.
+
+        The postings of removed and changed entries are removed, the entries
+        which are added or changed are indexed. Postings are kept in the
+        order of the EC numbers in the BRENDA file.
+
+        :param parser: BrendaParser for the new release
+        :param diff: difference between the indexed and the new release
+        """
+        outdated = set(diff.removed) | set(diff.changed)
+        update = self.build(parser, ecs=diff.outdated)
+        rank = {ec: k for k, ec in enumerate(parser.keys())}
+        for table, postings in self.tables.items():
+            modified = set(update.tables[table].keys())
+            for key, values in postings.items():
+                if any(posting[0] in outdated for posting in values):
+                    postings[key] = [p for p in values if p[0] not in outdated]
+                    modified.add(key)
+            for key, values in update.tables[table].items():
+                postings.setdefault(key, []).extend(values)
+            for key in modified:
+                if postings[key]:
+                    postings[key].sort(key=lambda posting: rank[posting[0]])
+                else:
+                    del postings[key]
+
+    @classmethod
+    def index_path(cls, parser: Any) -> Path:
+        """Path of the stored index for the BRENDA file of the parser."""
+        return Path(f"{parser.brenda_file}.{cls.name}.json")
+
+    @classmethod
+    def from_parser(cls: Type[IndexType], parser: Any, cache: bool = True) -> IndexType:
+        """Load index for the parser.
+
+        The stored index is used if it was built from the same BRENDA file,
+        otherwise the index is built and stored.
+
+        :param parser: BrendaParser
+        :param cache: read and write the stored index
+        :return: index
+        """
+        sha256 = _source_sha256(parser)
+        checksums = parser.checksums
+        path = cls.index_path(parser)
+        index = None
+        if cache and sha256 and path.exists():
+            index = cls.load(path)
+            if index is not None and index.sha256 == sha256:
+                return index
+
+        if index is not None and index.checksums and checksums:
+            diff = parser.release_diff(index.checksums)
+            logger.info(
+                f"Updating `{cls.name}` index: {len(diff.added)} added, "
+                f"{len(diff.removed)} removed, {len(diff.changed)} changed"
+            )
+            index.update(parser, diff)
+        else:
+            logger.info(f"Building `{cls.name}` index")
+            index = cls.build(parser)
+        index.sha256 = sha256
+        index.checksums = dict(checksums) if checksums else None
+        if cache and sha256:
+            try:
+                index.save(path)
+            except OSError as err:
+                logger.warning(f"Index could not be written: `{path}`: {err}")
+        return index
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Store index as JSON."""
+        data = {
+            "name": self.name,
+            "version": self.version,
+            "sha256": self.sha256,
+            "checksums": list(self.checksums.items()) if self.checksums else None,
+            "tables": {
+                table: list(postings.items()) for table, postings in self.tables.items()
+            },
+        }
+        with open(path, "w") as f_index:
+            json.dump(data, f_index)
+
+    @classmethod
+    def load(cls: Type[IndexType], path: Union[Path, str]) -> Optional[IndexType]:
+        """Load index from JSON.
+
+        :return: index, None if no index of the current version exists
+        """
+        try:
+            with open(path, "r") as f_index:
+                data = json.load(f_index)
+        except (OSError, ValueError) as err:
+            logger.warning(f"Index could not be read: `{path}`: {err}")
+            return None
+        if data.get("name") != cls.name or data.get("version") != cls.version:
+            return None
+
+        tables = {
+            table: {
+                key: [tuple(posting) for posting in postings] for key, postings in items
+            }
+            for table, items in data["tables"].items()
+        }
+        checksums = data.get("checksums")
+        return cls(
+            tables=tables,
+            sha256=data["sha256"],
+            checksums=dict(checksums) if checksums else None,
+        )
+
+    def lookup(self, table: str, key: Any) -> List[Tuple]:
+        """Get postings for key in table."""
+        return self.tables[table].get(key, [])
+
+    @staticmethod
+    def get_proteins(parser: Any, postings: Iterable[Tuple]) -> List:
+        """Get BRENDA proteins for the postings.
+
+        Only the EC numbers of the postings are parsed.
+
+        :param parser: BrendaParser
+        :param postings: postings starting with (ec, protein_id)
+        :return: list of BRENDA proteins
+        """
+        proteins: List[BrendaProtein] = []
+        for ec, protein_ids in _group_by_ec(postings).items():
+            ec_proteins = parser.get_proteins(ec)
+            proteins.extend(ec_proteins[pid] for pid in protein_ids)
+        return proteins
+
+
+class SubstrateIndex(BrendaIndex):
+    """Inverted index of substrates.
+
+    Maps ChEBI ids and normalized substrate names of the kinetic items
+    (KM, KI, TN, ...) to postings (ec, protein_id, bid, position), with
+    position being the index of the item in the list of the protein, e.g.
+    `protein.KM[position]`.
+    """
+
+    name = "substrates"
+
+    @staticmethod
+    def normalize(substrate: str) -> str:
+        """Normalize substrate name for lookup."""
+        return " ".join(substrate.split()).lower()
+
+    @classmethod
+    def build(
+        cls, parser: Any, ecs: Optional[Iterable[Optional[str]]] = None
+    ) -> "SubstrateIndex":
+        """Build substrate index from the kinetic items of the entries.
+
+        The kinetic keys are parsed independent of the fields of the parser.
+        """
+        chebi: Dict[str, List[Tuple]] = defaultdict(list)
+        substrate: Dict[str, List[Tuple]] = defaultdict(list)
+        for ec, ec_data in parser.iter_entries(ecs=ecs, fields=parser.UNITS):
+            for bid in parser.UNITS:
+                if bid not in ec_data:
+                    continue
+                for pid, items in ec_data[bid].items():
+                    for position, item in enumerate(items):
+                        posting = (ec, pid, bid, position)
+                        if "chebi" in item:
+                            chebi[item["chebi"]].append(posting)
+                        if "substrate" in item:
+                            substrate[cls.normalize(item["substrate"])].append(posting)
+
+        return cls(tables={"chebi": dict(chebi), "substrate": dict(substrate)})
+
+    def proteins_for_substrate(self, substance: str) -> List[Tuple]:
+        """Get kinetic items for substrate.
+
+        :param substance: ChEBI id (`CHEBI:15422`) or substrate name
+        :return: list of postings (ec, protein_id, bid, position)
+        """
+        if substance.startswith("CHEBI:"):
+            return self.lookup("chebi", substance)
+        return self.lookup("substrate", self.normalize(substance))
+
+
+class OrganismIndex(BrendaIndex):
+    """Index of the organisms of the proteins.
+
+    Maps organism names and NCBI taxonomy ids to postings (ec, protein_id).
+    Only the PR lines of the BRENDA entries are parsed for the index.
+    """
+
+    name = "organisms"
+
+    @classmethod
+    def build(
+        cls, parser: Any, ecs: Optional[Iterable[Optional[str]]] = None
+    ) -> "OrganismIndex":
+        """Build organism index from the PR items."""
+        organism: Dict[str, List[Tuple]] = defaultdict(list)
+        taxonomy: Dict[int, List[Tuple]] = defaultdict(list)
+        organism_taxonomy: Dict[str, Optional[int]] = {}
+        tax = get_resource("taxonomy")
+        for ec, protein_infos in _iter_protein_infos(parser, ecs=ecs):
+            for pid, info in protein_infos.items():
+                name = BrendaProtein.parse_organism(info["data"])
+                if name not in organism_taxonomy:
+                    organism_taxonomy[name] = tax.get_taxonomy_id(name, warn=False)
+                    if organism_taxonomy[name] is None:
+                        DIAGNOSTICS.add("taxonomy_not_resolved", name, ec=ec, bid="PR")
+                organism[name].append((ec, pid))
+                tax_id = organism_taxonomy[name]
+                if tax_id is not None:
+                    taxonomy[tax_id].append((ec, pid))
+
+        return cls(tables={"organism": dict(organism), "taxonomy": dict(taxonomy)})
+
+    def proteins_for_organism(self, organism: str) -> List[Tuple]:
+        """Get proteins for organism.
+
+        :param organism: organism name, e.g. `Homo sapiens`
+        :return: list of postings (ec, protein_id)
+        """
+        return self.lookup("organism", organism)
+
+    def proteins_for_taxonomy(self, tax_id: Union[int, str]) -> List[Tuple]:
+        """Get proteins for NCBI taxonomy id.
+
+        :param tax_id: NCBI taxonomy id, e.g. `9606` or `TAX:9606`
+        :return: list of postings (ec, protein_id)
+        """
+        return self.lookup("taxonomy", Taxonomy._tax_id_clean(tax_id))
+
+    def proteins_for_clade(self, clade: Union[int, str]) -> List[Tuple]:
+        """Get proteins of all organisms in the subtree of the clade.
+
+        The organisms are selected with a single subtree mask over the
+        taxonomy ids of the index.
+
+        :param clade: NCBI taxonomy id of the clade, e.g. `40674` (Mammalia)
+        :return: list of postings (ec, protein_id), grouped by taxonomy id
+        """
+        table = self.tables["taxonomy"]
+        tax_ids = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+        mask = get_resource("taxonomy").in_subtree(tax_ids, clade)
+        return [posting for tax_id in tax_ids[mask] for posting in table[int(tax_id)]]
+
+
+class UniprotIndex(BrendaIndex):
+    """Index of the UniProt accessions of the proteins.
+
+    Maps all UniProt/SwissProt accessions of the PR items to postings
+    (ec, protein_id). Only the PR lines of the BRENDA entries are parsed.
+    """
+
+    name = "uniprots"
+
+    @classmethod
+    def build(
+        cls, parser: Any, ecs: Optional[Iterable[Optional[str]]] = None
+    ) -> "UniprotIndex":
+        """Build UniProt index from the PR items."""
+        uniprot: Dict[str, List[Tuple]] = defaultdict(list)
+        for ec, protein_infos in _iter_protein_infos(parser, ecs=ecs):
+            for pid, info in protein_infos.items():
+                for accession in BrendaProtein.parse_uniprots(info["data"]):
+                    uniprot[accession].append((ec, pid))
+
+        return cls(tables={"uniprot": dict(uniprot)})
+
+    def proteins_for_uniprot(self, accession: str) -> List[Tuple]:
+        """Get proteins for UniProt accession.
+
+        :param accession: UniProt accession, e.g. `P08319`
+        :return: list of postings (ec, protein_id)
+        """
+        return self.lookup("uniprot", accession)
+
+    def proteins_for_uniprots(
+        self, accessions: Iterable[str]
+    ) -> Dict[str, List[Tuple]]:
+        """Get proteins for UniProt accessions.
+
+        :param accessions: UniProt accessions
+        :return: dict of accession and postings (ec, protein_id) for all
+                 accessions with proteins in BRENDA
+        """
+        table = self.tables["uniprot"]
+        return {
+            accession: table[accession]
+            for accession in accessions
+            if accession in table
+        }
+
+
+def _iter_protein_infos(
+    parser: Any, ecs: Optional[Iterable[Optional[str]]] = None
+) -> Iterator[Tuple[Optional[str], Dict[int, Dict]]]:
+    """Iterate over the PR items of the EC numbers.
+
+    For the BRENDA file only the PR lines of the entries are parsed.
+    """
+    fields = frozenset({"PR"})
+    for ec in parser.keys() if ecs is None else ecs:
+        yield ec, parser._load_info_dict(ec, fields=fields)["PR"]
+
+
+def _source_sha256(parser: Any) -> Optional[str]:
+    """Content hash of the BRENDA file the parser information is based on."""
+    if parser.entry_index is not None:
+        return parser.entry_index.sha256  # type: ignore
+    if parser.backend is not None:
+        return getattr(parser.backend, "sha256", None)
+    return None
+
+
+def _group_by_ec(postings: Iterable[Tuple]) -> Dict[str, List[int]]:
+    """Group protein ids of postings by EC."""
+    groups: Dict[str, Dict[int, None]] = defaultdict(dict)
+    for posting in postings:
+        groups[posting[0]][posting[1]] = None
+    return {ec: list(pids) for ec, pids in groups.items()}
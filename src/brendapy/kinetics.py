@@ -0,0 +1,239 @@
+"""Columnar table of the kinetic values of all EC numbers.
+
+The kinetic values (KM, KI, TN, KKM, IC50, SA) of the proteins are
+collected in a single pass over the BRENDA file into NumPy arrays. Strings
+(EC, BRENDA key, substrate, ChEBI, organism) and the taxonomy are stored as
+integer codes into category arrays, so filtering and aggregating the values
+are vectorized operations.
+
+    parser = BrendaParser(mmap=True)
+    table = build_kinetics_table(parser)
+    mask = table.mask(key="KM", chebi="CHEBI:15422")
+    df = table.filter(mask).to_dataframe()
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from brendapy.diagnostics import DIAGNOSTICS
+from brendapy.log import get_logger
+from brendapy.parser import BrendaParser, BrendaProtein
+from brendapy.registry import get_resource
+
+
+logger = get_logger(__name__)
+
+CODED_COLUMNS = ["ec", "key", "substrate", "chebi", "organism", "taxonomy"]
+
+
+class _Coder(object):
+    """Assign integer codes to categories in order of occurrence."""
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        """Get code for value, None is coded as -1."""
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.codes)
+            self.codes[value] = code
+        return code
+
+    def categories(self) -> List:
+        """Categories in order of the codes."""
+        return list(self.codes.keys())
+
+
+class KineticsTable(object):
+    """Columnar table of kinetic values.
+
+    Every row is a kinetic value of a protein. The coded columns are int32
+    arrays of codes into the corresponding categories, -1 codes missing
+    information.
+
+    Columns:
+        value       float64 value in the units of the key
+        protein_id  int32 BRENDA protein id in the EC
+        ec          int32 code into `categories["ec"]`
+        key         int32 code into `categories["key"]`, e.g. KM
+        substrate   int32 code into `categories["substrate"]`
+        chebi       int32 code into `categories["chebi"]`
+        organism    int32 code into `categories["organism"]`
+        taxonomy    int32 code into `categories["taxonomy"]`
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        categories: Dict[str, List],
+    ):
+        """Initialize table from columns and categories."""
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self) -> int:
+        """Get number of kinetic values."""
+        return len(self.columns["value"])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """Get column."""
+        columns: Dict[str, np.ndarray] = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def taxonomy_ids(self) -> np.ndarray:
+        """NCBI taxonomy ids of the rows, -1 if the organism is not resolved."""
+        tax_ids = np.append(np.array(self.categories["taxonomy"], dtype=np.int64), -1)
+        taxonomy_ids: np.ndarray = tax_ids[self.columns["taxonomy"]]
+        return taxonomy_ids
+
+    def code(self, column: str, value: Any) -> int:
+        """Get code of value in coded column, -1 if value does not exist."""
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def mask(self, **criteria: Any) -> np.ndarray:
+        """Boolean mask of the rows matching all criteria.
+
+        Criteria are the coded columns with a value or a list of values,
+        e.g. `mask(key="KM", chebi=["CHEBI:15422", "CHEBI:16761"])`.
+
+        :return: boolean array
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, values in criteria.items():
+            if column not in CODED_COLUMNS:
+                raise ValueError(
+                    f"Unsupported column `{column}`, supported: {CODED_COLUMNS}"
+                )
+            if isinstance(values, str) or not isinstance(values, Iterable):
+                values = [values]
+            codes = [self.code(column, value) for value in values]
+            mask &= np.isin(self.columns[column], [c for c in codes if c >= 0])
+        return mask
+
+    def filter(self, mask: np.ndarray) -> "KineticsTable":
+        """Get table with the rows of the mask."""
+        return KineticsTable(
+            columns={name: column[mask] for name, column in self.columns.items()},
+            categories=self.categories,
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert to pandas DataFrame.
+
+        Numeric columns are passed without copying, coded columns become
+        pandas categoricals of the codes.
+        """
+        data: Dict[str, Any] = {
+            "value": self.columns["value"],
+            "protein_id": self.columns["protein_id"],
+        }
+        for column in CODED_COLUMNS:
+            data[column] = pd.Categorical.from_codes(
+                self.columns[column], categories=self.categories[column]
+            )
+        return pd.DataFrame(data, copy=False)
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Store table as numpy archive."""
+        # savez takes the arrays as keyword arguments besides `allow_pickle`
+        arrays: Dict[str, Any] = dict(self.columns)
+        for column in CODED_COLUMNS:
+            arrays[f"categories_{column}"] = np.array(self.categories[column])
+        np.savez(path, **arrays)
+
+    @staticmethod
+    def load(path: Union[Path, str]) -> "KineticsTable":
+        """Load table from numpy archive."""
+        with np.load(path) as data:
+            columns = {
+                name: data[name]
+                for name in data.files
+                if not name.startswith("categories_")
+            }
+            categories = {
+                column: data[f"categories_{column}"].tolist()
+                for column in CODED_COLUMNS
+            }
+        return KineticsTable(columns=columns, categories=categories)
+
+
+def build_kinetics_table(
+    parser: BrendaParser, keys: Optional[Iterable[str]] = None
+) -> KineticsTable:
+    """Collect the kinetic values of all EC numbers in a single pass.
+
+    Items without value (e.g. `-999` values) are not part of the table. Only
+    the BRENDA keys of the table are parsed.
+
+    :param parser: BrendaParser
+    :param keys: BRENDA keys with kinetic values, all keys with units if None
+    :return: kinetics table
+    """
+    if keys is None:
+        keys = BrendaParser.UNITS.keys()
+    keys = list(keys)
+
+    coders = {column: _Coder() for column in CODED_COLUMNS}
+    for key in keys:
+        coders["key"].code(key)
+    columns: Dict[str, List] = {
+        column: [] for column in ["value", "protein_id"] + CODED_COLUMNS
+    }
+    organism_taxonomy: Dict[str, Optional[int]] = {}
+    taxonomy = get_resource("taxonomy")
+
+    # only the kinetic keys and the proteins are parsed
+    for ec, ec_data in parser.iter_entries(fields=set(keys) | {"PR"}):
+        ec_code = coders["ec"].code(ec)
+        organisms = {}
+        for pid, info in ec_data["PR"].items():
+            organism = BrendaProtein.parse_organism(info["data"])
+            if organism not in organism_taxonomy:
+                tax_id = taxonomy.get_taxonomy_id(organism, warn=False)
+                if tax_id is None:
+                    DIAGNOSTICS.add("taxonomy_not_resolved", organism, ec=ec, bid="PR")
+                organism_taxonomy[organism] = tax_id
+            organisms[pid] = (
+                coders["organism"].code(organism),
+                coders["taxonomy"].code(organism_taxonomy[organism]),
+            )
+
+        for key in keys:
+            if key not in ec_data:
+                continue
+            key_code = coders["key"].code(key)
+            for pid, items in ec_data[key].items():
+                organism_code, taxonomy_code = organisms.get(pid, (-1, -1))
+                for item in items:
+                    if "value" not in item:
+                        continue
+                    columns["value"].append(item["value"])
+                    columns["protein_id"].append(pid)
+                    columns["ec"].append(ec_code)
+                    columns["key"].append(key_code)
+                    columns["substrate"].append(
+                        coders["substrate"].code(item.get("substrate"))
+                    )
+                    columns["chebi"].append(coders["chebi"].code(item.get("chebi")))
+                    columns["organism"].append(organism_code)
+                    columns["taxonomy"].append(taxonomy_code)
+
+    arrays = {
+        name: np.array(values, dtype=np.float64 if name == "value" else np.int32)
+        for name, values in columns.items()
+    }
+    return KineticsTable(
+        columns=arrays,
+        categories={column: coders[column].categories() for column in CODED_COLUMNS},
+    )
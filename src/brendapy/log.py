@@ -10,7 +10,15 @@ from brendapy.console import console
 
 
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
-    """Get new custom logger for name."""
+    """Get custom logger for name.
+
+    The rich handler is only added on the first call for the name.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    if any(isinstance(h, RichHandler) for h in logger.handlers):
+        return logger
+
     formatter = logging.Formatter(
         fmt="%(message)s",
         datefmt="[%X]",
@@ -21,8 +29,5 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         markup=False, rich_tracebacks=True, show_time=False, console=console
     )
     handler.setFormatter(formatter)
-
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
     logger.addHandler(handler)
     return logger
@@ -0,0 +1,328 @@
+"""Memory footprint of the parsed BRENDA information.
+
+The deep memory use of a parser is reported by structure, by EC number and
+by BRENDA key:
+
+    ec_text       raw entry strings (offsets of the entries with `mmap`)
+    ec_data       parsed info dicts
+    proteins      BRENDA proteins, without the info dicts they reference
+    diagnostics   collected parse issues
+    metrics       timers and counters of the parse stages
+    taxonomy      derived taxonomy arrays in memory (`taxonomy.mapped` are
+                  the memory-mapped arrays of the taxonomy file)
+    chebi, bto    ontology lookup maps
+
+Objects referenced from multiple structures are counted once, for the first
+structure in the order above. Resources are only reported if loaded.
+Optionally the allocations of the parsing are traced with `tracemalloc`.
+
+    parser = BrendaParser()
+    report = parser.memory_report(ecs=["1.1.1.1"], parse=True, trace=True)
+    print(report.report())
+
+The summary is available from the command line
+
+    python -m brendapy.memory --limit 100 --trace --json memory.json
+"""
+import json
+import mmap
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+import numpy as np
+
+from brendapy import registry
+from brendapy.diagnostics import DIAGNOSTICS
+
+
+# objects which are not part of the data, e.g. the parser referenced by a callback
+_SKIP_TYPES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+
+def deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Deep size of object in bytes.
+
+    In addition to `brendapy.cache.approximate_size` the attributes of
+    objects (`__dict__` and `__slots__`) are added. Numpy arrays are counted
+    with their data if they own the data, memory-mapped files are not
+    counted. Objects referenced multiple times are counted once.
+
+    :param obj: object
+    :param seen: ids of objects already counted
+    :return: size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, mmap.mmap):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, np.ndarray)):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen) + deep_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_size(item, seen)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if slot != "__dict__" and hasattr(obj, slot):
+                size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+class MemoryReport(object):
+    """Memory use in bytes by structure, EC number and BRENDA key."""
+
+    def __init__(self) -> None:
+        """Initialize report."""
+        self.structures: Dict[str, int] = {}
+        self.ecs: Dict[str, int] = {}
+        self.keys: Dict[str, int] = {}
+        # allocations of the parsing traced with tracemalloc
+        self.traced: Optional[Dict[str, Any]] = None
+
+    @property
+    def total(self) -> int:
+        """Total bytes in memory, the memory-mapped taxonomy is not counted."""
+        return sum(
+            size for name, size in self.structures.items() if name != "taxonomy.mapped"
+        )
+
+    @property
+    def total_ecs(self) -> int:
+        """Total bytes of the EC numbers."""
+        return sum(self.ecs.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export report.
+
+        :return: dict with the total and the bytes per structure, EC number and
+                 BRENDA key, sorted by bytes
+        """
+
+        def _sorted(sizes: Dict[str, int]) -> Dict[str, int]:
+            return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+        return {
+            "total": self.total,
+            "structures": dict(self.structures),
+            "ecs": _sorted(self.ecs),
+            "keys": _sorted(self.keys),
+            "traced": self.traced,
+        }
+
+    def to_json(self, path: Optional[Union[Path, str]] = None) -> str:
+        """Export report as JSON.
+
+        :param path: JSON file to write the report to
+        :return: JSON string
+        """
+        data = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f_json:
+                f_json.write(data)
+        return data
+
+    def report(self, top: int = 10) -> str:
+        """Get text report of the memory use.
+
+        :param top: number of EC numbers, BRENDA keys and allocation sites
+        :return: report
+        """
+        data = self.to_dict()
+        n_ecs = max(len(self.ecs), 1)
+        lines = [f"{'total':<24} {_format_bytes(data['total']):>12}"]
+        lines.extend(
+            f"{name:<24} {_format_bytes(size):>12}"
+            for name, size in data["structures"].items()
+        )
+        lines.append(
+            f"{len(self.ecs)} EC numbers, "
+            f"{_format_bytes(self.total_ecs // n_ecs)} per EC number"
+        )
+        lines.extend(
+            f"    {ec:<20} {_format_bytes(size):>12}"
+            for ec, size in list(data["ecs"].items())[:top]
+        )
+        lines.append("BRENDA keys")
+        lines.extend(
+            f"    {bid:<20} {_format_bytes(size):>12}"
+            for bid, size in list(data["keys"].items())[:top]
+        )
+        if self.traced is not None:
+            lines.append(
+                f"traced allocations {_format_bytes(self.traced['size'])}, "
+                f"peak {_format_bytes(self.traced['peak'])}"
+            )
+            lines.extend(
+                f"    {location:<40} {_format_bytes(size):>12}"
+                for location, size in self.traced["top"][:top]
+            )
+        return "\n".join(lines)
+
+
+def _format_bytes(size: int) -> str:
+    """Format bytes with binary unit."""
+    value = float(size)
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+@contextmanager
+def trace_allocations(top: int = 20) -> Iterator[Dict[str, Any]]:
+    """Trace the allocations of the block with tracemalloc snapshots.
+
+    The yielded dict is filled at the end of the block with the size of the
+    allocations which are still alive (`size`), the peak of the traced memory
+    relative to the start of the block (`peak`) and the allocation sites with
+    the largest size (`top`).
+
+    :param top: number of allocation sites
+    :return: dict with the traced allocations
+    """
+    traced: Dict[str, Any] = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    try:
+        yield traced
+    finally:
+        stats = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+        _, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+        traced["size"] = sum(stat.size_diff for stat in stats)
+        traced["peak"] = peak - current
+        traced["top"] = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff)
+            for stat in sorted(stats, key=lambda stat: -stat.size_diff)[:top]
+        ]
+
+
+def memory_report(
+    parser: Any,
+    ecs: Optional[Iterable[str]] = None,
+    resources: bool = True,
+) -> MemoryReport:
+    """Report the memory use of parser.
+
+    :param parser: BRENDA parser
+    :param ecs: EC numbers to report, all EC numbers in `ec_text` and the
+                caches if None. Structures are only counted for these EC
+                numbers.
+    :param resources: report the loaded taxonomy, ChEBI and BTO resources
+    :return: memory report
+    """
+    report = MemoryReport()
+    seen: Set[int] = set()
+    # entries in the caches without counting the access
+    ec_data = {ec: value for ec, (value, _) in parser.ec_data._data.items()}
+    proteins = {ec: value for ec, (value, _) in parser.proteins._data.items()}
+    text_loaded = isinstance(parser.ec_text, dict)
+
+    if ecs is None:
+        ec_list: List[str] = list(ec_data)
+        if text_loaded:
+            ec_list = list(parser.ec_text) + [
+                ec for ec in ec_list if ec not in parser.ec_text
+            ]
+    else:
+        ec_list = list(ecs)
+
+    text_size = 0
+    if not text_loaded:
+        # offsets of the entries, the entry strings are read on access
+        text_size = deep_size(parser.ec_text, seen)
+    data_size = 0
+    for ec in ec_list:
+        size = 0
+        if text_loaded and ec in parser.ec_text:
+            size += deep_size(parser.ec_text[ec], seen)
+        text_size += size
+        info = ec_data.get(ec)
+        if info is not None:
+            for bid, value in info.items():
+                key_size = deep_size(value, seen)
+                report.keys[bid] = report.keys.get(bid, 0) + key_size
+                data_size += key_size
+                size += key_size
+            info_size = deep_size(info, seen)
+            data_size += info_size
+            size += info_size
+        report.ecs[ec] = size
+    report.structures["ec_text"] = text_size
+    report.structures["ec_data"] = data_size
+
+    report.structures["diagnostics"] = deep_size(DIAGNOSTICS, seen)
+    report.structures["metrics"] = (
+        deep_size(parser.metrics, seen) if parser.metrics is not None else 0
+    )
+    protein_size = 0
+    for ec in ec_list:
+        if ec in proteins:
+            size = deep_size(proteins[ec], seen)
+            report.ecs[ec] += size
+            protein_size += size
+    report.structures["proteins"] = protein_size
+
+    if resources:
+        if registry.is_loaded("taxonomy"):
+            usage = registry.get_resource("taxonomy").memory_usage()
+            report.structures["taxonomy"] = usage["derived"]
+            report.structures["taxonomy.mapped"] = usage["mapped"]
+        for name in ["chebi", "bto"]:
+            if registry.is_loaded(name):
+                report.structures[name] = deep_size(registry.get_resource(name), seen)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from brendapy import BrendaParser
+    from brendapy.settings import BRENDA_FILE
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--brenda-file", default=str(BRENDA_FILE))
+    arg_parser.add_argument("--ecs", nargs="+", help="EC numbers, all if not set")
+    arg_parser.add_argument("--limit", type=int, help="number of EC numbers")
+    arg_parser.add_argument("--mmap", action="store_true", help="memory-map file")
+    arg_parser.add_argument(
+        "--resolve", action="store_true", help="resolve the protein fields"
+    )
+    arg_parser.add_argument(
+        "--trace", action="store_true", help="trace allocations with tracemalloc"
+    )
+    arg_parser.add_argument("--top", type=int, default=10)
+    arg_parser.add_argument("--json", help="JSON file for the report")
+    args = arg_parser.parse_args()
+
+    brenda = BrendaParser(brenda_file=args.brenda_file, mmap=args.mmap)
+    ecs = args.ecs or list(brenda.keys())
+    if args.limit is not None:
+        ecs = ecs[: args.limit]
+    memory = brenda.memory_report(
+        ecs=ecs, parse=True, resolve=args.resolve, trace=args.trace
+    )
+    print(memory.report(top=args.top))
+    if args.json:
+        memory.to_json(args.json)
@@ -0,0 +1,115 @@
+"""Timers and counters for the stages of the parsing.
+
+Metrics are opt-in, with `BrendaParser(metrics=True)` the parser collects
+cumulative timers and counters for the stages of the parse pipeline:
+
+    scan               scanning of the BRENDA file for the entries
+    entry              reading of the entry strings of the EC numbers
+    backend            loading of the info dicts from store or database
+    split              splitting of the entries in lines
+    tokenize           tokenizing of the lines in items
+    store.<bid>        storing of the items of a BRENDA key (`_store_item`)
+    protein            construction of the BRENDA proteins
+    lookup.taxonomy    lookup of the taxonomy ids of the organisms
+
+Counters are kept for the lines, the regex matches (`regex.<pattern>`,
+`regex.<pattern>.miss`) and the ChEBI, BTO and taxonomy lookups
+(`lookup.<resource>`, `lookup.<resource>.miss`).
+
+    parser = BrendaParser(metrics=True)
+    parser.parse_info_dicts()
+    parser.metrics.to_json("metrics.json")
+"""
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+class Metrics(object):
+    """Cumulative timers and counters."""
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        # name: [seconds, calls]
+        self.timers: Dict[str, List] = {}
+        self.counters: Counter = Counter()
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add time to timer.
+
+        :param name: name of the timer
+        :param seconds: time in seconds
+        :param calls: number of timed calls
+        """
+        try:
+            timer = self.timers[name]
+        except KeyError:
+            timer = self.timers[name] = [0.0, 0]
+        timer[0] += seconds
+        timer[1] += calls
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the block with the timer of the given name."""
+        t_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t_start)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increase counter by n."""
+        self.counters[name] += n
+
+    def merge(self, other: "Metrics") -> None:
+        """Add the timers and counters of other metrics, e.g. of a worker process."""
+        for name, (seconds, calls) in other.timers.items():
+            self.add_time(name, seconds, calls=calls)
+        self.counters.update(other.counters)
+
+    def clear(self) -> None:
+        """Reset all timers and counters."""
+        self.timers.clear()
+        self.counters.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Export metrics.
+
+        :return: dict with the timers (seconds and calls) sorted by time and
+                 the counters sorted by name
+        """
+        timers = sorted(self.timers.items(), key=lambda item: -item[1][0])
+        return {
+            "timers": {
+                name: {"seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in timers
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def to_json(self, path: Optional[Union[Path, str]] = None) -> str:
+        """Export metrics as JSON.
+
+        :param path: JSON file to write the metrics to
+        :return: JSON string
+        """
+        data = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f_json:
+                f_json.write(data)
+        return data
+
+    def report(self) -> str:
+        """Get text report of the timers and counters."""
+        data = self.to_dict()
+        lines = [
+            f"{name:<24} {timer['seconds']:10.4f} s {timer['calls']:>10} calls"
+            for name, timer in data["timers"].items()
+        ]
+        lines.extend(
+            f"{name:<24} {count:>23}" for name, count in data["counters"].items()
+        )
+        return "\n".join(lines)
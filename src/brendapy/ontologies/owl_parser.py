@@ -8,8 +8,6 @@ import warnings
 from pathlib import Path
 from typing import Any, Dict, Union
 
-import pronto
-
 
 RESOURCES_PATH = Path(__file__).parent.parent / "resources"
 BTO_JSON = RESOURCES_PATH / "data" / "bto" / "bto.json"
@@ -21,6 +19,7 @@ def parse_owl_map(owl_path: Path, json_path: Path) -> None:
 
     Stores processed information as JSON for fast lookup of ontology id.
     """
+    import pronto
 
     # read ontology with pronto
     with warnings.catch_warnings():
@@ -47,20 +47,67 @@ The following information is available:
     TR    temperature range
     TS    temperature stability
 """
+import os
 import re
+import time
 from collections import OrderedDict, defaultdict
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from brendapy import utils
+from brendapy.cache import CacheInfo, LRUCache
+from brendapy.database import BrendaDatabase
+from brendapy.diagnostics import DIAGNOSTICS, DiagnosticsCollector
+from brendapy.flatfile import (
+    EntryIndex,
+    EntryTextMap,
+    ReleaseDiff,
+    ec_from_id_line,
+    load_entry_index,
+    release_diff,
+)
 from brendapy.log import get_logger
-from brendapy.settings import BRENDA_FILE
-from brendapy.substances import CHEBI
-from brendapy.taxonomy import Taxonomy
-from brendapy.tissues import BTO
+from brendapy.metrics import Metrics
+from brendapy.registry import get_resource
+from brendapy.settings import BRENDA_FILE, ensure_resources
+from brendapy.store import BrendaStore
+
+
+if TYPE_CHECKING:
+    from brendapy.memory import MemoryReport
 
 
 logger = get_logger(__name__)
-TAXONOMY = Taxonomy()
+
+CachedType = TypeVar("CachedType")
+
+
+def __getattr__(name: str) -> Any:
+    """Load taxonomy on first access of `TAXONOMY`."""
+    if name == "TAXONOMY":
+        return get_resource("taxonomy")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class BrendaParser(object):
@@ -117,6 +164,9 @@ class BrendaParser(object):
         "TR",
         "TS",
     ]
+    BRENDA_KEY_SET = frozenset(BRENDA_KEYS)
+    # keys which are parsed for every field selection
+    REQUIRED_FIELDS = frozenset({"ID", "PR", "RF"})
     PATTERN_RF = re.compile(r"^<(\d+?)> (.+) {Pubmed:\s*(\d*)\s*}")
     PATTERN_ALL = re.compile(r"^#([,\d\s]+?)#(.+)<([,\d\s]+)>")
     PATTERN_VALUE = re.compile(r"^([\d\.]+)\s+\{(.+)\}")
@@ -130,25 +180,147 @@ class BrendaParser(object):
         "SA": "µmol/min/mg",
     }
 
-    def __init__(self, brenda_file=BRENDA_FILE):
+    def __init__(
+        self,
+        brenda_file: Union[Path, str] = BRENDA_FILE,
+        mmap: bool = False,
+        index: bool = True,
+        store: Optional[Union[Path, str]] = None,
+        database: Optional[Union[Path, str]] = None,
+        cache_entries: Optional[int] = None,
+        cache_bytes: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        metrics: bool = False,
+    ) -> None:
         """Initialize parser and parse BRENDA file.
 
+        With `mmap` the BRENDA file is memory-mapped and only the byte offsets
+        of the entries are kept in memory. The entry strings in `ec_text` are
+        decoded on access and contain the raw lines of the entry.
+
+        With `index` the entry offsets are read from the sidecar index of the
+        BRENDA file, which is written on the first start and rebuilt if the
+        file changes. This avoids scanning the file line by line.
+
+        With `store` the parsed info dicts are loaded from a BRENDA store
+        (see `brendapy.store.build_store`) instead of parsing the BRENDA file.
+        The BRENDA file is not read and `ec_text` is empty.
+
+        With `database` the info dicts are restored from the SQLite database
+        (see `brendapy.database.build_database`). The database supports
+        indexed queries over all EC numbers via `self.backend.query`.
+
         :param brenda_file: BRENDA text file
+        :param mmap: memory-map the BRENDA file instead of reading all entries
+        :param index: use the sidecar index of the BRENDA file
+        :param store: path of BRENDA store to load the info dicts from
+        :param database: path of SQLite database to load the info dicts from
+        :param cache_entries: maximal number of EC numbers in the cache of
+                              parsed info dicts and proteins, unbounded if None
+        :param cache_bytes: approximate maximal size in bytes of the cached
+                            info dicts, unbounded if None
+        :param fields: BRENDA keys to parse, e.g. `["KM", "TN"]`, all keys if
+                       None. ID, PR and RF are always parsed.
+        :param metrics: collect timers and counters of the parse stages in
+                        `self.metrics` (see `brendapy.metrics`)
         """
         self.brenda_file = brenda_file
-        self.ec_text = BrendaParser.parse_entry_strings(self.brenda_file)
-        self.ec_data = OrderedDict()  # only parse on demand
+        self.fields = BrendaParser._normalize_fields(fields)
+        # issues found while parsing, shared by all parsers and proteins
+        self.diagnostics: DiagnosticsCollector = DIAGNOSTICS
+        self.metrics: Optional[Metrics] = Metrics() if metrics else None
+        t_start = time.perf_counter()
+        self.entry_index: Optional[EntryIndex] = None
+        self.backend: Optional[Mapping] = None
+        # entry strings, offsets of the entries with `mmap`
+        self.ec_text: Mapping[Optional[str], str]
+
+        if store or database:
+            if store:
+                self.backend = BrendaStore(store)
+            elif database:
+                self.backend = BrendaDatabase(database)
+            self.ec_text = OrderedDict()
+        else:
+            if str(self.brenda_file) == str(BRENDA_FILE):
+                ensure_resources()
+            if index:
+                self.entry_index = load_entry_index(self.brenda_file)
+
+            if mmap:
+                self.ec_text = EntryTextMap(
+                    self.brenda_file,
+                    offsets=self.entry_index.offsets if self.entry_index else None,
+                )
+            elif self.entry_index:
+                self.ec_text = self.entry_index.read_entries(self.brenda_file)
+            else:
+                self.ec_text = BrendaParser.parse_entry_strings(self.brenda_file)
+            if self.metrics is not None:
+                self.metrics.add_time("scan", time.perf_counter() - t_start)
+        # only parse on demand, proteins are evicted with their info dict
+        self.proteins = LRUCache(max_entries=cache_entries)
+        self.ec_data = LRUCache(
+            max_entries=cache_entries,
+            max_bytes=cache_bytes,
+            on_evict=self._evict_proteins,
+        )
+
+    @property
+    def checksums(self) -> Optional[Mapping[Optional[str], Optional[str]]]:
+        """Checksums of the BRENDA entries.
+
+        :return: dict of ec and checksum, None if no checksums are available
+        """
+        if self.entry_index:
+            return self.entry_index.checksums
+        return getattr(self.backend, "checksums", None)
+
+    def release_diff(
+        self, checksums: Mapping[Optional[str], Optional[str]]
+    ) -> ReleaseDiff:
+        """Compare the entries with the entries of another BRENDA release.
+
+        :param checksums: checksums of the entries of the other release, e.g.
+                          from a store or database built for that release
+        :return: release diff
+        """
+        if self.checksums is None:
+            raise ValueError(
+                "No checksums of the BRENDA entries, create the parser with "
+                "`index=True`."
+            )
+        return release_diff(old=checksums, new=self.checksums)
 
-    def keys(self) -> List:
+    def keys(self) -> KeysView:
         """Available ec keys.
 
         Information for these EC numbers is available in the
         parser object.
 
-        :return: list of ec numbers
+        :return: ec numbers
         """
+        if self.backend:
+            return self.backend.keys()
         return self.ec_text.keys()
 
+    @staticmethod
+    def _normalize_fields(
+        fields: Optional[Iterable[str]],
+    ) -> Optional[FrozenSet[str]]:
+        """Check field selection and add the required fields.
+
+        :param fields: BRENDA keys, None for all keys
+        :return: set of BRENDA keys, None for all keys
+        """
+        if fields is None:
+            return None
+        fields = frozenset(fields)
+        unsupported = fields - BrendaParser.BRENDA_KEY_SET
+        if unsupported:
+            raise ValueError(f"Unsupported BRENDA keys: {sorted(unsupported)}")
+        return fields | BrendaParser.REQUIRED_FIELDS
+
     @staticmethod
     def parse_entry_strings(filename):
         """Read the string entries from BRENDA file.
@@ -187,81 +359,233 @@ class BrendaParser(object):
 
         return ec_data
 
-    @utils.timeit
-    def parse_info_dicts(self):
+    def parse_info_dicts(
+        self, jobs: Optional[int] = 1
+    ) -> "OrderedDict[Optional[str], Dict]":
         """Parse all info dicts.
 
         This takes around ~15s and prepares all proteins.
+
+        With `jobs > 1` the entries are parsed in a process pool. The entries
+        are split in chunks of similar byte size, so that large ECs like
+        1.1.1.1 do not block a worker. The result is identical to the serial
+        parsing.
+
+        At the end a summary of the parse issues is logged per category.
+
+        :param jobs: number of processes, None uses all cpus
+        :return: dict (ec, info_dict)
         """
-        d = OrderedDict()
-        for ec, ec_string in self.ec_text.items():
-            d[ec] = BrendaParser._parse_info_dict(ec, ec_string)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs <= 1 or self.backend:
+            return OrderedDict(self.iter_entries())
+
+        since = DIAGNOSTICS.snapshot()
+        d: "OrderedDict[Optional[str], Dict]" = OrderedDict()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parse_chunk = partial(
+                _parse_info_dict_chunk,
+                fields=self.fields,
+                metrics=self.metrics is not None,
+            )
+            for results, diagnostics, metrics in executor.map(
+                parse_chunk, self._chunks(jobs)
+            ):
+                d.update(results)
+                DIAGNOSTICS.merge(diagnostics)
+                if self.metrics is not None and metrics is not None:
+                    self.metrics.merge(metrics)
+        DIAGNOSTICS.log_summary(since=since)
         return d
 
+    def _chunks(self, jobs: int) -> List[Mapping]:
+        """Split entries in chunks for parallel parsing.
+
+        Chunks of the memory-mapped file only contain the offsets of the entries,
+        the entries are read by the worker processes.
+        """
+        if self.entry_index:
+            offsets = self.entry_index.offsets
+            sizes = [(ec, length) for ec, (_, length) in offsets.items()]
+        else:
+            sizes = [(ec, len(ec_str)) for ec, ec_str in self.ec_text.items()]
+
+        chunks: List[Mapping] = []
+        for ecs in utils.chunk_by_size(sizes, n_chunks=8 * jobs):
+            if self.entry_index:
+                chunks.append(
+                    EntryTextMap(
+                        self.brenda_file, offsets={ec: offsets[ec] for ec in ecs}
+                    )
+                )
+            else:
+                chunks.append({ec: self.ec_text[ec] for ec in ecs})
+        return chunks
+
+    def iter_entries(
+        self,
+        ecs: Optional[Iterable[Optional[str]]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Tuple]:
+        """Iterate over the parsed info dicts of the EC numbers.
+
+        Entries are parsed one at a time and are not stored in `ec_data`,
+        so the parsed data can be released after every EC. Use together
+        with `mmap=True` to keep the memory constant for the complete
+        BRENDA file. After the last entry a summary of the parse issues is
+        logged per category.
+
+        :param ecs: EC numbers to parse, all EC numbers if None
+        :param fields: BRENDA keys to parse, the fields of the parser if None
+        :return: iterator of (ec, info_dict)
+        """
+        selection = BrendaParser._normalize_fields(fields)
+        if ecs is None:
+            ecs = self.keys()
+        since = DIAGNOSTICS.snapshot()
+        for ec in ecs:
+            yield ec, self._load_info_dict(ec, fields=selection)
+        DIAGNOSTICS.log_summary(since=since)
+
+    def _load_info_dict(
+        self, ec: Optional[str], fields: Optional[FrozenSet[str]] = None
+    ) -> Dict:
+        """Load info dict for EC from the backend or parse it from the entry.
+
+        :param ec: EC number
+        :param fields: BRENDA keys to parse, the fields of the parser if None
+        """
+        if fields is None:
+            fields = self.fields
+        metrics = self.metrics
+        if self.backend:
+            ec_data: Dict
+            if metrics is None:
+                ec_data = self.backend[ec]
+            else:
+                with metrics.timer("backend"):
+                    ec_data = self.backend[ec]
+            if fields is None or fields >= BrendaParser.BRENDA_KEY_SET:
+                return ec_data
+            results: DefaultDict[str, Any] = defaultdict(OrderedDict)
+            for bid, values in ec_data.items():
+                if bid in fields:
+                    results[bid] = values
+            return results
+        if metrics is None:
+            ec_str = self.ec_text[ec]
+        else:
+            with metrics.timer("entry"):
+                ec_str = self.ec_text[ec]
+        return BrendaParser._parse_info_dict(ec, ec_str, fields=fields, metrics=metrics)
+
+    def iter_proteins(
+        self, ecs: Optional[Iterable[str]] = None
+    ) -> Iterator["BrendaProtein"]:
+        """Iterate over the BRENDA proteins of the EC numbers.
+
+        See `iter_entries`, the parsed data is not cached.
+
+        :param ecs: EC numbers to parse, all EC numbers if None
+        :return: iterator of BRENDA proteins
+        """
+        for ec, ec_data in self.iter_entries(ecs=ecs):
+            yield from self._create_proteins(ec, ec_data).values()
+
     @staticmethod
-    def _parse_info_dict(ec: str, ec_str):
-        """Parse info dictionary."""
+    def _parse_info_dict(
+        ec: Optional[str],
+        ec_str: str,
+        fields: Optional[FrozenSet[str]] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> Dict:
+        """Parse info dictionary.
+
+        The lines of the entry are tokenized in a single pass. An item starts
+        with the BRENDA key and the item separated by a tab, continuation
+        lines start with a tab and an empty line terminates the item.
+        Lines of keys which are not in `fields` are skipped.
 
-        def parse_bid_item(line):
-            tokens = line.split("\t")
-            bid = tokens[0].strip()
-            item = "\t".join(tokens[1:])
-            return bid, item
+        :param ec: EC number
+        :param ec_str: BRENDA entry
+        :param fields: BRENDA keys to parse, all keys if None
+        :param metrics: metrics for the timers and counters of the parsing
+        """
+        brenda_keys = BrendaParser.BRENDA_KEY_SET if fields is None else fields
+        if metrics is not None:
+            t_start = time.perf_counter()
+        lines = ec_str.split("\n")
+        if metrics is not None:
+            t_split = time.perf_counter()
+            metrics.add_time("split", t_split - t_start)
+            metrics.count("lines", len(lines))
 
         # parse entries from lines
-        bid_sets = defaultdict(set)  # sets to remove duplicate entries
-        in_item = False
-
-        for line in ec_str.split("\n"):
-            if not in_item:
-                if len(line) > 0 and not line.startswith("\t"):
-                    bid, item = parse_bid_item(line)
-                    if bid in BrendaParser.BRENDA_KEYS:
-                        in_item = True
-                    else:
-                        in_item = False
-                        item = None
-
-            elif in_item:
+        # sets to remove duplicate entries
+        bid_sets: DefaultDict[str, Set[str]] = defaultdict(set)
+        bid = ""
+        # parts of the current item, None if not in item
+        parts: Optional[List[str]] = None
+
+        for line in lines:
+            if not line:
+                # store last entry
+                if parts is not None:
+                    bid_sets[bid].add(" ".join(parts))
+                    parts = None
+            elif line[0] == "\t":
                 # entries longer than one line
-                if line.startswith("\t"):
-                    item += " " + line.strip()
-
-                # write entries if next entry begins
-                elif len(line) > 0 and not line.startswith("\t"):
-                    # store old entry
-                    bid_sets[bid].add(item)
-                    in_item = False
-
-                    # create new entry
-                    bid, item = parse_bid_item(line)
-                    if bid in BrendaParser.BRENDA_KEYS:
-                        in_item = True
-                    else:
-                        logger.error(
-                            f"{ec}_{bid}: BRENDA key not supported in line: `{line}`"
-                        )
-                        item = None
+                if parts is not None:
+                    parts.append(line.strip())
+            else:
+                # store old entry if next entry begins
+                in_item = parts is not None
+                if parts is not None:
+                    bid_sets[bid].add(" ".join(parts))
+
+                # create new entry
+                head, _, item = line.partition("\t")
+                bid = head.strip()
+                if bid in brenda_keys:
+                    parts = [item]
+                else:
+                    parts = None
+                    if in_item and bid not in BrendaParser.BRENDA_KEY_SET:
+                        DIAGNOSTICS.add("key_not_supported", line, ec=ec, bid=bid)
 
-                # store last entry
-                elif len(line) == 0:
-                    bid_sets[bid].add(item)
-                    in_item = False
+        if metrics is not None:
+            metrics.add_time("tokenize", time.perf_counter() - t_split)
 
         # transfer the unique entries into results
-        results = defaultdict(OrderedDict)
+        results: DefaultDict[str, Any] = defaultdict(OrderedDict)
         for key, items in bid_sets.items():
+            if metrics is not None:
+                t_store = time.perf_counter()
             for item in sorted(items):  # sorting for reproducible order (in unittests)
-                BrendaParser._store_item(results=results, bid=key, item=item, ec=ec)
+                BrendaParser._store_item(
+                    results=results, bid=key, item=item, ec=ec, metrics=metrics
+                )
+            if metrics is not None:
+                metrics.add_time(
+                    f"store.{key}", time.perf_counter() - t_store, calls=len(items)
+                )
 
         return results
 
     @staticmethod
-    def _store_item(results, bid, item, ec=None):
+    def _store_item(
+        results: Dict,
+        bid: str,
+        item: str,
+        ec: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         """Store parsed item for bid.
 
         :param bid:
         :param item:
+        :param metrics: metrics for the regex and ChEBI lookup counters
         :return:
         """
         if bid == "ID":
@@ -273,6 +597,8 @@ class BrendaParser(object):
                 results[bid].add(item)
         elif bid == "RF":
             match = BrendaParser.PATTERN_RF.match(item)
+            if metrics is not None:
+                metrics.count("regex.rf" if match else "regex.rf.miss")
             if match:
                 rid, info, pubmed = match.group(1), match.group(2), match.group(3)
                 rid = int(rid)  # integer keys for all references
@@ -283,10 +609,12 @@ class BrendaParser(object):
                     pubmed = int(pubmed)  # integer keys for all pubmeds
                     results[bid][rid]["pubmed"] = pubmed
             else:
-                logger.error(f"Reference could not be parsed: `{item}`")
+                DIAGNOSTICS.add("reference_not_parsed", item, ec=ec, bid=bid)
         # everything else
         else:
             match = BrendaParser.PATTERN_ALL.match(item)
+            if metrics is not None:
+                metrics.count("regex.all" if match else "regex.all.miss")
             if match:
                 ids, data_all, refs = match.group(1), match.group(2), match.group(3)
                 ids = ids.replace(" ", ",")  # fix the missing comma in ids
@@ -296,23 +624,22 @@ class BrendaParser(object):
                 # get additional information
                 comment = None
 
-                tokens = data_all.split("(#")
-                if len(tokens) == 1:
-                    data = tokens[0]
-                elif len(tokens) == 2:
-                    data = tokens[0].strip()
-                    comment = "(#" + tokens[1].strip()
-                    comment = comment[1:-1]
+                pos = data_all.find("(#")
+                if pos == -1:
+                    data = data_all
                 else:
-                    logger.error(f"comment could not be parsed: '{data_all}'")
+                    data = data_all[:pos].strip()
+                    if data_all.find("(#", pos + 2) == -1:
+                        comment = "(#" + data_all[pos + 2 :].strip()
+                        comment = comment[1:-1]
+                    else:
+                        DIAGNOSTICS.add("comment_not_parsed", data_all, ec=ec, bid=bid)
 
                 # check data
                 if len(data) == 0:
-                    logger.warning(
-                        f"{ec}_{bid}: empty information not stored: '{data_all}'"
-                    )
+                    DIAGNOSTICS.add("empty_data", data_all, ec=ec, bid=bid)
                 elif data == "more":
-                    logger.info(f"{ec}_{bid}: 'more' data not stored: {data_all}")
+                    DIAGNOSTICS.add("more_data", data_all, ec=ec, bid=bid)
                     return
 
                 # store info as dict
@@ -327,27 +654,35 @@ class BrendaParser(object):
                     info["units"] = BrendaParser.UNITS[bid]
                     if data.startswith("-999"):
                         # parse value
-                        logger.info(f"{ec}_{bid}: '-999' values not parsed: {data}")
+                        DIAGNOSTICS.add("value_999", data, ec=ec, bid=bid)
                     else:
                         match_s = BrendaParser.PATTERN_VALUE.match(info["data"])
+                        if metrics is not None:
+                            metrics.count(
+                                "regex.value" if match_s else "regex.value.miss"
+                            )
                         if match_s:
                             info["value"] = float(match_s.group(1))
                             substrate = match_s.group(2)
                             info["substrate"] = substrate
-                            if substrate in CHEBI:
-                                info["chebi"] = CHEBI[substrate]
+                            chebi = get_resource("chebi")
+                            if substrate in chebi:
+                                info["chebi"] = chebi[substrate]
+                                if metrics is not None:
+                                    metrics.count("lookup.chebi")
                             else:
-                                logger.info(
-                                    f"Substrate not found in CHEBI: '{substrate}'"
+                                if metrics is not None:
+                                    metrics.count("lookup.chebi.miss")
+                                DIAGNOSTICS.add(
+                                    "substrate_not_in_chebi", substrate, ec=ec, bid=bid
                                 )
                         else:
                             # trying the simple patterns without substrate
                             try:
                                 info["value"] = float(info["data"])
                             except ValueError:
-                                logger.error(
-                                    f"data could not be converted to float: "
-                                    f"{info['data']}"
+                                DIAGNOSTICS.add(
+                                    "value_not_float", info["data"], ec=ec, bid=bid
                                 )
 
                 for pid in ids:
@@ -360,37 +695,149 @@ class BrendaParser(object):
                             results[bid][pid] = [info]
             else:
                 if bid == "SY" and item[0] != "#":
-                    logger.info(f"{ec}_{bid}: generic synonyms are not stored: {item}")
+                    DIAGNOSTICS.add("generic_synonym", item, ec=ec, bid=bid)
                 else:
-                    logger.error(f"{ec}_{bid}: could not be parsed: `{item}`")
+                    DIAGNOSTICS.add("item_not_parsed", item, ec=ec, bid=bid)
 
     @staticmethod
     def _get_ec_from_line(line):
-        ec = line.strip().split("\t")[1].strip()
-        ec = ec.split(" ")[0]
-        if utils.is_ec_number(ec):
-            return ec
-        else:
-            return None
+        return ec_from_id_line(line)
 
-    def get_proteins(self, ec: str) -> Dict[int, "BrendaProtein"]:
+    def get_proteins(
+        self, ec: str, fields: Optional[Iterable[str]] = None
+    ) -> Dict[int, "BrendaProtein"]:
         """Parse all BRENDA proteins for given EC number.
 
+        Proteins for a field selection different from the fields of the
+        parser are not cached.
+
         :param ec:
+        :param fields: BRENDA keys to parse, the fields of the parser if None
         :return: OrderedDict of BRENDA proteins
         """
-        # process text data for ec if not already existing
-        if ec not in self.ec_data:
-            self.ec_data[ec] = BrendaParser._parse_info_dict(
-                ec, ec_str=self.ec_text[ec]
-            )
+        if fields is not None:
+            selection = BrendaParser._normalize_fields(fields)
+            if selection != self.fields:
+                ec_data = self._load_info_dict(ec, fields=selection)
+                return self._create_proteins(ec, ec_data)
+
+        try:
+            proteins = self.proteins[ec]
+        except KeyError:
+            pass
+        else:
+            # mark info dict as recently used, it is evicted with the proteins
+            if ec in self.ec_data:
+                self.ec_data.touch(ec)
+            return dict(proteins)
 
-        ec_data = self.ec_data[ec]
-        proteins = {}
-        for key in ec_data["PR"].keys():
-            proteins[key] = BrendaProtein(ec=ec, key=key, data=ec_data)
+        # process text data for ec if not already existing
+        try:
+            ec_data = self.ec_data[ec]
+        except KeyError:
+            ec_data = self._load_info_dict(ec)
+            self.ec_data[ec] = ec_data
+
+        proteins = self._create_proteins(ec, ec_data)
+        if ec in self.ec_data:
+            self.proteins[ec] = proteins
+        return dict(proteins)
+
+    def _create_proteins(self, ec: str, ec_data: Dict) -> Dict[int, "BrendaProtein"]:
+        """Create the BRENDA proteins of the info dict."""
+        metrics = self.metrics
+        if metrics is None:
+            return {
+                key: BrendaProtein(ec=ec, key=key, data=ec_data)
+                for key in ec_data["PR"].keys()
+            }
+        t_start = time.perf_counter()
+        proteins = {
+            key: BrendaProtein(ec=ec, key=key, data=ec_data, metrics=metrics)
+            for key in ec_data["PR"].keys()
+        }
+        metrics.add_time("protein", time.perf_counter() - t_start, calls=len(proteins))
         return proteins
 
+    def _evict_proteins(self, ec: Hashable, ec_data: Dict) -> None:
+        """Remove the proteins of evicted info dict from the cache."""
+        if ec in self.proteins:
+            self.proteins.evict(ec)
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """Statistics of the caches for info dicts and proteins."""
+        return {
+            "ec_data": self.ec_data.cache_info(),
+            "proteins": self.proteins.cache_info(),
+        }
+
+    def memory_report(
+        self,
+        ecs: Optional[Iterable[str]] = None,
+        parse: bool = False,
+        resolve: bool = False,
+        trace: bool = False,
+        resources: bool = True,
+    ) -> "MemoryReport":
+        """Report the deep memory use of the parser (see `brendapy.memory`).
+
+        The memory use is reported by structure (`ec_text`, `ec_data`,
+        proteins, taxonomy, ChEBI, BTO, ...), by EC number and by BRENDA key.
+
+        :param ecs: EC numbers to report, all EC numbers if None
+        :param parse: parse the proteins of the EC numbers before reporting
+        :param resolve: resolve the fields of the parsed proteins
+        :param trace: trace the allocations of the parsing with tracemalloc
+        :param resources: report the loaded taxonomy, ChEBI and BTO resources
+        :return: memory report
+        """
+        from brendapy.memory import memory_report, trace_allocations
+
+        if (resolve or trace) and not parse:
+            raise ValueError("`resolve` and `trace` require `parse=True`.")
+        traced = None
+        if parse:
+            ecs = list(self.keys()) if ecs is None else list(ecs)
+            with trace_allocations() if trace else nullcontext() as traced:
+                for ec in ecs:
+                    proteins = self.get_proteins(ec)
+                    if resolve:
+                        for protein in proteins.values():
+                            protein.resolve()
+        report = memory_report(self, ecs=ecs, resources=resources)
+        report.traced = traced
+        return report
+
+
+def _parse_info_dict_chunk(
+    ec_text: Mapping, fields: Optional[FrozenSet[str]] = None, metrics: bool = False
+) -> Tuple[List[Tuple], DiagnosticsCollector, Optional[Metrics]]:
+    """Parse info dicts for chunk of entries in worker process.
+
+    :return: tuple of parsed info dicts, the parse issues and the metrics of
+             the chunk
+    """
+    DIAGNOSTICS.clear()
+    chunk_metrics = Metrics() if metrics else None
+    results = []
+    for ec in ec_text.keys():
+        if chunk_metrics is None:
+            ec_str = ec_text[ec]
+        else:
+            with chunk_metrics.timer("entry"):
+                ec_str = ec_text[ec]
+        results.append(
+            (
+                ec,
+                BrendaParser._parse_info_dict(
+                    ec, ec_str, fields=fields, metrics=chunk_metrics
+                ),
+            )
+        )
+    if isinstance(ec_text, EntryTextMap):
+        ec_text.close()
+    return results, DIAGNOSTICS, chunk_metrics
+
 
 class BrendaProtein(object):
     """Stores BRENDA information for a protein entry.
@@ -408,84 +855,166 @@ class BrendaProtein(object):
         r"([A-N,R-Z][0-9]([A-Z][A-Z, 0-9][A-Z, 0-9][0-9]){1,2})|([O,P,Q][0-9][A-Z, 0-9][A-Z, 0-9][A-Z, 0-9][0-9])(\.\d+)?"  # noqa: E501
     )
 
-    def __init__(self, ec, key, data):
+    # keys of the information shared by all proteins of the EC
+    EC_KEYS = {"ID", "RN", "RE", "RT", "SN"}
+
+    __slots__ = ("_ec", "_key", "_ec_data", "_cache", "_metrics")
+
+    def __init__(
+        self,
+        ec: Optional[str],
+        key: int,
+        data: Dict,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         """Construct protein object.
 
+        The protein holds a reference to the data of the EC number, the
+        fields are resolved on first access and cached.
+
         :param ec: EC number
         :param key: integer protein key (BRENDA key for protein)
         :param data: data dictionary for the complete ec number
+        :param metrics: metrics for the BTO and taxonomy lookups
+        """
+        if key not in data["PR"]:
+            raise KeyError(key)
+        self._ec = ec
+        self._key = key
+        self._ec_data = data
+        self._cache: Dict[str, Any] = {}
+        self._metrics = metrics
+
+    def _cached(self, name: str, factory: Callable[[], CachedType]) -> CachedType:
+        """Get cached value, the value is created with factory on first access."""
+        try:
+            value: CachedType = self._cache[name]
+        except KeyError:
+            value = factory()
+            self._cache[name] = value
+        return value
+
+    def _field(self, bid: str) -> Any:
+        """Get information of the protein for BRENDA key.
+
+        :param bid: BRENDA key
+        :return: information, None if no information exists for the protein
         """
-        protein_info = data["PR"][key]["data"]
+        ec_data = self._ec_data
+        if bid in BrendaProtein.EC_KEYS:
+            return ec_data[bid] if bid in ec_data else OrderedDict()
+        if bid not in ec_data:
+            return None
+        return ec_data[bid].get(self._key, None) or None
 
-        # organism
-        match_organism = BrendaProtein.PATTERN_ORGANISM.match(protein_info)
-        if match_organism:
-            organism = f"{match_organism.group(1)} {match_organism.group(2)}"
-        else:
-            organism = protein_info
-            logger.warning(f"Organism could not be parsed from: '{protein_info}'")
+    @property
+    def _protein_info(self) -> Dict:
+        info: Dict = self._ec_data["PR"][self._key]
+        return info
 
-        # taxonomy
-        taxonomy = TAXONOMY.get_taxonomy_id(organism)
+    @property
+    def data(self) -> Dict:
+        """Dictionary with all information of the protein.
 
-        # uniprot
-        uniprot = None
-        for token in protein_info.split(" "):
-            match_uniprot = BrendaProtein.PATTERN_UNIPROT.match(token)
-            if match_uniprot:
-                uniprot = token
-                break
+        The dictionary is created on first access.
+        """
+        return self._cached("data", self._create_data)
+
+    def resolve(self) -> None:
+        """Resolve all fields of the protein.
+
+        The fields (organism, taxonomy, tissues, references, ...) are
+        resolved and cached with the data dictionary.
+        """
+        self._cached("data", self._create_data)
 
-        self.data = OrderedDict(
+    def _create_data(self) -> Dict:
+        data = OrderedDict(
             [
-                ("protein_id", key),
-                ("ec", ec),
-                ("organism", organism),
-                ("taxonomy", taxonomy),
-                ("uniprot", uniprot),
+                ("protein_id", self.protein_id),
+                ("ec", self.ec),
+                ("organism", self.organism),
+                ("taxonomy", self.taxonomy),
+                ("uniprot", self.uniprot),
             ]
         )
-        reference_ids = set(data["PR"][key]["refs"])
-
-        # add all fields
         for bid in BrendaParser.BRENDA_KEYS:
-
-            if bid in {"ID", "RN", "RE", "RT", "SN"}:
-                # ec number, ec sets (ec data set for all proteins)
-                self.data[bid] = data[bid]
-                continue
-            elif bid in {"PR", "RF"}:
+            if bid in {"PR", "RF"}:
                 # not set as local protein fields
                 continue
+            info = self.ST if bid == "ST" else self._field(bid)
+            if info is not None:
+                data[bid] = info
+        data["references"] = self.references
+        data["tissues"] = self.tissues
+        return data
+
+    def _create_references(self) -> Dict:
+        reference_ids = set(self._protein_info["refs"])
+        ec_data = self._ec_data
+        for bid, values in ec_data.items():
+            if bid in BrendaProtein.EC_KEYS or bid in {"PR", "RF"}:
+                continue
+            info = values.get(self._key, None)
+            # for the list items collect additional references
+            if info and isinstance(info, (list,)):
+                for item in info:
+                    reference_ids.update(item["refs"])
+
+        references = ec_data["RF"] if "RF" in ec_data else {}
+        return {ref_id: references.get(ref_id, {}) for ref_id in reference_ids}
+
+    def _create_st(self) -> Optional[List[Dict]]:
+        """Map tissues on Brenda Tissue Ontology.
+
+        The ST items are shared between the proteins of the EC, so copies
+        of the items with the BTO term are created.
+        """
+        items = self._field("ST")
+        if not items:
+            return None
+        st_items = []
+        bto_map = get_resource("bto")
+        for item in items:
+            tissue = item["data"]
+            bto = bto_map.get(tissue, None)
+            if self._metrics is not None:
+                self._metrics.count("lookup.bto" if bto else "lookup.bto.miss")
+            if bto:
+                item = dict(item)
+                item["bto"] = bto
             else:
-                info = data[bid].get(key, None)
-                if info:
-                    self.data[bid] = info
-                    # for the list items collect additional references
-                    if isinstance(info, (list,)):
-                        for item in info:
-                            # collect additional references
-                            reference_ids.update(item["refs"])
-
-        self.data["references"] = {
-            ref_id: data["RF"].get(ref_id, {}) for ref_id in reference_ids
-        }
+                DIAGNOSTICS.add("tissue_not_in_bto", tissue, ec=self._ec, bid="ST")
+            st_items.append(item)
+        return st_items
 
-        # map tissues on Brenda Tissue Ontology
-        tissues = set()
-        if self.ST:
-            for item in self.ST:
-                tissue = item["data"]
-                bto = BTO.get(tissue, None)
-                if bto:
-                    item["bto"] = bto
-                    tissues.add(bto)
-                else:
-                    logger.error(
-                        f"Source/Tissue not found in Brenda Tissue Ontology (BTO): "
-                        f"'{tissue}'"
-                    )
-        self.data["tissues"] = tissues
+    @staticmethod
+    def parse_organism(protein_info: str) -> str:
+        """Parse organism from the PR information.
+
+        :param protein_info: data of the PR item
+        :return: organism, the complete information if it could not be parsed
+        """
+        match_organism = BrendaProtein.PATTERN_ORGANISM.match(protein_info)
+        if match_organism:
+            return f"{match_organism.group(1)} {match_organism.group(2)}"
+
+        DIAGNOSTICS.add("organism_not_parsed", protein_info, bid="PR")
+        return protein_info
+
+    @staticmethod
+    def parse_uniprots(protein_info: str) -> List[str]:
+        """Parse all UniProt/SwissProt accessions from the PR information.
+
+        :param protein_info: data of the PR item
+        :return: list of accessions in order of occurrence
+        """
+        uniprots: List[str] = []
+        for token in protein_info.split(" "):
+            match_uniprot = BrendaProtein.PATTERN_UNIPROT.match(token)
+            if match_uniprot and token not in uniprots:
+                uniprots.append(token)
+        return uniprots
 
     @property
     def protein_id(self):
@@ -496,17 +1025,20 @@ class BrendaProtein(object):
 
         :return: int protein id
         """
-        return self.data["protein_id"]
+        return self._key
 
     @property
     def ec(self):
         """EC."""
-        return self.data["ec"]
+        return self._ec
 
     @property
     def organism(self):
         """Organism."""
-        return self.data["organism"]
+        return self._cached(
+            "organism",
+            lambda: BrendaProtein.parse_organism(self._protein_info["data"]),
+        )
 
     @property
     def taxonomy(self):
@@ -514,7 +1046,32 @@ class BrendaProtein(object):
 
         :return: NCBI taxonomy id, None if organism could not be mapped
         """
-        return self.data["taxonomy"]
+        return self._cached("taxonomy", self._resolve_taxonomy)
+
+    def _resolve_taxonomy(self) -> Optional[int]:
+        organism = self.organism
+        metrics = self._metrics
+        tax_id: Optional[int]
+        if metrics is None:
+            tax_id = get_resource("taxonomy").get_taxonomy_id(organism, warn=False)
+        else:
+            with metrics.timer("lookup.taxonomy"):
+                tax_id = get_resource("taxonomy").get_taxonomy_id(organism, warn=False)
+            metrics.count("lookup.taxonomy" if tax_id else "lookup.taxonomy.miss")
+        if tax_id is None:
+            DIAGNOSTICS.add("taxonomy_not_resolved", organism, ec=self._ec, bid="PR")
+        return tax_id
+
+    @property
+    def uniprots(self) -> List[str]:
+        """UniProt/SwissProt ids.
+
+        :return: list of uniprot ids, empty list if no information available
+        """
+        return self._cached(
+            "uniprots",
+            lambda: BrendaProtein.parse_uniprots(self._protein_info["data"]),
+        )
 
     @property
     def uniprot(self):
@@ -522,7 +1079,8 @@ class BrendaProtein(object):
 
         :return: uniprot id, None if no information available for protein entry
         """
-        return self.data["uniprot"]
+        uniprots = self.uniprots
+        return uniprots[0] if uniprots else None
 
     @property
     def tissues(self):
@@ -530,12 +1088,15 @@ class BrendaProtein(object):
 
         :return: set of bto terms, empty set if no bto terms exist
         """
-        return self.data["tissues"]
+        return self._cached(
+            "tissues",
+            lambda: {item["bto"] for item in (self.ST or []) if "bto" in item},
+        )
 
     @property
     def references(self):
         """References."""  # noqa: D401
-        return self.data["references"]
+        return self._cached("references", self._create_references)
 
     def __str__(self):
         """String representation."""  # noqa: D401
@@ -546,209 +1107,209 @@ class BrendaProtein(object):
     @property
     def AC(self):
         """Activating compound."""
-        return self.data.get("AC", None)
+        return self._field("AC")
 
     @property
     def AP(self):
         """Application."""
-        return self.data.get("AP", None)
+        return self._field("AP")
 
     @property
     def CF(self):
         """Cofactor."""
-        return self.data.get("CF", None)
+        return self._field("CF")
 
     @property
     def CL(self):
         """Cloned."""
-        return self.data.get("CL", None)
+        return self._field("CL")
 
     @property
     def CR(self):
         """Crystallization."""
-        return self.data.get("CR", None)
+        return self._field("CR")
 
     @property
     def EN(self):
         """Engineering."""
-        return self.data.get("EN", None)
+        return self._field("EN")
 
     @property
     def EXP(self):
         """Expression."""
-        return self.data.get("EXP", None)
+        return self._field("EXP")
 
     @property
     def GI(self):
         """General information on enzyme."""
-        return self.data.get("GI", None)
+        return self._field("GI")
 
     @property
     def GS(self):
         """General stability."""
-        return self.data.get("GS", None)
+        return self._field("GS")
 
     @property
     def IC50(self):
         """IC-50 Value."""
-        return self.data.get("IC50", None)
+        return self._field("IC50")
 
     @property
     def ID(self):
         """EC-class."""
-        return self.data.get("ID", None)
+        return self._field("ID")
 
     @property
     def IN(self):
         """Inhibitors."""
-        return self.data.get("IN", None)
+        return self._field("IN")
 
     @property
     def KKM(self):
         """Kcat/KM-Value substrate in {...}."""
-        return self.data.get("KKM", None)
+        return self._field("KKM")
 
     @property
     def KI(self):
         """Ki-value inhibitor in {...}."""
-        return self.data.get("KI", None)
+        return self._field("KI")
 
     @property
     def KM(self):
         """KM-value substrate in {...}."""
-        return self.data.get("KM", None)
+        return self._field("KM")
 
     @property
     def LO(self):
         """Localization."""
-        return self.data.get("LO", None)
+        return self._field("LO")
 
     @property
     def ME(self):
         """Metals/ions."""
-        return self.data.get("ME", None)
+        return self._field("ME")
 
     @property
     def MW(self):
         """Molecular weight."""
-        return self.data.get("MW", None)
+        return self._field("MW")
 
     @property
     def NSP(self):
         """Natural substrates/products reversibilty information in {...}."""
-        return self.data.get("NSP", None)
+        return self._field("NSP")
 
     @property
     def OS(self):
         """Oxygen stability."""
-        return self.data.get("OS", None)
+        return self._field("OS")
 
     @property
     def OSS(self):
         """Organic solvent stability."""
-        return self.data.get("OSS", None)
+        return self._field("OSS")
 
     @property
     def PHO(self):
         """PH-optimum."""
-        return self.data.get("PHO", None)
+        return self._field("PHO")
 
     @property
     def PHR(self):
         """PH-range."""
-        return self.data.get("PHR", None)
+        return self._field("PHR")
 
     @property
     def PHS(self):
         """PH stability."""
-        return self.data.get("PHS", None)
+        return self._field("PHS")
 
     @property
     def PI(self):
         """Isoelectric point."""
-        return self.data.get("PI", None)
+        return self._field("PI")
 
     @property
     def PM(self):
         """Posttranslation modification."""
-        return self.data.get("PM", None)
+        return self._field("PM")
 
     @property
     def PU(self):
         """Purification."""
-        return self.data.get("PU", None)
+        return self._field("PU")
 
     @property
     def RE(self):
         """Reaction catalyzed."""
-        return self.data.get("RE", None)
+        return self._field("RE")
 
     @property
     def REN(self):
         """Renatured."""
-        return self.data.get("REN", None)
+        return self._field("REN")
 
     @property
     def RN(self):
         """Accepted name (IUPAC)."""  # noqa: D401
-        return self.data.get("RN", None)
+        return self._field("RN")
 
     @property
     def RT(self):
         """Reaction type."""
-        return self.data.get("RT", None)
+        return self._field("RT")
 
     @property
     def SA(self):
         """Specific activity."""
-        return self.data.get("SA", None)
+        return self._field("SA")
 
     @property
     def SN(self):
         """Synonyms."""
-        return self.data.get("SN", None)
+        return self._field("SN")
 
     @property
     def SP(self):
         """Substrates/products reversibilty information in {...}."""
-        return self.data.get("SP", None)
+        return self._field("SP")
 
     @property
     def SS(self):
         """Storage stability."""
-        return self.data.get("SS", None)
+        return self._field("SS")
 
     @property
     def ST(self):
         """Source/tissue."""
-        return self.data.get("ST", None)
+        return self._cached("ST", self._create_st)
 
     @property
     def SU(self):
         """Subunits."""
-        return self.data.get("SU", None)
+        return self._field("SU")
 
     @property
     def SY(self):
         """Systematic name."""
-        return self.data.get("SY", None)
+        return self._field("SY")
 
     @property
     def TN(self):
         """Turnover number substrate in {...}."""
-        return self.data.get("TN", None)
+        return self._field("TN")
 
     @property
     def TO(self):
         """Temperature optimum."""
-        return self.data.get("TO", None)
+        return self._field("TO")
 
     @property
     def TR(self):
         """Temperature range."""
-        return self.data.get("TR", None)
+        return self._field("TR")
 
     @property
     def TS(self):
         """Temperature stability."""
-        return self.data.get("TS", None)
+        return self._field("TS")
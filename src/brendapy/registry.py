@@ -0,0 +1,128 @@
+"""Registry of the lazily loaded resources.
+
+Resources like the NCBI taxonomy or the ChEBI and BTO lookup maps are
+expensive to load. They are registered with a loader and loaded on first use,
+so that importing brendapy does not read or download any resource data.
+
+    from brendapy.registry import get_resource
+    chebi = get_resource("chebi")
+    get_resource("taxonomy").get_taxonomy_id("Homo sapiens")
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+class Resource(object):
+    """Resource which is loaded on first access."""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        """Initialize resource.
+
+        :param name: name of the resource
+        :param loader: function returning the loaded resource
+        """
+        self.name = name
+        self.loader = loader
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Check if resource is loaded."""
+        return self._loaded
+
+    def get(self) -> Any:
+        """Get resource, the resource is loaded on first access."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self.loader()
+                    self._loaded = True
+        return self._value
+
+    def clear(self) -> None:
+        """Unload resource, the resource is loaded again on next access."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+
+_RESOURCES: Dict[str, Resource] = {}
+
+
+def register(name: str, loader: Callable[[], Any]) -> Resource:
+    """Register loader for resource.
+
+    An existing resource with the name is replaced.
+
+    :param name: name of the resource
+    :param loader: function returning the loaded resource
+    :return: registered resource
+    """
+    resource = Resource(name=name, loader=loader)
+    _RESOURCES[name] = resource
+    return resource
+
+
+def get_resource(name: str) -> Any:
+    """Get resource by name, the resource is loaded on first access.
+
+    :param name: name of the resource, e.g. `taxonomy`, `chebi` or `bto`
+    :return: loaded resource
+    """
+    try:
+        resource = _RESOURCES[name]
+    except KeyError:
+        raise KeyError(
+            f"Resource `{name}` is not registered, registered resources are: "
+            f"{sorted(_RESOURCES)}"
+        )
+    return resource.get()
+
+
+def is_loaded(name: str) -> bool:
+    """Check if resource is loaded."""
+    return name in _RESOURCES and _RESOURCES[name].loaded
+
+
+def clear(name: Optional[str] = None) -> None:
+    """Unload resource, all resources if name is None."""
+    for resource_name, resource in _RESOURCES.items():
+        if name is None or resource_name == name:
+            resource.clear()
+
+
+def _load_json(path: Union[Path, str]) -> Dict:
+    """Load JSON resource, the brendapy data is downloaded if required."""
+    from brendapy.settings import ensure_resources
+
+    ensure_resources()
+    with open(path, "r") as fin:
+        data: Dict = json.load(fin)
+    return data
+
+
+def _load_taxonomy() -> Any:
+    from brendapy.taxonomy import Taxonomy
+
+    return Taxonomy()
+
+
+def _load_chebi() -> Dict[str, str]:
+    from brendapy.ontologies.owl_parser import CHEBI_JSON
+
+    return _load_json(CHEBI_JSON)
+
+
+def _load_bto() -> Dict[str, str]:
+    from brendapy.ontologies.owl_parser import BTO_JSON
+
+    return _load_json(BTO_JSON)
+
+
+register("taxonomy", _load_taxonomy)
+register("chebi", _load_chebi)
+register("bto", _load_bto)
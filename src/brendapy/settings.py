@@ -3,16 +3,13 @@
 Due to the size limits of git and pypi the large resources
 cannot be managed/included in git and pypi.
 These resources have to be loaded from online resources on
-first import.
+first use (see `ensure_resources`).
 """
 
 
 from pathlib import Path
 from zipfile import ZipFile
 
-import requests
-from rich.progress import Progress
-
 from brendapy.console import console
 from brendapy.log import get_logger
 
@@ -24,12 +21,16 @@ BASE_PATH = Path(__file__).parent
 RESOURCES_PATH = BASE_PATH / "resources"
 
 BRENDA_FILE = RESOURCES_PATH / "data" / "brenda" / "brenda_download.txt"
+BRENDA_STORE = RESOURCES_PATH / "data" / "brenda" / "brenda.store"
+BRENDA_DATABASE = RESOURCES_PATH / "data" / "brenda" / "brenda.sqlite"
 TAXONOMY_ZIP = RESOURCES_PATH / "data" / "taxonomy" / "taxdmp.zip"
-TAXONOMY_JSON = RESOURCES_PATH / "data" / "taxonomy" / "taxonomy.json"
+TAXONOMY_BIN = RESOURCES_PATH / "data" / "taxonomy" / "taxonomy.bin"
 
 
 def download_file(url: str, directory: Path) -> None:
     """Download resource."""
+    import requests
+    from rich.progress import Progress
 
     console.print(f"Download of BRENDApy resources ({url})")
     local_filename = directory / url.split("/")[-1]
@@ -47,7 +48,13 @@ def download_file(url: str, directory: Path) -> None:
 
 ZIP_FILENAME = "brendapy-data-v0.5.0.zip"
 ZIP_PATH = RESOURCES_PATH / ZIP_FILENAME
-if not ZIP_PATH.exists():
+
+
+def ensure_resources() -> None:
+    """Download and extract the brendapy resources if not existing."""
+    if ZIP_PATH.exists():
+        return
+
     url = f"http://134.176.27.178/brendapy/{ZIP_FILENAME}"
     download_file(url=url, directory=RESOURCES_PATH)
     if not ZIP_PATH.exists():
@@ -0,0 +1,203 @@
+"""Binary store of the parsed BRENDA information.
+
+Parsing the BRENDA flat file with `BrendaParser._parse_info_dict` is
+expensive, but the file changes only with new BRENDA releases. The store
+contains the parsed info dicts of all EC numbers, so that the information
+only has to be deserialized.
+
+The store consists of the pickled info dicts of the EC numbers followed by
+the pickled index with the (offset, length, checksum) of the entries. The
+first bytes of the file are the magic bytes and the offset of the index.
+Stores are local build artifacts and must not be loaded from untrusted
+sources (pickle).
+
+The store is built or updated for a new BRENDA release via
+
+    python -m brendapy.store
+
+For a new release only the changed entries are parsed, see `update_store`.
+"""
+import mmap
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Set, Tuple, Union
+
+from brendapy.flatfile import ReleaseDiff
+from brendapy.log import get_logger
+
+
+logger = get_logger(__name__)
+
+STORE_MAGIC = b"BPSTORE1"
+STORE_VERSION = 1
+_HEADER = struct.Struct("<8sQ")
+
+
+def build_store(parser: Any, path: Union[Path, str]) -> "BrendaStore":
+    """Parse all EC numbers of the parser and write the store.
+
+    The entries are parsed one at a time, see `BrendaParser.iter_entries`.
+    All BRENDA keys are stored, independent of the fields of the parser.
+
+    :param parser: BrendaParser for the BRENDA file
+    :param path: path of the store
+    :return: store
+    """
+    logger.info(f"Building BRENDA store `{path}`")
+    _write_store(parser, path)
+    return BrendaStore(path)
+
+
+def update_store(
+    parser: Any, path: Union[Path, str]
+) -> Tuple["BrendaStore", ReleaseDiff]:
+    """Update the store for a new BRENDA release.
+
+    Only the added and changed entries are parsed, the serialized info dicts
+    of unchanged entries are copied from the existing store. If no valid
+    store exists the store is built.
+
+    :param parser: BrendaParser for the BRENDA file of the new release
+    :param path: path of the store
+    :return: store, release diff to the entries of the existing store
+    """
+    store: Optional[BrendaStore] = None
+    if Path(path).exists():
+        try:
+            store = BrendaStore(path)
+        except IOError as err:
+            logger.warning(f"BRENDA store is rebuilt: {err}")
+
+    diff = parser.release_diff(store.checksums if store else {})
+    sha256 = parser.entry_index.sha256 if parser.entry_index else None
+    if store is not None and diff.is_empty() and store.sha256 == sha256:
+        return store, diff
+
+    logger.info(
+        f"Updating BRENDA store `{path}`: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {len(diff.changed)} changed"
+    )
+    path_tmp = Path(f"{path}.tmp")
+    _write_store(parser, path_tmp, store=store, reuse=set(diff.unchanged))
+    if store is not None:
+        store.close()
+    os.replace(path_tmp, path)
+    return BrendaStore(path), diff
+
+
+def _write_store(
+    parser: Any,
+    path: Union[Path, str],
+    store: Optional["BrendaStore"] = None,
+    reuse: Optional[Set[Optional[str]]] = None,
+) -> None:
+    """Write the store for all EC numbers of the parser.
+
+    :param parser: BrendaParser for the BRENDA file
+    :param path: path of the store
+    :param store: existing store
+    :param reuse: EC numbers copied from the existing store
+    """
+    entry_index = parser.entry_index
+    entries: "OrderedDict[Optional[str], Tuple[int, int, Optional[str]]]" = (
+        OrderedDict()
+    )
+    with open(path, "wb") as f_store:
+        f_store.write(_HEADER.pack(STORE_MAGIC, 0))
+        for ec in parser.keys():
+            if store is not None and reuse and ec in reuse:
+                data = store.get_bytes(ec)
+            else:
+                data = pickle.dumps(
+                    parser._load_info_dict(ec, fields=parser.BRENDA_KEY_SET),
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            checksum = entry_index.checksums.get(ec) if entry_index else None
+            entries[ec] = (f_store.tell(), len(data), checksum)
+            f_store.write(data)
+
+        index_offset = f_store.tell()
+        index = {
+            "version": STORE_VERSION,
+            "sha256": entry_index.sha256 if entry_index else None,
+            "entries": entries,
+        }
+        pickle.dump(index, f_store, protocol=pickle.HIGHEST_PROTOCOL)
+        f_store.seek(0)
+        f_store.write(_HEADER.pack(STORE_MAGIC, index_offset))
+
+
+class BrendaStore(Mapping):
+    """Read-only mapping of EC numbers to parsed info dicts.
+
+    The store file is memory-mapped, the info dict of an EC is deserialized
+    on every access.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """Open store.
+
+        :param path: path of the store
+        """
+        self.path = path
+        with open(path, "rb") as f_store:
+            header = f_store.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise IOError(f"Not a valid BRENDA store: `{path}`")
+            magic, index_offset = _HEADER.unpack(header)
+            if magic != STORE_MAGIC or index_offset == 0:
+                raise IOError(f"Not a valid BRENDA store: `{path}`")
+            self._mmap = mmap.mmap(f_store.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index: Dict[str, Any] = pickle.loads(self._mmap[index_offset:])
+        if index["version"] != STORE_VERSION:
+            self._mmap.close()
+            raise IOError(
+                f"BRENDA store version `{index['version']}` is not supported, "
+                f"rebuild the store: `{path}`"
+            )
+
+        self.sha256: Optional[str] = index["sha256"]
+        self.entries: "OrderedDict[Optional[str], Tuple[int, int, Optional[str]]]" = (
+            index["entries"]
+        )
+
+    @property
+    def checksums(self) -> Dict[Optional[str], Optional[str]]:
+        """Checksums of the BRENDA entries the info dicts were parsed from."""
+        return {ec: checksum for ec, (_, _, checksum) in self.entries.items()}
+
+    def close(self) -> None:
+        """Close the memory-mapped store."""
+        self._mmap.close()
+
+    def get_bytes(self, ec: Optional[str]) -> bytes:
+        """Get serialized info dict for EC."""
+        offset, length, _ = self.entries[ec]
+        return self._mmap[offset : offset + length]
+
+    def __getitem__(self, ec: Optional[str]) -> Dict:
+        """Deserialize info dict for EC."""
+        return pickle.loads(self.get_bytes(ec))  # type: ignore
+
+    def __contains__(self, ec: object) -> bool:
+        """Check if info dict exists for EC."""
+        return ec in self.entries
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        """Iterate over EC numbers."""
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        """Get number of EC numbers."""
+        return len(self.entries)
+
+
+if __name__ == "__main__":
+    from brendapy import BrendaParser
+    from brendapy.settings import BRENDA_STORE
+
+    update_store(BrendaParser(mmap=True), BRENDA_STORE)
@@ -1,17 +1,22 @@
-"""Loading substances."""
+"""Loading substances.
 
+The ChEBI map of substance names to ChEBI ids is loaded on first access of
+`CHEBI`.
+"""
+from typing import Any
 
-import json
+from brendapy.registry import get_resource
 
-from brendapy.ontologies.owl_parser import CHEBI_JSON
 
-
-with open(CHEBI_JSON, "r") as fin:
-    CHEBI = json.load(fin)
+def __getattr__(name: str) -> Any:
+    """Load ChEBI map on first access."""
+    if name == "CHEBI":
+        return get_resource("chebi")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     from pprint import pprint
 
     print("Loading chebi information")
-    pprint(CHEBI["D-glucose"])
+    pprint(get_resource("chebi")["D-glucose"])
@@ -0,0 +1,345 @@
+"""Synthetic BRENDA flat files and NCBI taxonomy dumps.
+
+The synthetic files follow the format of the BRENDA download and of the NCBI
+taxonomy dump, so that parsing, proteins and taxonomy lookups can be tested and
+benchmarked without the BRENDA resources. Every BRENDA key is written in
+every entry. The items cover the formats of `PATTERN_ALL`, `PATTERN_VALUE`
+and `PATTERN_RF`, including comments, `more` items, `-999` values, generic
+synonyms, references without pubmed and items with continuation lines.
+
+    taxdmp = write_taxdmp("taxdmp.zip", n_species=1000)
+    write_brenda_file("brenda.txt", n_ecs=1000, proteins_per_ec=10)
+    parse_taxonomy_data(f_zip=taxdmp, f_out="taxonomy.bin")
+    register_resources(taxonomy_file="taxonomy.bin")
+    parser = BrendaParser(brenda_file="brenda.txt")
+
+The files only depend on the arguments, the same arguments and seed create
+identical files.
+"""
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+# sections of the BRENDA keys in the order of the BRENDA download
+SECTIONS: Dict[str, str] = {
+    "PR": "PROTEIN",
+    "RN": "RECOMMENDED_NAME",
+    "SN": "SYSTEMATIC_NAME",
+    "SY": "SYNONYMS",
+    "RE": "REACTION",
+    "RT": "REACTION_TYPE",
+    "ST": "SOURCE_TISSUE",
+    "LO": "LOCALIZATION",
+    "NSP": "NATURAL_SUBSTRATE_PRODUCT",
+    "SP": "SUBSTRATE_PRODUCT",
+    "TN": "TURNOVER_NUMBER",
+    "KM": "KM_VALUE",
+    "PHO": "PH_OPTIMUM",
+    "PHR": "PH_RANGE",
+    "SA": "SPECIFIC_ACTIVITY",
+    "TO": "TEMPERATURE_OPTIMUM",
+    "TR": "TEMPERATURE_RANGE",
+    "CF": "COFACTOR",
+    "AC": "ACTIVATING_COMPOUND",
+    "IN": "INHIBITORS",
+    "ME": "METALS_IONS",
+    "MW": "MOLECULAR_WEIGHT",
+    "PM": "POSTTRANSLATIONAL_MODIFICATION",
+    "SU": "SUBUNITS",
+    "PI": "PI_VALUE",
+    "AP": "APPLICATION",
+    "EN": "ENGINEERING",
+    "CL": "CLONED",
+    "CR": "CRYSTALLIZATION",
+    "PU": "PURIFICATION",
+    "REN": "RENATURED",
+    "GS": "GENERAL_STABILITY",
+    "OSS": "ORGANIC_SOLVENT_STABILITY",
+    "OS": "OXIDATION_STABILITY",
+    "PHS": "PH_STABILITY",
+    "SS": "STORAGE_STABILITY",
+    "TS": "TEMPERATURE_STABILITY",
+    "RF": "REFERENCE",
+    "KI": "KI_VALUE",
+    "EXP": "EXPRESSION",
+    "GI": "GENERAL_INFORMATION",
+    "IC50": "IC50_VALUE",
+    "KKM": "KCAT_KM_VALUE",
+}
+
+# substances and tissues with synthetic ChEBI and BTO ids, the names which
+# are not in the maps are lookup misses
+SUBSTANCES: Dict[str, str] = {
+    "D-glucose": "CHEBI:17634",
+    "ATP": "CHEBI:15422",
+    "NAD+": "CHEBI:15846",
+    "NADH": "CHEBI:16908",
+    "ethanol": "CHEBI:16236",
+    "acetaldehyde": "CHEBI:15343",
+    "2-oxoglutarate": "CHEBI:16810",
+    "L-glutamate": "CHEBI:16015",
+    "pyruvate": "CHEBI:15361",
+    "NADP+": "CHEBI:18009",
+}
+UNKNOWN_SUBSTANCES = ["synthetic substrate", "(R)-3-methyl-2-oxopentanoate"]
+TISSUES: Dict[str, str] = {
+    "liver": "BTO:0000759",
+    "kidney": "BTO:0000671",
+    "brain": "BTO:0000142",
+    "muscle": "BTO:0000887",
+    "leaf": "BTO:0000713",
+}
+UNKNOWN_TISSUES = ["synthetic tissue"]
+
+# organism which is not in the synthetic taxonomy
+UNKNOWN_ORGANISM = "Unknownia strangeii"
+
+# ranks of the synthetic taxonomy from the species to the top level
+RANKS = ["species", "genus", "family", "order", "class", "phylum", "superkingdom"]
+BRANCHING = 4
+
+_WORDS = (
+    "enzyme activity is measured in the presence of the cofactor with purified "
+    "recombinant protein at optimal conditions and the wild type shows higher "
+    "affinity than the mutant in crude extract from cells grown on medium"
+).split()
+
+
+def organism_names(n_species: int) -> List[str]:
+    """Get names of the species of the synthetic taxonomy.
+
+    :param n_species: number of species
+    :return: list of `Genus species` names
+    """
+    return [f"Genus{k // BRANCHING} species{k % BRANCHING}" for k in range(n_species)]
+
+
+def write_taxdmp(path: Union[Path, str], n_species: int = 1000) -> Path:
+    """Write synthetic NCBI taxonomy dump (taxdmp.zip).
+
+    The species are the leaves of a tree with the ranks `RANKS`, every node
+    has up to `BRANCHING` children. The root (1) and `cellular organisms`
+    (131567) are above the superkingdoms.
+
+    :param path: zip file
+    :param n_species: number of species, see `organism_names`
+    :return: path of the zip file
+    """
+    nodes = [(1, 1, "no rank"), (131567, 1, "no rank")]
+    names = [(1, "root"), (131567, "cellular organisms")]
+
+    # tax ids of the levels from the species up
+    tax_id = 131567
+    level_ids: List[List[int]] = []
+    n_nodes = n_species
+    for _ in RANKS:
+        level_ids.append(list(range(tax_id + 1, tax_id + 1 + n_nodes)))
+        tax_id += n_nodes
+        n_nodes = -(-n_nodes // BRANCHING)
+
+    species_names = organism_names(n_species)
+    for level, rank in enumerate(RANKS):
+        for k, node in enumerate(level_ids[level]):
+            if level + 1 < len(RANKS):
+                parent = level_ids[level + 1][k // BRANCHING]
+            else:
+                parent = 131567
+            nodes.append((node, parent, rank))
+            if rank == "species":
+                names.append((node, species_names[k]))
+            elif rank == "genus":
+                names.append((node, f"Genus{k}"))
+            else:
+                names.append((node, f"{rank.capitalize()}{k}"))
+
+    path = Path(path)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr(
+            "nodes.dmp",
+            "".join(
+                f"{node}\t|\t{parent}\t|\t{rank}\t|\t\t|\t0\t|\n"
+                for node, parent, rank in nodes
+            ),
+        )
+        z.writestr(
+            "names.dmp",
+            "".join(
+                f"{node}\t|\t{name}\t|\t\t|\tscientific name\t|\n"
+                for node, name in names
+            ),
+        )
+    return path
+
+
+def write_brenda_file(
+    path: Union[Path, str],
+    n_ecs: int = 100,
+    proteins_per_ec: int = 10,
+    kinetic_items: int = 10,
+    text_items: int = 3,
+    continuation_lines: int = 1,
+    n_species: int = 1000,
+    seed: int = 42,
+) -> Path:
+    """Write synthetic BRENDA flat file.
+
+    :param path: BRENDA text file
+    :param n_ecs: number of EC numbers
+    :param proteins_per_ec: number of proteins per EC number
+    :param kinetic_items: number of items per kinetic key (KM, KI, TN, IC50,
+                          KKM, SA) and EC number
+    :param text_items: number of items per other key and EC number
+    :param continuation_lines: number of continuation lines of the items with
+                               comments and of the references
+    :param n_species: number of species of the synthetic taxonomy the
+                      organisms are selected from
+    :param seed: seed of the random numbers
+    :return: path of the BRENDA file
+    """
+    rng = random.Random(seed)
+    organisms = organism_names(n_species) + [UNKNOWN_ORGANISM]
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f_brenda:
+        f_brenda.write(
+            "*BRENDA-Enzyme Database (synthetic)\n*generated by brendapy.synthetic\n\n"
+        )
+        for k in range(n_ecs):
+            ec = f"{k % 7 + 1}.{k // 7 % 20 + 1}.{k // 140 % 99 + 1}.{k // 13860 + 1}"
+            f_brenda.write(
+                _entry(
+                    rng,
+                    ec=ec,
+                    organisms=organisms,
+                    n_proteins=proteins_per_ec,
+                    kinetic_items=kinetic_items,
+                    text_items=text_items,
+                    continuation_lines=continuation_lines,
+                )
+            )
+    return path
+
+
+def register_resources(taxonomy_file: Union[Path, str]) -> None:
+    """Register the synthetic taxonomy, ChEBI and BTO maps as resources.
+
+    The BRENDA resources are not loaded or downloaded afterwards.
+
+    :param taxonomy_file: binary taxonomy file parsed from the synthetic
+                          taxonomy dump
+    """
+    from brendapy import registry
+    from brendapy.taxonomy import Taxonomy
+
+    registry.register("taxonomy", lambda: Taxonomy(taxonomy_file))
+    registry.register("chebi", lambda: dict(SUBSTANCES))
+    registry.register("bto", lambda: dict(TISSUES))
+
+
+def _wrap(text: str, continuation_lines: int) -> str:
+    """Split item text in lines, continuation lines start with a tab."""
+    words = text.split(" ")
+    n_lines = min(continuation_lines + 1, len(words))
+    size = -(-len(words) // n_lines)
+    lines = [" ".join(words[k : k + size]) for k in range(0, len(words), size)]
+    return "\n\t".join(lines)
+
+
+def _entry(
+    rng: random.Random,
+    ec: str,
+    organisms: List[str],
+    n_proteins: int,
+    kinetic_items: int,
+    text_items: int,
+    continuation_lines: int,
+) -> str:
+    """Create BRENDA entry for EC number."""
+    pids = list(range(1, n_proteins + 1))
+    n_refs = n_proteins + 2
+    substances = list(SUBSTANCES) + UNKNOWN_SUBSTANCES
+    tissues = list(TISSUES) + UNKNOWN_TISSUES
+
+    def ids() -> str:
+        return ",".join(str(pid) for pid in sorted(rng.sample(pids, min(2, len(pids)))))
+
+    def refs() -> str:
+        return ",".join(str(ref) for ref in sorted(rng.sample(range(1, n_refs), 2)))
+
+    def words(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    def comment() -> str:
+        pid, ref = rng.choice(pids), rng.randrange(1, n_refs)
+        text = (
+            f"#{pid}# pH {rng.uniform(5, 9):.1f}, {rng.randint(20, 40)}°C, {words(8)}"
+        )
+        return f"({text} <{ref}>)"
+
+    def item(data: str, with_comment: bool = True, pid: Optional[int] = None) -> str:
+        text = f"#{ids() if pid is None else pid}# {data}"
+        if not with_comment:
+            return f"{text} <{refs()}>"
+        return _wrap(f"{text} {comment()} <{refs()}>", continuation_lines)
+
+    def kinetic_data(bid: str, k: int) -> str:
+        value = f"{rng.uniform(0.001, 100):.4g}"
+        if k % 10 == 1:
+            return "more"
+        if k % 10 == 2:
+            value = "-999"
+        if bid == "SA" or k % 10 == 3:
+            return value
+        return f"{value} {{{rng.choice(substances)}}}"
+
+    lines = [f"ID\t{ec}"]
+    for pid in pids:
+        accession = rng.choice(["P08319 UniProt", "Q9XYZ1 SwissProt", ""])
+        data = f"{rng.choice(organisms)} {accession}".strip()
+        lines.append(f"PR\t{item(data, with_comment=pid % 3 == 0, pid=pid)}")
+    lines.append("")
+
+    for bid, section in SECTIONS.items():
+        if bid == "PR":
+            continue
+        lines.append(section)
+        if bid in {"RN", "SN"}:
+            lines.append(f"{bid}\tsynthetic enzyme {ec} {words(3)}")
+        elif bid == "RE":
+            lines.append(f"RE\t{_wrap(f'D-glucose + NAD+ = {words(6)} + NADH', 1)}")
+        elif bid == "RT":
+            lines.append("RT\toxidation")
+            lines.append("RT\tredox reaction")
+        elif bid == "SY":
+            lines.append(f"SY\t{item(f'synonym {words(2)}', with_comment=False)}")
+            lines.append(f"SY\tgeneric synonym {words(2)}")
+        elif bid == "RF":
+            for ref in range(1, n_refs):
+                pubmed = rng.randint(1000000, 9999999) if ref % 5 else ""
+                text = (
+                    f"<{ref}> Author, A.; Other, B.: {words(10)}. "
+                    f"J. Biol. Chem. ({rng.randint(1960, 2020)}) {ref}, 1-10. "
+                    f"{{Pubmed:{pubmed}}}"
+                )
+                lines.append(f"RF\t{_wrap(text, continuation_lines)}")
+        elif bid in {"KM", "KI", "TN", "IC50", "KKM", "SA"}:
+            for k in range(kinetic_items):
+                lines.append(f"{bid}\t{item(kinetic_data(bid, k), k % 2 == 0)}")
+        elif bid in {"SP", "NSP"}:
+            for k in range(text_items):
+                substrate, product = rng.sample(substances, 2)
+                data = f"{substrate} + NAD+ = {product} + NADH {{r}}"
+                lines.append(f"{bid}\t{item(data, k % 2 == 0)}")
+        else:
+            for k in range(text_items):
+                if k == 1:
+                    data = "more"
+                elif bid == "ST":
+                    data = rng.choice(tissues)
+                else:
+                    data = words(4)
+                lines.append(f"{bid}\t{item(data, k % 2 == 0)}")
+        lines.append("")
+    lines.append("///\n")
+    return "\n".join(lines)
@@ -35,29 +35,76 @@ Taxonomy names file (names.dmp):
     unique name				-- the unique variant of this name if name not unique
     name class				-- (synonym, common name, ...)
 ----------------------------------------------------------------
+
+The parsed taxonomy is stored in a binary file (`taxonomy.bin`) which is
+memory-mapped on load, so that loading is fast and the pages are shared
+between processes. The file consists of the magic bytes, the length of a
+JSON header and the arrays described in the header:
+
+    parent          int32 parent tax_id indexed by tax_id, -1 if no node
+    rank            int16 rank code indexed by tax_id, -1 if no node, the
+                    rank names of the codes are stored as `ranks` in the
+                    header
+    name_offsets    int64 offsets of the scientific names in `names`, indexed
+                    by tax_id, the name of tax_id is
+                    `names[name_offsets[tax_id]:name_offsets[tax_id + 1]]`
+    names           uint8 utf-8 encoded scientific names
+    lookup_offsets  int64 offsets of the sorted names in `lookup_names`
+    lookup_names    uint8 utf-8 encoded names (all name classes), sorted
+    lookup_tax_ids  int32 tax_ids of the sorted names
+
+Common ancestors are found via binary lifting on the parent array. The
+nodes are numbered in depth-first pre- and post-order, a node is in the
+subtree of a clade if its numbers are in the interval of the clade. The
+depth of the nodes, the ancestor tables, the ancestors at a rank and the
+numbering are computed on first use.
 """
 
 import io
+import json
+import mmap
+import os
+import struct
 import time
 import zipfile
-from typing import List, Optional
-
-import ujson
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 
 from brendapy.console import console
 from brendapy.log import get_logger
-from brendapy.settings import TAXONOMY_JSON, TAXONOMY_ZIP
+from brendapy.settings import TAXONOMY_BIN, TAXONOMY_ZIP, ensure_resources
 
 
 logger = get_logger(__name__)
 
+ROOT_TAX_ID = 1
+TAXONOMY_MAGIC = b"BPTAXON1"
+TAXONOMY_VERSION = 2
+_HEADER = struct.Struct("<8sI")
+_ALIGNMENT = 64
+
 
-def parse_taxonomy_data() -> None:
+def parse_taxonomy_data(
+    f_zip: Union[Path, str] = TAXONOMY_ZIP, f_out: Union[Path, str] = TAXONOMY_BIN
+) -> None:
     """Parse the node and tree information for the taxonomy.
 
-    Stores processed data as json dictionary.
+    Stores processed data as binary taxonomy file.
 
-    :param f_taxonomy: json file with stored processed taxonomy data.
+    :param f_zip: NCBI taxonomy dump (taxdmp.zip)
+    :param f_out: binary taxonomy file
     :return:
     """
     console.print("Parsing taxonomy information, ...")
@@ -66,9 +113,10 @@ def parse_taxonomy_data() -> None:
     tid_name_dict = {}
     name_tid_dict = {}
     node_parent_dict = {}
+    node_rank_dict = {}
 
     # load from zip file
-    with zipfile.ZipFile(TAXONOMY_ZIP) as z:
+    with zipfile.ZipFile(f_zip) as z:
 
         # parse names information
         with io.TextIOWrapper(z.open("names.dmp", "r")) as f_names:
@@ -88,51 +136,178 @@ def parse_taxonomy_data() -> None:
                 items = [t.strip() for t in line.split("|")]
                 node, parent = int(items[0]), int(items[1])
                 node_parent_dict[node] = parent
-
-    # store data
-    data = {
-        "tid_name_dict": tid_name_dict,
-        "name_tid_dict": name_tid_dict,
-        "node_parent_dict": node_parent_dict,
-    }
-    with open(TAXONOMY_JSON, "w") as f_out:
-        ujson.dump(data, f_out)
+                node_rank_dict[node] = items[2]
+
+    max_tax_id = max(max(node_parent_dict), max(tid_name_dict))
+    parent_array = np.full(max_tax_id + 1, -1, dtype=np.int32)
+    parent_array[list(node_parent_dict.keys())] = list(node_parent_dict.values())
+
+    ranks = sorted(set(node_rank_dict.values()))
+    rank_codes = {rank: code for code, rank in enumerate(ranks)}
+    rank = np.full(max_tax_id + 1, -1, dtype=np.int16)
+    rank[list(node_rank_dict.keys())] = [rank_codes[r] for r in node_rank_dict.values()]
+
+    tax_ids = sorted(tid_name_dict)
+    names = [tid_name_dict[tid].encode("utf-8") for tid in tax_ids]
+    lengths = np.zeros(max_tax_id + 1, dtype=np.int64)
+    lengths[tax_ids] = [len(name) for name in names]
+
+    lookup = sorted((name.encode("utf-8"), tid) for name, tid in name_tid_dict.items())
+    lookup_names = [name for name, _ in lookup]
+
+    _write_arrays(
+        f_out,
+        {
+            "parent": parent_array,
+            "rank": rank,
+            "name_offsets": _offsets(lengths),
+            "names": np.frombuffer(b"".join(names), dtype=np.uint8),
+            "lookup_offsets": _offsets(np.array([len(n) for n in lookup_names])),
+            "lookup_names": np.frombuffer(b"".join(lookup_names), dtype=np.uint8),
+            "lookup_tax_ids": np.array([tid for _, tid in lookup], dtype=np.int32),
+        },
+        ranks=ranks,
+    )
 
     te = time.time()
     console.print(f"[success]Taxonomy parsed in {(te - ts):.3} seconds.")
 
 
-if not TAXONOMY_JSON.exists():
-    parse_taxonomy_data()
+def _offsets(lengths: np.ndarray) -> np.ndarray:
+    """Get offsets of consecutive items with the given lengths."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _write_arrays(
+    path: Union[Path, str], arrays: Dict[str, np.ndarray], ranks: List[str]
+) -> None:
+    """Write arrays and rank names in binary taxonomy file.
+
+    The file is shared and memory-mapped by all processes, it is written to a
+    temporary file which replaces the file when complete.
+    """
+    specs: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        specs[name] = {
+            "dtype": array.dtype.str,
+            "offset": offset,
+            "length": len(array),
+        }
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(
+        {"version": TAXONOMY_VERSION, "ranks": ranks, "arrays": specs}
+    ).encode()
+    data_offset = _align(_HEADER.size + len(header))
+
+    path_tmp = f"{path}.tmp"
+    with open(path_tmp, "wb") as f_out:
+        f_out.write(_HEADER.pack(TAXONOMY_MAGIC, len(header)))
+        f_out.write(header)
+        for name, array in arrays.items():
+            f_out.seek(data_offset + specs[name]["offset"])
+            f_out.write(array.tobytes())
+    os.replace(path_tmp, path)
+
+
+def _read_header(f_in: BinaryIO, path: Union[Path, str]) -> Dict:
+    """Read and check header of binary taxonomy file."""
+    head = f_in.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        raise IOError(f"Not a valid taxonomy file: `{path}`")
+    magic, header_size = _HEADER.unpack(head)
+    if magic != TAXONOMY_MAGIC:
+        raise IOError(f"Not a valid taxonomy file: `{path}`")
+    header: Dict = json.loads(f_in.read(header_size))
+    if header.get("version") != TAXONOMY_VERSION:
+        raise IOError(
+            f"Taxonomy file version `{header.get('version')}` is not supported: "
+            f"`{path}`"
+        )
+    header["data_offset"] = _align(_HEADER.size + header_size)
+    return header
+
+
+def _read_arrays(path: Union[Path, str]) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Memory-map arrays of binary taxonomy file.
+
+    :return: tuple of header and dict of read-only arrays
+    """
+    with open(path, "rb") as f_in:
+        header = _read_header(f_in, path)
+        buffer = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return header, {
+        name: np.frombuffer(
+            buffer,
+            dtype=np.dtype(spec["dtype"]),
+            count=spec["length"],
+            offset=header["data_offset"] + spec["offset"],
+        )
+        for name, spec in header["arrays"].items()
+    }
+
+
+def _taxonomy_file_valid(path: Union[Path, str]) -> bool:
+    """Check that binary taxonomy file exists in the current version."""
+    try:
+        with open(path, "rb") as f_in:
+            _read_header(f_in, path)
+    except (OSError, ValueError):
+        return False
+    return True
 
 
 # ----------------------------------------------------
 class Taxonomy(object):
-    """Taxonomy class."""
+    """Taxonomy class.
+
+    The taxonomy arrays and the arrays derived from them are loaded once per
+    file and shared between the instances. Resolved names are memoized per
+    file, so repeated organisms are only searched once.
+    """
+
+    _headers: Dict[str, Dict] = {}
+    _arrays: Dict[str, Dict[str, np.ndarray]] = {}
+    _derived: Dict[str, Dict[str, np.ndarray]] = {}
+    _resolved: Dict[str, Dict[str, Optional[int]]] = {}
 
-    tid_name_dict = None  # { ncbi_id: ncbi_name }
-    name_tid_dict = None  # { ncbi_scientific_name: ncbi_id }
-    node_parent_dict = None  # storage of tree information
+    def __init__(self, f_taxonomy: Union[Path, str] = TAXONOMY_BIN) -> None:
+        """Initialize taxonomy.
 
-    def __init__(self, f_taxonomy=TAXONOMY_JSON):
-        """Initialize taxonomy."""
-        if Taxonomy.tid_name_dict is None:
+        The default taxonomy file is created from the NCBI taxonomy dump on
+        first use.
+        """
+        key = str(f_taxonomy)
+        self._key = key
+        if key not in Taxonomy._arrays:
+            if key == str(TAXONOMY_BIN) and not _taxonomy_file_valid(TAXONOMY_BIN):
+                ensure_resources()
+                parse_taxonomy_data()
             ts = time.time()
-            with open(f_taxonomy, "r") as f_tax:
-                data = ujson.load(f_tax)
-                Taxonomy.tid_name_dict = {
-                    int(k): v for k, v in data["tid_name_dict"].items()
-                }
-                Taxonomy.name_tid_dict = data["name_tid_dict"]
-                Taxonomy.node_parent_dict = {
-                    int(k): int(v) for k, v in data["node_parent_dict"].items()
-                }
-                del data
+            Taxonomy._headers[key], Taxonomy._arrays[key] = _read_arrays(f_taxonomy)
             te = time.time()
             console.print(f"[success]Taxonomy loaded in {(te - ts):.3} seconds.")
 
+        arrays = Taxonomy._arrays[key]
+        self.parent: np.ndarray = arrays["parent"]
+        self.rank: np.ndarray = arrays["rank"]
+        self.ranks: List[str] = Taxonomy._headers[key]["ranks"]
+        self._name_offsets: np.ndarray = arrays["name_offsets"]
+        self._names = arrays["names"].data
+        self._lookup_offsets: np.ndarray = arrays["lookup_offsets"]
+        self._lookup_names = arrays["lookup_names"].data
+        self._lookup_tax_ids: np.ndarray = arrays["lookup_tax_ids"]
+        self._resolved_names = Taxonomy._resolved.setdefault(key, {})
+
     @staticmethod
-    def _tax_id_clean(tax_id):
+    def _tax_id_clean(tax_id: Optional[Union[int, str]]) -> Optional[int]:
         if isinstance(tax_id, str):
             if tax_id.startswith("TAX:"):
                 tax_id = tax_id[4:]
@@ -140,26 +315,362 @@ class Taxonomy(object):
 
         return tax_id
 
-    def get_taxonomy_id(self, name):
+    def memory_usage(self) -> Dict[str, int]:
+        """Memory use of the taxonomy arrays in bytes.
+
+        :return: dict with the bytes of the memory-mapped arrays of the
+                 taxonomy file (`mapped`) and of the derived arrays (`derived`)
+        """
+        return {
+            "mapped": sum(a.nbytes for a in Taxonomy._arrays[self._key].values()),
+            "derived": sum(
+                a.nbytes for a in Taxonomy._derived.get(self._key, {}).values()
+            ),
+        }
+
+    def _has_node(self, tax_id: Optional[int]) -> bool:
+        """Check if node exists for tax_id."""
+        if tax_id is None:
+            return False
+        return 0 <= tax_id < len(self.parent) and self.parent[tax_id] >= 0
+
+    def _derived_array(
+        self, name: str, factory: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """Get array derived from the taxonomy, the array is created on first use."""
+        derived = Taxonomy._derived.setdefault(self._key, {})
+        if name not in derived:
+            derived[name] = factory()
+        return derived[name]
+
+    @property
+    def depth(self) -> np.ndarray:
+        """Depth of the nodes, i.e. number of parents up to the root.
+
+        :return: int32 array indexed by tax_id, -1 if no node for tax_id
+        """
+        return self._derived_array("depth", self._compute_depth)
+
+    def _compute_depth(self) -> np.ndarray:
+        parent = self.parent
+        nodes = np.arange(len(parent), dtype=np.int32)
+        valid = parent >= 0
+        # pointer jumping, steps are the number of parents between the node
+        # and the node it jumps to
+        jump = np.where(valid, parent, nodes)
+        steps = (valid & (nodes != ROOT_TAX_ID)).astype(np.int32)
+        while not np.array_equal(jump[jump], jump):
+            steps += steps[jump]
+            jump = jump[jump]
+        return np.where(jump == ROOT_TAX_ID, steps, -1).astype(np.int32)
+
+    @property
+    def _ancestors(self) -> np.ndarray:
+        """Binary lifting table, `_ancestors[k][tax_id]` is the 2^k-th parent."""
+        return self._derived_array("ancestors", self._compute_ancestors)
+
+    def _compute_ancestors(self) -> np.ndarray:
+        parent = self.parent
+        nodes = np.arange(len(parent), dtype=np.int32)
+        levels = max(1, int(self.depth.max()).bit_length())
+        ancestors = np.empty((levels, len(parent)), dtype=np.int32)
+        ancestors[0] = np.where(parent >= 0, parent, nodes)
+        for k in range(1, levels):
+            ancestors[k] = ancestors[k - 1][ancestors[k - 1]]
+        return ancestors
+
+    def _tax_id_array(self, tax_ids: Iterable) -> np.ndarray:
+        """Get array of tax_ids, -1 for tax_ids without node."""
+        if isinstance(tax_ids, np.ndarray):
+            tax_ids = tax_ids.astype(np.int64)
+        else:
+            tax_ids = np.array(
+                [-1 if t is None else Taxonomy._tax_id_clean(t) for t in tax_ids],
+                dtype=np.int64,
+            )
+        depth = self.depth
+        in_range = (tax_ids >= 0) & (tax_ids < len(depth))
+        valid = np.zeros(len(tax_ids), dtype=bool)
+        valid[in_range] = depth[tax_ids[in_range]] >= 0
+        return np.where(valid, tax_ids, -1)
+
+    def _lowest_common_ancestors(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Lowest common ancestors of the nodes in a and b (binary lifting)."""
+        depth = self.depth
+        ancestors = self._ancestors
+        b = np.broadcast_to(b, a.shape)
+        depth_a, depth_b = depth[a], depth[b]
+        swap = depth_a < depth_b
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+
+        # lift deeper nodes to the depth of the other node
+        diff = np.abs(depth_a - depth_b)
+        for k in range(len(ancestors)):
+            a = np.where((diff >> k) & 1 == 1, ancestors[k][a], a)
+
+        # lift both nodes to the children of the common ancestor
+        for k in reversed(range(len(ancestors))):
+            ancestor_a, ancestor_b = ancestors[k][a], ancestors[k][b]
+            move = ancestor_a != ancestor_b
+            a = np.where(move, ancestor_a, a)
+            b = np.where(move, ancestor_b, b)
+        return np.where(a == b, a, ancestors[0][a])
+
+    def find_common_nodes(
+        self, tax_ids: Iterable, tax_id_ref: Optional[Union[int, str]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the first common ancestors of the species with reference organism.
+
+        Batch version of `find_common_node`.
+
+        :param tax_ids: NCBI taxonomy ids of the species
+        :param tax_id_ref: NCBI taxonomy id of the reference organism
+        :return: tuple of arrays (common node id, distance in nodes from the
+                 reference to the common node), -1 for tax_ids which are not
+                 in the taxonomy
+        """
+        tax_ids = self._tax_id_array(tax_ids)
+        ref = self._tax_id_array([tax_id_ref])[0]
+        common = np.full(len(tax_ids), -1, dtype=np.int64)
+        distance = np.full(len(tax_ids), -1, dtype=np.int64)
+        valid = tax_ids >= 0
+        if ref < 0 or not valid.any():
+            return common, distance
+
+        common[valid] = self._lowest_common_ancestors(
+            tax_ids[valid], np.array(ref, dtype=np.int64)
+        )
+        distance[valid] = self.depth[ref] - self.depth[common[valid]]
+        return common, distance
+
+    @property
+    def _depth_order(self) -> np.ndarray:
+        """Nodes sorted by depth, parents are before their children."""
+        return self._derived_array("depth_order", self._compute_depth_order)
+
+    def _compute_depth_order(self) -> np.ndarray:
+        depth = self.depth
+        nodes = np.nonzero(depth >= 0)[0].astype(np.int32)
+        return nodes[np.argsort(depth[nodes], kind="stable")]
+
+    @property
+    def preorder(self) -> np.ndarray:
+        """Depth-first pre-order number of the nodes, children by tax_id.
+
+        :return: int32 array indexed by tax_id, -1 if no node for tax_id
+        """
+        pre: np.ndarray = self._derived_array("order", self._compute_order)[0]
+        return pre
+
+    @property
+    def postorder(self) -> np.ndarray:
+        """Depth-first post-order number of the nodes, children by tax_id.
+
+        :return: int32 array indexed by tax_id, -1 if no node for tax_id
+        """
+        post: np.ndarray = self._derived_array("order", self._compute_order)[1]
+        return post
+
+    def _compute_order(self) -> np.ndarray:
+        parent = self.parent
+        depth = self.depth
+        order = self._depth_order
+        bounds = np.searchsorted(depth[order], np.arange(int(depth.max()) + 2))
+        levels = [order[bounds[k] : bounds[k + 1]] for k in range(len(bounds) - 1)]
+
+        # subtree sizes from the leaves to the root
+        size = np.zeros(len(parent), dtype=np.int64)
+        size[order] = 1
+        for nodes in reversed(levels[1:]):
+            np.add.at(size, parent[nodes], size[nodes])
+
+        # children follow the parent, after the subtrees of the previous siblings
+        pre = np.full(len(parent), -1, dtype=np.int64)
+        pre[levels[0]] = 0
+        for nodes in levels[1:]:
+            nodes = nodes[np.argsort(parent[nodes], kind="stable")]
+            parents = parent[nodes]
+            before = np.cumsum(size[nodes]) - size[nodes]
+            first = np.concatenate(([True], parents[1:] != parents[:-1]))
+            starts = np.maximum.accumulate(np.where(first, np.arange(len(nodes)), 0))
+            pre[nodes] = pre[parents] + 1 + before - before[starts]
+
+        # nodes finished before a node are its descendants and the nodes
+        # visited before it which are not its ancestors
+        post = np.where(pre >= 0, pre + size - 1 - depth, -1)
+        return np.stack((pre, post)).astype(np.int32)
+
+    def _clade_interval(
+        self, clade: Optional[Union[int, str]]
+    ) -> Optional[Tuple[int, int]]:
+        """Pre- and post-order number of the clade, None if not in taxonomy."""
+        tax_id = self._tax_id_array([clade])[0]
+        if tax_id < 0:
+            logger.error(f"taxonomy id not found: {clade}")
+            return None
+        return int(self.preorder[tax_id]), int(self.postorder[tax_id])
+
+    def is_descendant(
+        self, tax_id: Optional[Union[int, str]], clade: Optional[Union[int, str]]
+    ) -> bool:
+        """Check if the species is in the subtree of the clade.
+
+        :param tax_id: NCBI taxonomy id of the species
+        :param clade: NCBI taxonomy id of the clade, e.g. `40674` (Mammalia)
+        :return: True if tax_id is the clade or a descendant of the clade
+        """
+        return bool(self.in_subtree([tax_id], clade)[0])
+
+    def in_subtree(
+        self, tax_ids: Iterable, clade: Optional[Union[int, str]]
+    ) -> np.ndarray:
+        """Check which species are in the subtree of the clade.
+
+        Batch version of `is_descendant`, the check is a comparison with the
+        pre- and post-order interval of the clade.
+
+        :param tax_ids: NCBI taxonomy ids of the species
+        :param clade: NCBI taxonomy id of the clade, e.g. `40674` (Mammalia)
+        :return: bool array, False for tax_ids which are not in the taxonomy
+        """
+        tax_ids = self._tax_id_array(tax_ids)
+        interval = self._clade_interval(clade)
+        if interval is None:
+            return np.zeros(len(tax_ids), dtype=bool)
+        pre, post = interval
+        nodes = np.maximum(tax_ids, 0)
+        in_clade: np.ndarray = (
+            (tax_ids >= 0)
+            & (self.preorder[nodes] >= pre)
+            & (self.postorder[nodes] <= post)
+        )
+        return in_clade
+
+    def _rank_code(self, rank: str) -> int:
+        """Get code of rank name."""
+        try:
+            return self.ranks.index(rank)
+        except ValueError:
+            raise ValueError(
+                f"Rank `{rank}` is not in the taxonomy, supported ranks are: "
+                f"{self.ranks}"
+            )
+
+    def _rank_ancestors(self, rank: str) -> np.ndarray:
+        """Ancestors at rank indexed by tax_id, -1 if no ancestor at rank."""
+        code = self._rank_code(rank)
+        return self._derived_array(
+            f"ancestors_{rank}", lambda: self._compute_rank_ancestors(code)
+        )
+
+    def _compute_rank_ancestors(self, code: int) -> np.ndarray:
+        order = self._depth_order
+        depth = self.depth[order]
+        bounds = np.searchsorted(depth, np.arange(int(depth[-1]) + 2))
+        ancestors = np.full(len(self.parent), -1, dtype=np.int32)
+        # nodes inherit the ancestor of the parent, level by level from the root
+        for level in range(len(bounds) - 1):
+            nodes = order[bounds[level] : bounds[level + 1]]
+            inherited = ancestors[self.parent[nodes]]
+            ancestors[nodes] = np.where(self.rank[nodes] == code, nodes, inherited)
+        return ancestors
+
+    def get_rank(self, tax_id: Optional[Union[int, str]]) -> Optional[str]:
+        """Get rank of NCBI taxonomy id.
+
+        :param tax_id: NCBI taxonomy id
+        :return: rank, e.g. `species`, None if not existing in taxonomy
+        """
+        tax_id = Taxonomy._tax_id_clean(tax_id)
+        if tax_id is None or not self._has_node(tax_id):
+            return None
+        return self.ranks[int(self.rank[tax_id])]
+
+    def ancestor_at_rank(self, tax_ids: Iterable, rank: str) -> np.ndarray:
+        """Get the ancestors of the species at the given rank.
+
+        The ancestors are looked up in a table which is computed once per
+        rank, a node of the rank is its own ancestor.
+
+        :param tax_ids: NCBI taxonomy ids of the species
+        :param rank: rank of the ancestors, e.g. `family` or `genus`
+        :return: int64 array of ancestor tax_ids, -1 for tax_ids which are
+                 not in the taxonomy or have no ancestor at the rank
+        """
+        tax_ids = self._tax_id_array(tax_ids)
+        ancestors = self._rank_ancestors(rank)
+        return np.where(tax_ids >= 0, ancestors[np.maximum(tax_ids, 0)], -1)
+
+    def group_by_rank(self, tax_ids: Iterable, rank: str) -> Dict[int, np.ndarray]:
+        """Group the species by their ancestor at the given rank.
+
+        :param tax_ids: NCBI taxonomy ids of the species, e.g. of the proteins
+        :param rank: rank of the groups, e.g. `family` or `genus`
+        :return: dict of ancestor tax_id and the indices of the species in
+                 tax_ids, species without ancestor at the rank are grouped
+                 under -1
+        """
+        ancestors = self.ancestor_at_rank(tax_ids, rank)
+        order = np.argsort(ancestors, kind="stable")
+        groups, starts = np.unique(ancestors[order], return_index=True)
+        return {
+            int(group): indices
+            for group, indices in zip(groups, np.split(order, starts[1:]))
+        }
+
+    def _lookup_name(self, name: str) -> Optional[int]:
+        """Binary search of name in the sorted names."""
+        key = name.encode("utf-8")
+        offsets = self._lookup_offsets
+        lo, hi = 0, len(self._lookup_tax_ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._lookup_names[offsets[mid] : offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if (
+            lo < len(self._lookup_tax_ids)
+            and bytes(self._lookup_names[offsets[lo] : offsets[lo + 1]]) == key
+        ):
+            return int(self._lookup_tax_ids[lo])
+        return None
+
+    def get_taxonomy_id(self, name: Optional[str], warn: bool = True) -> Optional[int]:
         """Get NCBI taxonomy id.
 
         :param name: species name
+        :param warn: log warning if the taxonomy id could not be resolved
         :return: NBCI taxonomy id or None if not existing in taxonomy
         """
-        if name not in self.name_tid_dict:
+        tax_id: Optional[int] = None
+        if isinstance(name, str):
+            try:
+                tax_id = self._resolved_names[name]
+            except KeyError:
+                tax_id = self._lookup_name(name)
+                self._resolved_names[name] = tax_id
+        if tax_id is None and warn:
             logger.warning(
                 f"Taxonomy id could not be resolved for species/organism: {name}"
             )
-        return self.name_tid_dict.get(name, None)
+        return tax_id
 
-    def get_scientific_name(self, tax_id):
+    def get_scientific_name(self, tax_id: Optional[Union[int, str]]) -> Optional[str]:
         """Get the NCBI scientific name for NCBI taxonomy id.
 
         :param tax_id:
         :return: NCBI scientific name, None if not existing in taxonomy
         """
         tax_id = Taxonomy._tax_id_clean(tax_id)
-        return self.tid_name_dict.get(tax_id, None)
+        if tax_id is None:
+            return None
+        if not 0 <= tax_id < len(self._name_offsets) - 1:
+            return None
+        start, end = self._name_offsets[tax_id], self._name_offsets[tax_id + 1]
+        if start == end:
+            return None
+        return bytes(self._names[start:end]).decode("utf-8")
 
     def get_parent_nodes(self, tax_id):
         """Get list of parent nodes for given NCBI taxonomy identifier.
@@ -174,15 +685,76 @@ class Taxonomy(object):
         parent_id = -1
         while parent_id != 1:
             tid = nodes[-1]
-            try:
-                parent_id = self.node_parent_dict[tid]
-            except KeyError:
+            if not self._has_node(tid):
                 logger.error(f"taxonomy id not found: {tax_id}")
                 return None
+            parent_id = int(self.parent[tid])
 
             nodes.append(parent_id)
         return nodes
 
+    def _lineages(self, tax_ids: np.ndarray) -> np.ndarray:
+        """Lineages of the nodes from the root.
+
+        :param tax_ids: array of tax_ids, -1 for tax_ids without node
+        :return: int32 matrix, row i contains the ancestor of tax_ids[i] at
+                 depth d in column d, -1 below the depth of the node
+        """
+        depth = self.depth
+        valid = tax_ids >= 0
+        depths = np.where(valid, depth[np.where(valid, tax_ids, 0)], -1)
+        n_levels = int(depths.max()) + 1 if len(tax_ids) else 0
+        lineages = np.full((len(tax_ids), n_levels), -1, dtype=np.int32)
+
+        rows = np.nonzero(valid)[0]
+        nodes = tax_ids[rows]
+        while len(rows):
+            lineages[rows, depth[nodes]] = nodes
+            active = nodes != ROOT_TAX_ID
+            rows, nodes = rows[active], self.parent[nodes[active]]
+        return lineages
+
+    def distance_matrix(self, tax_ids: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """Get common nodes and distances between all pairs of species.
+
+        The entries (i, j) of the matrices correspond to
+        `find_common_node(tax_ids[i], tax_id_ref=tax_ids[j])`. The common
+        nodes are computed from the lineages of the species, the depth of the
+        common node is the number of identical ancestors in the lineages.
+
+        :param tax_ids: NCBI taxonomy ids of the species
+        :return: tuple of int32 matrices (common node id, distance in nodes
+                 from tax_ids[j] to the common node), -1 for tax_ids which
+                 are not in the taxonomy
+        """
+        tax_ids = self._tax_id_array(tax_ids)
+        # compute for unique species
+        tax_ids, inverse = np.unique(tax_ids, return_inverse=True)
+        lineages = self._lineages(tax_ids)
+
+        valid = tax_ids >= 0
+        depths = np.where(valid, self.depth[np.where(valid, tax_ids, 0)], -1)
+        # lineages of different species share the ancestors up to the common node
+        same = valid[:, None] & valid[None, :]
+        np.fill_diagonal(same, False)
+        common_depth = np.full(same.shape, -1, dtype=np.int32)
+        for level in range(lineages.shape[1]):
+            ancestors = lineages[:, level]
+            same &= ancestors[:, None] == ancestors[None, :]
+            if not same.any():
+                break
+            common_depth += same
+        diagonal = np.arange(len(tax_ids))
+        common_depth[diagonal, diagonal] = depths
+
+        pairs = common_depth >= 0
+        common = np.full(same.shape, -1, dtype=np.int32)
+        common[pairs] = np.take_along_axis(
+            lineages, np.maximum(common_depth, 0), axis=1
+        )[pairs]
+        distance = np.where(pairs, depths[None, :] - common_depth, -1).astype(np.int32)
+        return common[np.ix_(inverse, inverse)], distance[np.ix_(inverse, inverse)]
+
     def find_common_node_by_name(self, name: str, name_ref):
         """Find common node in ontology by name."""
         return self.find_common_node(
@@ -198,16 +770,13 @@ class Taxonomy(object):
                                                scientific name of common node id,
                                                distance in nodes reference]
         """
-        nodes1 = self.get_parent_nodes(tax_id)
-        nodes2 = self.get_parent_nodes(tax_id_ref)
-
-        # Find common ancestor node
-        for tid in nodes1:
-            for i in range(len(nodes2)):
-                if tid == nodes2[i]:
-                    return [tid, self.get_scientific_name(tid), i]
+        common, distance = self.find_common_nodes([tax_id], tax_id_ref)
+        if common[0] < 0:
+            logger.error(f"taxonomy id not found: {tax_id}, {tax_id_ref}")
+            return [None, None, -1]
 
-        return [None, None, -1]
+        tid = int(common[0])
+        return [tid, self.get_scientific_name(tid), int(distance[0])]
 
 
 if __name__ == "__main__":
@@ -1,13 +1,19 @@
-"""Tissue information."""
+"""Tissue information.
 
-import json
+The BTO map of tissue names to BTO ids is loaded on first access of `BTO`.
+"""
+from typing import Any
 
-from brendapy.ontologies.owl_parser import BTO_JSON
+from brendapy.registry import get_resource
 
 
-with open(BTO_JSON, "r") as fin:
-    BTO = json.load(fin)
+def __getattr__(name: str) -> Any:
+    """Load BTO map on first access."""
+    if name == "BTO":
+        return get_resource("bto")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     print("Loading tissue information")
-    print(BTO["liver"])
+    print(get_resource("bto")["liver"])
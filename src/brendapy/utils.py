@@ -1,7 +1,7 @@
 """Utility functions."""
 
 import time
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Sequence, Tuple
 
 
 def is_ec_number(ec: str) -> bool:
@@ -17,6 +17,32 @@ def is_ec_number(ec: str) -> bool:
     return True
 
 
+def chunk_by_size(items: Sequence[Tuple[Any, int]], n_chunks: int) -> List[List]:
+    """Split items into contiguous chunks of similar total size.
+
+    Items larger than the target size of a chunk form their own chunk.
+
+    :param items: sequence of (item, size)
+    :param n_chunks: number of chunks to aim for
+    :return: list of chunks, every chunk is a list of items
+    """
+    total = sum(size for _, size in items)
+    target = max(total / max(n_chunks, 1), 1)
+    chunks: List[List] = []
+    chunk: List = []
+    chunk_size = 0
+    for item, size in items:
+        if chunk and chunk_size + size > target:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+        chunk.append(item)
+        chunk_size += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 def timeit(method: Callable) -> Any:
     """Decorate function with timing functionality."""
 
@@ -9,4 +9,6 @@ def pytest_sessionstart(session: pytest.Session) -> None:
     Force download of resources before beginning the test.
     """
     # download resources if not existing
-    import brendapy
+    from brendapy.settings import ensure_resources
+
+    ensure_resources()
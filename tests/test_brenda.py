@@ -1,4 +1,6 @@
 """Module for testing BRENDA data structure."""
+from itertools import islice
+from pathlib import Path
 from typing import Dict
 
 import pytest
@@ -209,6 +211,101 @@ def test_source_tissue() -> None:
     assert d
 
 
+def test_iter_entries() -> None:
+    """Test streaming of info dicts."""
+    brenda = BrendaParser(mmap=True)
+    entries = list(islice(brenda.iter_entries(), 5))
+    assert len(entries) == 5
+    ec, d = entries[0]
+    assert ec == list(brenda.keys())[0]
+    assert d == BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    assert len(brenda.ec_data) == 0
+
+
+def test_iter_proteins() -> None:
+    """Test streaming of proteins."""
+    brenda = BrendaParser(mmap=True)
+    proteins = list(brenda.iter_proteins(ecs=["1.1.1.1"]))
+    assert len(proteins) == 167
+    assert proteins[0].ec == "1.1.1.1"
+    assert len(brenda.ec_data) == 0
+
+
+def test_parse_info_dicts_jobs(tmp_path: Path) -> None:
+    """Test parallel parsing of info dicts."""
+    ecs = ["1.1.1.1", "1.1.1.2", "1.1.1.100", "2.6.1.42", "6.4.1.3"]
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ecs:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    brenda = BrendaParser(brenda_file=brenda_file)
+    d1 = brenda.parse_info_dicts()
+    d2 = brenda.parse_info_dicts(jobs=2)
+    assert list(d2.keys()) == ecs
+    assert d1 == d2
+
+
+def test_protein_lazy() -> None:
+    """Test lazy resolution of protein fields."""
+    ec = "1.1.1.1"
+    d = BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    protein = BrendaProtein(ec=ec, key=1, data=d)
+    assert not hasattr(protein, "__dict__")
+    assert protein.KM is d["KM"][1]
+    assert protein.organism == protein.data["organism"]
+    assert protein.data["KM"] == protein.KM
+    assert protein.references == protein.data["references"]
+
+
+def test_protein_source_tissue_copy() -> None:
+    """Test that the shared ST items are not changed by the proteins."""
+    ec = "1.1.1.1"
+    d = BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    protein = BrendaProtein(ec=ec, key=1, data=d)
+    assert protein.ST
+    assert all("bto" in item for item in protein.ST if item["data"] == "kidney")
+    assert all("bto" not in item for item in d["ST"][1])
+    assert protein.tissues == {item["bto"] for item in protein.ST if "bto" in item}
+
+
+def test_protein_missing_key() -> None:
+    """Test protein for missing protein key."""
+    d = BrendaParser._parse_info_dict("1.1.1.1", BRENDA_PARSER.ec_text["1.1.1.1"])
+    with pytest.raises(KeyError):
+        BrendaProtein(ec="1.1.1.1", key=-1, data=d)
+
+
+def test_fields() -> None:
+    """Test parsing of selected fields."""
+    ec = "1.1.1.1"
+    brenda = BrendaParser(fields=["KM", "TN"])
+    assert brenda.fields == {"ID", "PR", "RF", "KM", "TN"}
+    d = brenda.get_proteins(ec)[1].data
+    assert "KM" in d
+    assert "ST" not in d
+
+    info_dict = brenda._load_info_dict(ec)
+    info_dict_all = BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    assert set(info_dict.keys()) <= brenda.fields
+    for bid, values in info_dict.items():
+        assert values == info_dict_all[bid]
+
+
+def test_get_proteins_fields() -> None:
+    """Test proteins with selected fields."""
+    proteins = BRENDA_PARSER.get_proteins("1.1.1.1", fields=["KM"])
+    assert proteins[1].KM
+    assert proteins[1].ST is None
+    assert proteins[1].organism == BRENDA_PARSER.get_proteins("1.1.1.1")[1].organism
+
+
+def test_fields_unsupported() -> None:
+    """Test unsupported fields."""
+    with pytest.raises(ValueError):
+        BrendaParser(fields=["KM", "XX"])
+
+
 @pytest.mark.parametrize("ec", BRENDA_PARSER.keys())
 def test_proteins_for_ec(ec: str) -> None:
     """Test parsing proteins for given EC."""
@@ -0,0 +1,96 @@
+"""Test caching of parsed BRENDA information."""
+from brendapy import BrendaParser
+from brendapy.cache import LRUCache, approximate_size
+
+
+def test_lru_cache_entries() -> None:
+    """Test eviction of least recently used entries."""
+    cache = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert "b" not in cache
+    assert list(cache.keys()) == ["a", "c"]
+
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.evictions == 1
+    assert info.entries == 2
+
+
+def test_lru_cache_touch() -> None:
+    """Test marking entry as recently used without counting access."""
+    cache = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.touch("a")
+    cache["c"] = 3
+    assert list(cache.keys()) == ["a", "c"]
+    assert cache.cache_info().hits == 0
+
+
+def test_lru_cache_evict() -> None:
+    """Test explicit eviction of entry."""
+    evicted = []
+    cache = LRUCache(on_evict=lambda key, value: evicted.append(key))
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.evict("a")
+    del cache["b"]
+    assert len(cache) == 0
+    assert evicted == ["a"]
+    assert cache.cache_info().evictions == 1
+
+
+def test_lru_cache_misses() -> None:
+    """Test counting of misses."""
+    cache = LRUCache()
+    assert cache.get("a") is None
+    assert cache.cache_info().misses == 1
+
+
+def test_lru_cache_bytes() -> None:
+    """Test eviction based on approximate size."""
+    value = list(range(100))
+    size = approximate_size(value)
+    cache = LRUCache(max_bytes=2 * size)
+    cache["a"] = value
+    cache["b"] = list(range(100))
+    assert cache.size == 2 * size
+    cache["c"] = list(range(100))
+    assert len(cache) == 2
+    assert cache.cache_info().evictions == 1
+
+    cache["d"] = list(range(1000))
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_lru_cache_on_evict() -> None:
+    """Test callback for evicted entries."""
+    evicted = []
+    cache = LRUCache(max_entries=1, on_evict=lambda k, v: evicted.append(k))
+    cache["a"] = 1
+    cache["b"] = 2
+    assert evicted == ["a"]
+
+
+def test_parser_cache() -> None:
+    """Test bounded cache of the parser."""
+    brenda = BrendaParser(mmap=True, cache_entries=1)
+    proteins = brenda.get_proteins("1.1.1.1")
+    proteins2 = brenda.get_proteins("1.1.1.1")
+    assert proteins2 == proteins
+    assert proteins2 is not proteins
+
+    brenda.get_proteins("1.1.1.2")
+    assert list(brenda.ec_data.keys()) == ["1.1.1.2"]
+    assert list(brenda.proteins.keys()) == ["1.1.1.2"]
+
+    info = brenda.cache_info()
+    assert info["ec_data"].misses == 2
+    assert info["ec_data"].evictions == 1
+    assert info["ec_data"].hits == 0
+    assert info["proteins"].hits == 1
+    assert info["proteins"].evictions == 1
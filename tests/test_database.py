@@ -0,0 +1,129 @@
+"""Test SQLite database of parsed BRENDA information."""
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.database import BrendaDatabase, build_database, update_database
+
+
+BRENDA_PARSER = BrendaParser(mmap=True)
+ECS = ["1.1.1.1", "1.1.1.2", "2.6.1.42", "6.4.1.3"]
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Path:
+    """Build database for subset of the BRENDA file."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    path = tmp_path / "brenda.sqlite"
+    build_database(BrendaParser(brenda_file=brenda_file), path)
+    return path
+
+
+def test_database_info_dict(database_path: Path) -> None:
+    """Test that info dicts are restored from the database."""
+    database = BrendaDatabase(database_path)
+    assert list(database.keys()) == ECS
+    for ec in ECS:
+        d = BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+        assert database[ec] == d
+        assert list(database[ec]["PR"].keys()) == list(d["PR"].keys())
+    database.close()
+
+
+def test_parser_from_database(database_path: Path) -> None:
+    """Test proteins from database."""
+    brenda = BrendaParser(database=database_path)
+    assert list(brenda.keys()) == ECS
+    proteins = brenda.get_proteins("2.6.1.42")
+    p = proteins[5]
+    assert p.KM[0]["data"] == "2.4 {2-oxoglutarate}"
+    assert p.KM[0]["value"] == 2.4
+
+
+def test_database_kinetics(database_path: Path) -> None:
+    """Test query of kinetic values."""
+    database = BrendaDatabase(database_path)
+    values = database.kinetics(bid="KM", substrate="2-oxoglutarate", ec="2.6.1.42")
+    assert values
+    for value in values:
+        assert value["substrate"] == "2-oxoglutarate"
+        assert value["units"] == "mM"
+
+    values = database.kinetics(bid="KM", organism="Homo sapiens")
+    assert values
+    assert all(value["taxonomy"] == 9606 for value in values)
+    database.close()
+
+
+def _write_release(brenda_file: Path) -> None:
+    """Write new release with removed, changed and unchanged entries."""
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ["1.1.1.1", "6.4.1.3", "2.6.1.42"]:
+            ec_str = BRENDA_PARSER.ec_text[ec]
+            if ec == "6.4.1.3":
+                ec_str = ec_str.replace("\n\n", "\nKM\t#1# 0.5 {ATP} <1>\n\n", 1)
+            f_brenda.write(ec_str)
+
+
+def test_update_database(database_path: Path) -> None:
+    """Test update of database for new release."""
+    brenda_file = database_path.parent / "brenda.txt"
+    _write_release(brenda_file)
+    brenda = BrendaParser(brenda_file=brenda_file)
+    database, diff = update_database(brenda, database_path)
+    assert diff.removed == ["1.1.1.2"]
+    assert diff.changed == ["6.4.1.3"]
+
+    database2 = build_database(brenda, database_path.parent / "brenda2.sqlite")
+    assert list(database.keys()) == list(database2.keys())
+    for ec in database2:
+        assert database[ec] == database2[ec]
+    assert database.checksums == database2.checksums
+    assert database.sha256 == database2.sha256
+    database.close()
+    database2.close()
+
+
+def test_database_failure(database_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that failed builds and updates keep the existing database."""
+    import brendapy.database
+
+    def insert_entry(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("insert failed")
+
+    brenda_file = database_path.parent / "brenda.txt"
+    _write_release(brenda_file)
+    brenda = BrendaParser(brenda_file=brenda_file)
+    monkeypatch.setattr(brendapy.database, "_insert_entry", insert_entry)
+    with pytest.raises(RuntimeError):
+        build_database(brenda, database_path)
+    assert not Path(f"{database_path}.tmp").exists()
+    with pytest.raises(RuntimeError):
+        update_database(brenda, database_path)
+
+    database = BrendaDatabase(database_path)
+    assert list(database.keys()) == ECS
+    database.close()
+
+
+def test_database_fields(tmp_path: Path) -> None:
+    """Test that all BRENDA keys are stored for a parser with field selection."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    path = tmp_path / "brenda.sqlite"
+    build_database(BrendaParser(brenda_file=brenda_file, fields=["KM"]), path)
+    database = BrendaDatabase(path)
+    for ec in ECS:
+        assert database[ec] == BrendaParser._parse_info_dict(
+            ec, BRENDA_PARSER.ec_text[ec]
+        )
+    database.close()
@@ -0,0 +1,90 @@
+"""Test diagnostics of the parsing."""
+import logging
+
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.diagnostics import DIAGNOSTICS, DiagnosticsCollector
+from brendapy.log import get_logger
+
+
+def test_collector() -> None:
+    """Test counting and samples of issues."""
+    diagnostics = DiagnosticsCollector(max_samples=2)
+    for k in range(3):
+        diagnostics.add("more_data", f"more {k}", ec="1.1.1.1", bid="KM")
+    diagnostics.add("value_999", "-999 {ATP}", ec="1.1.1.2", bid="KM")
+    assert len(diagnostics) == 4
+    assert diagnostics.counts[("1.1.1.1", "KM", "more_data")] == 3
+    assert diagnostics.samples["more_data"] == [
+        "1.1.1.1_KM: 'more' data not stored: more 0",
+        "1.1.1.1_KM: 'more' data not stored: more 1",
+    ]
+
+    summary = diagnostics.summary()
+    assert list(summary.keys()) == ["more_data", "value_999"]
+    assert summary["more_data"]["count"] == 3
+    assert summary["more_data"]["ecs"] == 1
+    assert summary["value_999"]["level"] == "INFO"
+    assert "4 parse issues" in diagnostics.report()
+
+
+def test_collector_merge() -> None:
+    """Test merging of collectors."""
+    diagnostics1 = DiagnosticsCollector(max_samples=2)
+    diagnostics1.add("more_data", "more", ec="1.1.1.1", bid="KM")
+    diagnostics2 = DiagnosticsCollector(max_samples=2)
+    diagnostics2.add("more_data", "more", ec="1.1.1.1", bid="KM")
+    diagnostics2.add("more_data", "more", ec="1.1.1.2", bid="KM")
+    diagnostics1.merge(diagnostics2)
+    assert len(diagnostics1) == 3
+    assert len(diagnostics1.samples["more_data"]) == 2
+
+    diagnostics1.clear()
+    assert len(diagnostics1) == 0
+    assert diagnostics1.summary() == {}
+
+
+def test_parse_diagnostics() -> None:
+    """Test that parse issues are collected."""
+    ec = "1.1.1.1"
+    brenda = BrendaParser()
+    assert brenda.diagnostics is DIAGNOSTICS
+    DIAGNOSTICS.clear()
+    BrendaParser._parse_info_dict(ec, brenda.ec_text[ec])
+    assert DIAGNOSTICS.counts[(ec, "ST", "more_data")] >= 1
+    assert all(key[0] == ec for key in DIAGNOSTICS.counts)
+
+
+def test_collector_since() -> None:
+    """Test summary of the issues after a snapshot."""
+    diagnostics = DiagnosticsCollector()
+    diagnostics.add("more_data", "more", ec="1.1.1.1", bid="KM")
+    since = diagnostics.snapshot()
+    diagnostics.add("more_data", "more", ec="1.1.1.2", bid="KM")
+    diagnostics.add("value_999", "-999", ec="1.1.1.2", bid="KM")
+    summary = diagnostics.summary(since=since)
+    assert summary["more_data"]["count"] == 1
+    assert summary["more_data"]["ecs"] == 1
+    assert diagnostics.category_counts(since=since)["value_999"] == 1
+    assert diagnostics.summary()["more_data"]["count"] == 2
+
+
+def test_iter_entries_log_summary(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a summary of the parse issues is logged after parsing."""
+    brenda = BrendaParser()
+    with caplog.at_level(logging.INFO, logger="brendapy.diagnostics"):
+        entries = brenda.iter_entries(ecs=["1.1.1.1"])
+        next(entries)
+        assert not caplog.records
+        list(entries)
+    assert any(
+        record.getMessage().startswith("more_data: ") for record in caplog.records
+    )
+
+
+def test_get_logger_handlers() -> None:
+    """Test that handlers are not added multiple times."""
+    logger = get_logger("brendapy.test")
+    get_logger("brendapy.test")
+    assert len(logger.handlers) == 1
@@ -3,6 +3,7 @@
 import pytest
 
 from brendapy.examples.examples import (
+    count_all_proteins_for_all_ecs,
     parse_all_proteins_for_all_ecs,
     parse_human_proteins_for_ec,
     parse_proteins_by_taxonomy,
@@ -29,3 +30,9 @@ def test_parse_proteins_by_taxonomy() -> None:
 def test_parse_all_proteins_for_all_ecs() -> None:
     """Testing parsing of all proteins for given EC."""
     parse_all_proteins_for_all_ecs()
+
+
+@pytest.mark.skip(reason="takes too long")
+def test_count_all_proteins_for_all_ecs() -> None:
+    """Testing streaming of all proteins for all ECs."""
+    assert count_all_proteins_for_all_ecs() > 0
@@ -0,0 +1,189 @@
+"""Test offset based access to the BRENDA flat file."""
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.flatfile import (
+    EntryIndex,
+    EntryTextMap,
+    index_path,
+    load_entry_index,
+    release_diff,
+    scan_entry_offsets,
+)
+from brendapy.settings import BRENDA_FILE
+
+
+BRENDA_PARSER = BrendaParser()
+BRENDA_PARSER_MMAP = BrendaParser(mmap=True)
+
+
+def test_scan_entry_offsets() -> None:
+    """Test scanning of entry offsets."""
+    offsets = scan_entry_offsets(BRENDA_FILE)
+    assert "1.1.1.1" in offsets
+    offset, length = offsets["1.1.1.1"]
+    assert offset > 0
+    assert length > 0
+
+
+def test_entry_text_map() -> None:
+    """Test decoding of entries from the memory-mapped file."""
+    ec_text = EntryTextMap(BRENDA_FILE)
+    entry = ec_text["1.1.1.1"]
+    assert entry.startswith("ID\t1.1.1.1")
+    assert entry.rstrip().endswith("///")
+    ec_text.close()
+
+
+def test_entry_text_map_pickle() -> None:
+    """Test pickling of the memory-mapped entries."""
+    ec_text = pickle.loads(pickle.dumps(BRENDA_PARSER_MMAP.ec_text))
+    assert ec_text["1.1.1.1"] == BRENDA_PARSER_MMAP.ec_text["1.1.1.1"]
+
+
+def test_mmap_keys() -> None:
+    """Test that same EC numbers are available."""
+    assert list(BRENDA_PARSER_MMAP.keys()) == list(BRENDA_PARSER.keys())
+
+
+@pytest.mark.parametrize("ec", ["1.1.1.1", "1.1.1.2", "2.6.1.42", "6.4.1.3"])
+def test_mmap_info_dict(ec: str) -> None:
+    """Test that memory-mapped entries are parsed identically."""
+    d1 = BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    d2 = BrendaParser._parse_info_dict(ec, BRENDA_PARSER_MMAP.ec_text[ec])
+    assert d1 == d2
+
+
+def test_mmap_proteins() -> None:
+    """Test proteins from memory-mapped BRENDA file."""
+    proteins = BRENDA_PARSER_MMAP.get_proteins("1.1.1.1")
+    assert len(proteins) == 167
+    assert proteins[1].organism == "Gallus gallus"
+
+
+def _write_brenda_file(path: Path, ecs: list) -> Path:
+    """Write BRENDA file with the entries for the given EC numbers."""
+    with open(path, "w", encoding="utf-8") as f_brenda:
+        for ec in ecs:
+            f_brenda.write(BRENDA_PARSER_MMAP.ec_text[ec])
+    return path
+
+
+def _write_crlf_file(path: Path, ecs: list) -> Path:
+    """Write BRENDA file with CRLF newlines for the given EC numbers."""
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f_brenda:
+        for ec in ecs:
+            f_brenda.write(BRENDA_PARSER_MMAP.ec_text[ec])
+    return path
+
+
+def test_mmap_crlf(tmp_path: Path) -> None:
+    """Test that memory-mapped entries of CRLF file are parsed identically."""
+    ecs = ["1.1.1.1", "1.1.1.2"]
+    brenda_file = _write_crlf_file(tmp_path / "brenda.txt", ecs)
+    brenda = BrendaParser(brenda_file=brenda_file, mmap=True)
+    assert "\r" not in brenda.ec_text["1.1.1.1"]
+    for ec in ecs:
+        assert brenda.ec_text[ec] == BRENDA_PARSER_MMAP.ec_text[ec]
+    assert dict(brenda.iter_entries()) == dict(BRENDA_PARSER.iter_entries(ecs))
+
+
+def test_index_crlf(tmp_path: Path) -> None:
+    """Test that entries of CRLF file read via the index are parsed identically."""
+    ecs = ["1.1.1.1", "1.1.1.2"]
+    brenda_file = _write_crlf_file(tmp_path / "brenda.txt", ecs)
+    brenda = BrendaParser(brenda_file=brenda_file)
+    assert brenda.entry_index
+    brenda_noindex = BrendaParser(brenda_file=brenda_file, index=False)
+    assert brenda.ec_text["1.1.1.1"] == BRENDA_PARSER.ec_text["1.1.1.1"]
+    info_dicts = dict(brenda.iter_entries())
+    assert info_dicts == dict(brenda_noindex.iter_entries())
+    assert info_dicts == dict(BRENDA_PARSER.iter_entries(ecs))
+
+
+def test_entry_index_dict() -> None:
+    """Test serialization of entry index."""
+    entry_index = BRENDA_PARSER.entry_index
+    assert entry_index
+    entry_index2 = EntryIndex.from_dict(entry_index.to_dict())
+    assert entry_index2.offsets == entry_index.offsets
+    assert entry_index2.checksums == entry_index.checksums
+    assert entry_index2.sha256 == entry_index.sha256
+
+
+def test_sidecar_index(tmp_path: Path) -> None:
+    """Test writing and reading of sidecar index."""
+    brenda_file = _write_brenda_file(tmp_path / "brenda.txt", ["1.1.1.1", "1.1.1.2"])
+    entry_index = load_entry_index(brenda_file)
+    assert index_path(brenda_file).exists()
+    assert list(entry_index.offsets.keys()) == ["1.1.1.1", "1.1.1.2"]
+
+    entry_index2 = load_entry_index(brenda_file)
+    assert entry_index2.offsets == entry_index.offsets
+    assert entry_index2.checksums == entry_index.checksums
+
+
+def test_sidecar_index_touched(tmp_path: Path) -> None:
+    """Test that index is kept if only the mtime changed."""
+    brenda_file = _write_brenda_file(tmp_path / "brenda.txt", ["1.1.1.1"])
+    entry_index = load_entry_index(brenda_file)
+    os.utime(brenda_file, ns=(0, entry_index.mtime_ns + 10**9))
+    entry_index2 = load_entry_index(brenda_file)
+    assert entry_index2.sha256 == entry_index.sha256
+    assert entry_index2.mtime_ns == entry_index.mtime_ns + 10**9
+
+
+def test_sidecar_index_changed(tmp_path: Path) -> None:
+    """Test rescan of changed file."""
+    brenda_file = _write_brenda_file(tmp_path / "brenda.txt", ["1.1.1.1"])
+    entry_index = load_entry_index(brenda_file)
+    _write_brenda_file(brenda_file, ["1.1.1.1", "1.1.1.2"])
+    entry_index2 = load_entry_index(brenda_file)
+    assert entry_index2.sha256 != entry_index.sha256
+    assert "1.1.1.2" in entry_index2.offsets
+    assert entry_index2.checksums["1.1.1.1"] == entry_index.checksums["1.1.1.1"]
+
+
+def test_parser_without_index() -> None:
+    """Test parsing without sidecar index."""
+    brenda = BrendaParser(index=False)
+    assert brenda.entry_index is None
+    assert list(brenda.keys()) == list(BRENDA_PARSER.keys())
+
+
+def test_release_diff() -> None:
+    """Test difference of entries between releases."""
+    old: Dict[Optional[str], Optional[str]] = {
+        "1.1.1.1": "a",
+        "1.1.1.2": "b",
+        "1.1.1.3": "c",
+    }
+    new: Dict[Optional[str], Optional[str]] = {
+        "1.1.1.1": "a",
+        "1.1.1.3": "x",
+        "1.1.1.4": "d",
+    }
+    diff = release_diff(old, new)
+    assert diff.added == ["1.1.1.4"]
+    assert diff.removed == ["1.1.1.2"]
+    assert diff.changed == ["1.1.1.3"]
+    assert diff.unchanged == ["1.1.1.1"]
+    assert diff.outdated == ["1.1.1.4", "1.1.1.3"]
+    assert not diff.is_empty()
+    assert release_diff(new, new).is_empty()
+
+
+def test_parser_release_diff(tmp_path: Path) -> None:
+    """Test release diff of the parser."""
+    brenda_file = _write_brenda_file(tmp_path / "brenda.txt", ["1.1.1.1", "1.1.1.2"])
+    brenda = BrendaParser(brenda_file=brenda_file)
+    assert BRENDA_PARSER.entry_index
+    diff = brenda.release_diff(BRENDA_PARSER.entry_index.checksums)
+    assert diff.unchanged == ["1.1.1.1", "1.1.1.2"]
+    assert not diff.added
+    assert not diff.changed
@@ -0,0 +1,135 @@
+"""Test indexes over all EC numbers."""
+from pathlib import Path
+
+import pytest
+
+from brendapy import BrendaParser, BrendaProtein
+from brendapy.indexes import OrganismIndex, SubstrateIndex, UniprotIndex
+from brendapy.parser import TAXONOMY
+
+
+BRENDA_PARSER = BrendaParser(mmap=True)
+ECS = ["1.1.1.1", "1.1.1.2", "2.6.1.42"]
+
+
+@pytest.fixture
+def parser(tmp_path: Path) -> BrendaParser:
+    """Parser for subset of the BRENDA file."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+    return BrendaParser(brenda_file=brenda_file)
+
+
+def test_substrate_index(parser: BrendaParser) -> None:
+    """Test substrate index."""
+    index = SubstrateIndex.from_parser(parser)
+    assert SubstrateIndex.index_path(parser).exists()
+
+    postings = index.proteins_for_substrate("2-Oxoglutarate")
+    assert ("2.6.1.42", 5, "KM", 0) in postings
+    for ec, pid, bid, position in postings:
+        item = getattr(parser.get_proteins(ec)[pid], bid)[position]
+        assert item["substrate"].lower() == "2-oxoglutarate"
+        if "chebi" in item:
+            chebi_postings = index.proteins_for_substrate(item["chebi"])
+            assert (ec, pid, bid, position) in chebi_postings
+
+
+def test_substrate_index_cached(parser: BrendaParser) -> None:
+    """Test loading of stored substrate index."""
+    index = SubstrateIndex.from_parser(parser)
+    index2 = SubstrateIndex.load(SubstrateIndex.index_path(parser))
+    assert index2
+    assert parser.entry_index
+    assert index2.sha256 == parser.entry_index.sha256
+    assert index2.tables == index.tables
+
+
+def test_index_get_proteins(parser: BrendaParser) -> None:
+    """Test proteins for postings."""
+    index = SubstrateIndex.from_parser(parser)
+    postings = index.proteins_for_substrate("2-oxoglutarate")
+    proteins = SubstrateIndex.get_proteins(parser, postings)
+    assert proteins
+    assert all(p.ec in ECS for p in proteins)
+
+
+def test_organism_index(parser: BrendaParser) -> None:
+    """Test organism index."""
+    index = OrganismIndex.from_parser(parser)
+    postings = index.proteins_for_organism("Homo sapiens")
+    assert ("1.1.1.1", 107) in postings
+    assert index.proteins_for_taxonomy(9606) == postings
+    assert index.proteins_for_taxonomy("TAX:9606") == postings
+
+    for protein in OrganismIndex.get_proteins(parser, postings):
+        assert protein.organism == "Homo sapiens"
+        assert protein.taxonomy == 9606
+
+
+def test_organism_index_clade(parser: BrendaParser) -> None:
+    """Test proteins of the organisms in a clade."""
+    index = OrganismIndex.from_parser(parser)
+    postings = index.proteins_for_clade(40674)
+    assert set(index.proteins_for_taxonomy(9606)) <= set(postings)
+    for protein in OrganismIndex.get_proteins(parser, postings):
+        assert 40674 in TAXONOMY.get_parent_nodes(protein.taxonomy)
+    assert index.proteins_for_clade(1) == [
+        posting
+        for postings in index.tables["taxonomy"].values()
+        for posting in postings
+    ]
+
+
+def test_organism_index_cached(parser: BrendaParser) -> None:
+    """Test loading of stored organism index."""
+    index = OrganismIndex.from_parser(parser)
+    index2 = OrganismIndex.load(OrganismIndex.index_path(parser))
+    assert index2
+    assert index2.tables == index.tables
+    assert 9031 in index2.tables["taxonomy"]
+
+
+def test_parse_uniprots() -> None:
+    """Test parsing of all accessions from PR information."""
+    uniprots = BrendaProtein.parse_uniprots(
+        "Homo sapiens P00325 and P00326 and P00325 UniProt"
+    )
+    assert uniprots == ["P00325", "P00326"]
+    assert BrendaProtein.parse_uniprots("Homo sapiens") == []
+
+
+def test_uniprot_index(parser: BrendaParser) -> None:
+    """Test UniProt index."""
+    index = UniprotIndex.from_parser(parser)
+    assert ("1.1.1.1", 110) in index.proteins_for_uniprot("P08319")
+    assert ("1.1.1.1", 121) in index.proteins_for_uniprot("P00331")
+
+    results = index.proteins_for_uniprots(["P08319", "P00331", "no accession"])
+    assert set(results.keys()) == {"P08319", "P00331"}
+    proteins = UniprotIndex.get_proteins(parser, results["P08319"])
+    assert proteins[0].uniprot == "P08319"
+
+
+def test_index_update(parser: BrendaParser) -> None:
+    """Test update of stored index for new release."""
+    SubstrateIndex.from_parser(parser)
+    with open(parser.brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ["2.6.1.42", "1.1.1.1"]:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+    parser2 = BrendaParser(brenda_file=parser.brenda_file)
+    index = SubstrateIndex.from_parser(parser2)
+    assert index.checksums == parser2.checksums
+    assert index.tables == SubstrateIndex.build(parser2).tables
+
+
+def test_substrate_index_fields(parser: BrendaParser) -> None:
+    """Test that the stored index does not depend on the fields of the parser."""
+    brenda = BrendaParser(brenda_file=parser.brenda_file, fields=["TN"])
+    index = SubstrateIndex.from_parser(brenda)
+    index2 = SubstrateIndex.from_parser(parser)
+    assert index2.tables == index.tables
+    assert index2.tables == SubstrateIndex.build(parser).tables
+    assert any(posting[2] == "KM" for posting in index2.proteins_for_substrate("ATP"))
@@ -0,0 +1,93 @@
+"""Test columnar kinetics table."""
+from pathlib import Path
+from typing import Any, Iterator, Set, Tuple
+
+import numpy as np
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.kinetics import KineticsTable, build_kinetics_table
+
+
+BRENDA_PARSER = BrendaParser(mmap=True)
+ECS = ["1.1.1.1", "1.1.1.2", "2.6.1.42"]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory: pytest.TempPathFactory) -> KineticsTable:
+    """Build kinetics table for subset of the BRENDA file."""
+    brenda_file = tmp_path_factory.mktemp("kinetics") / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    return build_kinetics_table(BrendaParser(brenda_file=brenda_file))
+
+
+def test_kinetics_table(table: KineticsTable) -> None:
+    """Test columns of kinetics table."""
+    assert len(table) > 0
+    assert table.value.dtype == np.float64
+    assert table.ec.dtype == np.int32
+    assert table.categories["ec"] == ECS
+
+
+def test_kinetics_mask(table: KineticsTable) -> None:
+    """Test filtering of kinetics table."""
+    mask = table.mask(ec="2.6.1.42", key="KM", substrate="2-oxoglutarate")
+    values = table.filter(mask)
+    assert len(values) > 0
+    assert 2.4 in values.value
+
+    proteins = BRENDA_PARSER.get_proteins("2.6.1.42")
+    n_values = sum(
+        1
+        for p in proteins.values()
+        for item in (p.KM or [])
+        if item.get("substrate") == "2-oxoglutarate" and "value" in item
+    )
+    assert len(values) == n_values
+
+
+def test_kinetics_dataframe(table: KineticsTable) -> None:
+    """Test conversion to DataFrame."""
+    df = table.to_dataframe()
+    assert len(df) == len(table)
+    assert set(df["key"].unique()) <= set(BrendaParser.UNITS.keys())
+    assert np.shares_memory(df["value"].to_numpy(), table.value)
+
+
+def test_kinetics_save_load(table: KineticsTable, tmp_path: Path) -> None:
+    """Test storing of kinetics table."""
+    path = tmp_path / "kinetics.npz"
+    table.save(path)
+    table2 = KineticsTable.load(path)
+    assert table2.categories == table.categories
+    np.testing.assert_array_equal(table2.value, table.value)
+    np.testing.assert_array_equal(table2.taxonomy_ids, table.taxonomy_ids)
+
+
+def test_kinetics_fields(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only the kinetic keys and the proteins are parsed."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ["1.1.1.1", "1.1.1.2"]:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+    parser = BrendaParser(brenda_file=brenda_file)
+
+    parsed_keys: Set[str] = set()
+    iter_entries = parser.iter_entries
+
+    def _iter_entries(*args: Any, **kwargs: Any) -> Iterator[Tuple]:
+        for ec, ec_data in iter_entries(*args, **kwargs):
+            parsed_keys.update(ec_data.keys())
+            yield ec, ec_data
+
+    monkeypatch.setattr(parser, "iter_entries", _iter_entries)
+    table = build_kinetics_table(parser, keys=["KM"])
+    assert parsed_keys <= {"KM"} | BrendaParser.REQUIRED_FIELDS
+    assert "PR" in parsed_keys
+
+    table2 = build_kinetics_table(BrendaParser(brenda_file=brenda_file), keys=["KM"])
+    assert table.categories == table2.categories
+    np.testing.assert_array_equal(table.value, table2.value)
@@ -0,0 +1,79 @@
+"""Test memory footprint report."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.memory import MemoryReport, deep_size, trace_allocations
+
+
+def test_deep_size() -> None:
+    """Test deep size of nested and shared objects."""
+    item = {"value": 1.0, "comment": "pH 7.0"}
+    assert deep_size(item) > sys.getsizeof(item)
+    assert deep_size([item, item]) == sys.getsizeof([item, item]) + deep_size(item)
+
+    seen: set = set()
+    deep_size(item, seen)
+    assert deep_size(item, seen) == 0
+
+
+def test_memory_report(tmp_path: Path) -> None:
+    """Test memory report of the parser."""
+    brenda = BrendaParser()
+    report = brenda.memory_report(ecs=["1.1.1.1"], parse=True)
+    assert isinstance(report, MemoryReport)
+    for structure in ["ec_text", "ec_data", "proteins", "diagnostics"]:
+        assert structure in report.structures
+    assert report.structures["ec_data"] > 0
+    assert report.structures["proteins"] > 0
+    assert list(report.ecs) == ["1.1.1.1"]
+    assert report.keys["PR"] > 0
+    assert sum(report.keys.values()) <= report.structures["ec_data"]
+    assert report.total_ecs <= report.total
+    assert report.traced is None
+
+    path = tmp_path / "memory.json"
+    report.to_json(path)
+    with open(path, "r") as f_json:
+        assert json.load(f_json)["total"] == report.total
+    assert "ec_data" in report.report()
+
+
+def test_memory_report_resolve() -> None:
+    """Test that resolved proteins are larger."""
+    brenda = BrendaParser()
+    report = brenda.memory_report(ecs=["1.1.1.1"], parse=True)
+    brenda2 = BrendaParser()
+    report2 = brenda2.memory_report(ecs=["1.1.1.1"], parse=True, resolve=True)
+    assert report2.structures["proteins"] > report.structures["proteins"]
+
+    protein = brenda.get_proteins("1.1.1.1")[1]
+    protein.resolve()
+    assert protein.data is protein.data
+    assert "taxonomy" in protein._cache
+
+
+def test_memory_report_trace() -> None:
+    """Test tracing of the allocations of the parsing."""
+    brenda = BrendaParser()
+    report = brenda.memory_report(ecs=["1.1.1.1"], parse=True, trace=True)
+    assert report.traced is not None
+    assert report.traced["peak"] > 0
+    assert report.traced["top"]
+    assert "traced allocations" in report.report()
+
+    with pytest.raises(ValueError):
+        brenda.memory_report(trace=True)
+
+
+def test_trace_allocations() -> None:
+    """Test tracemalloc context manager."""
+    with trace_allocations(top=5) as traced:
+        data = [str(k) for k in range(10000)]
+    assert traced["size"] > 0
+    assert traced["peak"] >= traced["size"]
+    assert len(traced["top"]) <= 5
+    assert data
@@ -0,0 +1,61 @@
+"""Test metrics of the parse stages."""
+import json
+from pathlib import Path
+
+from brendapy import BrendaParser
+from brendapy.metrics import Metrics
+
+
+def test_metrics() -> None:
+    """Test timers and counters."""
+    metrics = Metrics()
+    with metrics.timer("parse"):
+        metrics.count("lines", 3)
+    metrics.add_time("parse", 1.0, calls=2)
+    metrics.count("lines")
+
+    d = metrics.to_dict()
+    assert d["timers"]["parse"]["calls"] == 3
+    assert d["timers"]["parse"]["seconds"] >= 1.0
+    assert d["counters"] == {"lines": 4}
+
+    metrics2 = Metrics()
+    metrics2.merge(metrics)
+    metrics2.merge(metrics)
+    assert metrics2.to_dict()["counters"] == {"lines": 8}
+    assert "parse" in metrics2.report()
+
+    metrics.clear()
+    assert metrics.to_dict() == {"timers": {}, "counters": {}}
+
+
+def test_parser_metrics(tmp_path: Path) -> None:
+    """Test metrics of the parser."""
+    assert BrendaParser().metrics is None
+
+    brenda = BrendaParser(metrics=True)
+    proteins = brenda.get_proteins("1.1.1.1")
+    proteins[1].taxonomy
+
+    assert brenda.metrics
+    d = brenda.metrics.to_dict()
+    for timer in ["scan", "entry", "split", "tokenize", "store.PR", "protein"]:
+        assert timer in d["timers"]
+    assert d["timers"]["protein"]["calls"] == len(proteins)
+    assert d["counters"]["regex.all"] > 0
+    assert d["counters"]["lookup.taxonomy"] == 1
+
+    path = tmp_path / "metrics.json"
+    brenda.metrics.to_json(path)
+    with open(path, "r") as f_json:
+        assert json.load(f_json) == json.loads(json.dumps(d))
+
+
+def test_parser_metrics_jobs() -> None:
+    """Test metrics of parallel parsing."""
+    brenda = BrendaParser(metrics=True)
+    brenda.parse_info_dicts()
+    brenda2 = BrendaParser(metrics=True)
+    brenda2.parse_info_dicts(jobs=2)
+    assert brenda.metrics and brenda2.metrics
+    assert brenda.metrics.counters == brenda2.metrics.counters
@@ -0,0 +1,80 @@
+"""Test lazy loading of resources."""
+import json
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+from brendapy import registry
+
+
+# generous budget for `import brendapy`, the resources are not loaded
+IMPORT_BUDGET = 2.0
+
+IMPORT_SCRIPT = """
+import json, sys, time
+t_start = time.perf_counter()
+import brendapy
+seconds = time.perf_counter() - t_start
+from brendapy import registry
+print(json.dumps({
+    "seconds": seconds,
+    "loaded": [name for name in registry._RESOURCES if registry.is_loaded(name)],
+    "modules": [m for m in ("pronto", "depinfo", "requests") if m in sys.modules],
+}))
+"""
+
+
+def test_import_lazy() -> None:
+    """Test that importing brendapy does not load resources."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["modules"] == []
+    assert result["seconds"] < IMPORT_BUDGET
+
+
+def test_resource() -> None:
+    """Test loading of resource on first access."""
+    calls = []
+
+    def load() -> Dict[str, int]:
+        calls.append(1)
+        return {"a": 1}
+
+    resource = registry.register("test", load)
+    assert not registry.is_loaded("test")
+    assert registry.get_resource("test") == {"a": 1}
+    assert registry.get_resource("test") == {"a": 1}
+    assert registry.is_loaded("test")
+    assert len(calls) == 1
+
+    registry.clear("test")
+    assert not resource.loaded
+    registry.get_resource("test")
+    assert len(calls) == 2
+    del registry._RESOURCES["test"]
+
+
+def test_resource_unknown() -> None:
+    """Test unknown resource."""
+    with pytest.raises(KeyError):
+        registry.get_resource("unknown")
+
+
+def test_resources() -> None:
+    """Test the registered resources."""
+    from brendapy.parser import TAXONOMY
+    from brendapy.substances import CHEBI
+    from brendapy.tissues import BTO
+
+    assert registry.get_resource("taxonomy") is TAXONOMY
+    assert registry.get_resource("chebi") is CHEBI
+    assert registry.get_resource("bto") is BTO
+    assert TAXONOMY.get_taxonomy_id("Homo sapiens") == 9606
@@ -0,0 +1,99 @@
+"""Test binary store of parsed BRENDA information."""
+from pathlib import Path
+
+import pytest
+
+from brendapy import BrendaParser
+from brendapy.store import BrendaStore, build_store, update_store
+
+
+BRENDA_PARSER = BrendaParser(mmap=True)
+ECS = ["1.1.1.1", "1.1.1.2", "2.6.1.42", "6.4.1.3"]
+
+
+@pytest.fixture
+def store_path(tmp_path: Path) -> Path:
+    """Build store for subset of the BRENDA file."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    path = tmp_path / "brenda.store"
+    build_store(BrendaParser(brenda_file=brenda_file), path)
+    return path
+
+
+def test_store(store_path: Path) -> None:
+    """Test random access to store."""
+    store = BrendaStore(store_path)
+    assert list(store.keys()) == ECS
+    for ec in ECS:
+        assert store[ec] == BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    assert BRENDA_PARSER.entry_index
+    assert store.checksums["1.1.1.1"] == BRENDA_PARSER.entry_index.checksums["1.1.1.1"]
+    store.close()
+
+
+def test_parser_from_store(store_path: Path) -> None:
+    """Test proteins from store."""
+    brenda = BrendaParser(store=store_path)
+    assert list(brenda.keys()) == ECS
+    proteins = brenda.get_proteins("1.1.1.1")
+    assert len(proteins) == 167
+    assert proteins[1].organism == "Gallus gallus"
+    assert proteins[1].data == BRENDA_PARSER.get_proteins("1.1.1.1")[1].data
+
+
+def test_invalid_store(tmp_path: Path) -> None:
+    """Test that invalid stores are rejected."""
+    path = tmp_path / "invalid.store"
+    with open(path, "wb") as f_store:
+        f_store.write(b"no BRENDA store")
+    with pytest.raises(IOError):
+        BrendaStore(path)
+
+
+def _write_release(brenda_file: Path) -> None:
+    """Write new release with removed, changed and unchanged entries."""
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ["1.1.1.1", "6.4.1.3", "2.6.1.42"]:
+            ec_str = BRENDA_PARSER.ec_text[ec]
+            if ec == "6.4.1.3":
+                ec_str = ec_str.replace("\n\n", "\nKM\t#1# 0.5 {ATP} <1>\n\n", 1)
+            f_brenda.write(ec_str)
+
+
+def test_update_store(store_path: Path) -> None:
+    """Test update of store for new release."""
+    brenda_file = store_path.parent / "brenda.txt"
+    _write_release(brenda_file)
+    brenda = BrendaParser(brenda_file=brenda_file)
+    store, diff = update_store(brenda, store_path)
+    assert diff.removed == ["1.1.1.2"]
+    assert diff.changed == ["6.4.1.3"]
+    assert not diff.added
+
+    store2 = build_store(brenda, store_path.parent / "brenda2.store")
+    assert list(store.keys()) == list(store2.keys())
+    for ec in store2:
+        assert store[ec] == store2[ec]
+    assert store.checksums == store2.checksums
+    store.close()
+    store2.close()
+
+
+def test_store_fields(tmp_path: Path) -> None:
+    """Test that all BRENDA keys are stored for a parser with field selection."""
+    brenda_file = tmp_path / "brenda.txt"
+    with open(brenda_file, "w", encoding="utf-8") as f_brenda:
+        for ec in ECS:
+            f_brenda.write(BRENDA_PARSER.ec_text[ec])
+
+    path = tmp_path / "brenda.store"
+    build_store(BrendaParser(brenda_file=brenda_file, fields=["KM"]), path)
+    update_store(BrendaParser(brenda_file=brenda_file), path)
+    store = BrendaStore(path)
+    for ec in ECS:
+        assert store[ec] == BrendaParser._parse_info_dict(ec, BRENDA_PARSER.ec_text[ec])
+    store.close()
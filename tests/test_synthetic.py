@@ -0,0 +1,70 @@
+"""Test synthetic BRENDA files and taxonomy dumps."""
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from brendapy import BrendaParser, registry, synthetic
+from brendapy.diagnostics import DIAGNOSTICS
+from brendapy.taxonomy import parse_taxonomy_data
+
+
+@pytest.fixture
+def synthetic_resources(tmp_path: Path) -> Iterator[Path]:
+    """Register synthetic resources, the default resources are restored."""
+    taxdmp = synthetic.write_taxdmp(tmp_path / "taxdmp.zip", n_species=100)
+    taxonomy_file = tmp_path / "taxonomy.bin"
+    parse_taxonomy_data(f_zip=taxdmp, f_out=taxonomy_file)
+    synthetic.register_resources(taxonomy_file=taxonomy_file)
+    yield tmp_path
+    registry.register("taxonomy", registry._load_taxonomy)
+    registry.register("chebi", registry._load_chebi)
+    registry.register("bto", registry._load_bto)
+
+
+def test_write_brenda_file(tmp_path: Path) -> None:
+    """Test that the synthetic files only depend on the arguments."""
+    path1 = synthetic.write_brenda_file(tmp_path / "brenda1.txt", n_ecs=5)
+    path2 = synthetic.write_brenda_file(tmp_path / "brenda2.txt", n_ecs=5)
+    path3 = synthetic.write_brenda_file(tmp_path / "brenda3.txt", n_ecs=5, seed=1)
+    assert path1.read_text() == path2.read_text()
+    assert path1.read_text() != path3.read_text()
+
+
+def test_parse_synthetic(synthetic_resources: Path) -> None:
+    """Test parsing of synthetic BRENDA file."""
+    path = synthetic.write_brenda_file(
+        synthetic_resources / "brenda.txt", n_ecs=10, proteins_per_ec=5, n_species=100
+    )
+    brenda = BrendaParser(brenda_file=path, index=False)
+    assert len(brenda.keys()) == 10
+
+    DIAGNOSTICS.clear()
+    ec_data = brenda.parse_info_dicts()
+    for ec in brenda.keys():
+        assert set(ec_data[ec]) == set(BrendaParser.BRENDA_KEYS)
+    categories = DIAGNOSTICS.category_counts()
+    assert "item_not_parsed" not in categories
+    assert "reference_not_parsed" not in categories
+    assert categories["generic_synonym"] > 0
+
+
+def test_synthetic_taxonomy(synthetic_resources: Path) -> None:
+    """Test taxonomy lookup of the synthetic organisms."""
+    path = synthetic.write_brenda_file(
+        synthetic_resources / "brenda.txt", n_ecs=10, proteins_per_ec=5, n_species=100
+    )
+    brenda = BrendaParser(brenda_file=path, index=False)
+    ec = list(brenda.keys())[0]
+    resolved = [
+        protein.taxonomy
+        for protein in brenda.get_proteins(ec).values()
+        if protein.organism != synthetic.UNKNOWN_ORGANISM
+    ]
+    assert resolved
+    assert all(tax_id is not None for tax_id in resolved)
+
+    taxonomy = registry.get_resource("taxonomy")
+    tax_id = taxonomy.get_taxonomy_id(synthetic.organism_names(100)[0])
+    assert taxonomy.get_rank(tax_id) == "species"
+    assert taxonomy.get_taxonomy_id(synthetic.UNKNOWN_ORGANISM, warn=False) is None
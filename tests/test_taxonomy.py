@@ -1,6 +1,10 @@
 """Test taxonomy."""
+from pathlib import Path
 
-from brendapy.taxonomy import Taxonomy
+import pytest
+
+from brendapy.settings import TAXONOMY_ZIP
+from brendapy.taxonomy import Taxonomy, parse_taxonomy_data
 
 
 TAXONOMY = Taxonomy()
@@ -15,6 +19,16 @@ def test_get_taxonomy_id() -> None:
     assert tid == 10090
 
 
+def test_get_taxonomy_id_memoized() -> None:
+    """Test that resolved names are looked up once per taxonomy file."""
+    assert TAXONOMY.get_taxonomy_id("Homo sapiens") == 9606
+    assert TAXONOMY.get_taxonomy_id("Unknownia strangeii", warn=False) is None
+    resolved = Taxonomy._resolved[TAXONOMY._key]
+    assert resolved["Homo sapiens"] == 9606
+    assert resolved["Unknownia strangeii"] is None
+    assert Taxonomy().get_taxonomy_id("Homo sapiens") == 9606
+
+
 def test_get_scientific_name() -> None:
     """Test get scientific name."""
     tid = TAXONOMY.get_scientific_name(9606)
@@ -60,6 +74,127 @@ def test_find_common_node2() -> None:
     assert common1[1] == common2[1]
 
 
+def test_find_common_node_root() -> None:
+    """Test common node with the root."""
+    common = TAXONOMY.find_common_node(1, 9606)
+    assert common[0] == 1
+    assert common[2] == len(TAXONOMY.get_parent_nodes(9606)) - 1
+
+
+def test_find_common_node_parent_nodes() -> None:
+    """Test common node against the parent nodes."""
+    nodes1 = TAXONOMY.get_parent_nodes(10090)
+    nodes2 = TAXONOMY.get_parent_nodes(9606)
+    common = TAXONOMY.find_common_node(10090, 9606)
+    assert common[0] in nodes1
+    assert nodes2.index(common[0]) == common[2]
+    assert nodes1[nodes1.index(common[0]) - 1] not in nodes2
+
+
+def test_find_common_nodes() -> None:
+    """Test common nodes for multiple species."""
+    tax_ids = [10090, 9606, "TAX:7227", None, 10**9]
+    common, distance = TAXONOMY.find_common_nodes(tax_ids, 9606)
+    for k, tax_id in enumerate(tax_ids[:3]):
+        tid, _, dist = TAXONOMY.find_common_node(tax_id, 9606)
+        assert common[k] == tid
+        assert distance[k] == dist
+    assert common[1] == 9606
+    assert distance[1] == 0
+    assert list(common[3:]) == [-1, -1]
+    assert list(distance[3:]) == [-1, -1]
+
+
+def test_distance_matrix() -> None:
+    """Test pairwise common nodes and distances."""
+    tax_ids = [9606, 10090, 7227, 9606, None]
+    common, distance = TAXONOMY.distance_matrix(tax_ids)
+    assert common.shape == (5, 5)
+    assert distance.shape == (5, 5)
+    for i, tax_id in enumerate(tax_ids[:4]):
+        for j, tax_id_ref in enumerate(tax_ids[:4]):
+            tid, _, dist = TAXONOMY.find_common_node(tax_id, tax_id_ref)
+            assert common[i, j] == tid
+            assert distance[i, j] == dist
+    assert common[0, 0] == 9606
+    assert distance[0, 3] == 0
+    assert all(common[4, :] == -1)
+    assert all(distance[:, 4] == -1)
+
+
+def test_depth() -> None:
+    """Test depth of nodes."""
+    assert TAXONOMY.depth[1] == 0
+    assert TAXONOMY.depth[9606] == len(TAXONOMY.get_parent_nodes(9606)) - 1
+
+
+def test_get_rank() -> None:
+    """Test ranks of nodes."""
+    assert TAXONOMY.get_rank(9606) == "species"
+    assert TAXONOMY.get_rank("TAX:9605") == "genus"
+    assert TAXONOMY.get_rank(10**9) is None
+    assert "family" in TAXONOMY.ranks
+
+
+def test_ancestor_at_rank() -> None:
+    """Test ancestors at rank."""
+    tax_ids = [9606, 10090, "TAX:9605", 7227, None, 10**9]
+    ancestors = TAXONOMY.ancestor_at_rank(tax_ids, "genus")
+    assert list(ancestors) == [9605, 10088, 9605, -1, -1, -1]
+
+    for tax_id, ancestor in zip(
+        tax_ids[:4], TAXONOMY.ancestor_at_rank(tax_ids, "class")
+    ):
+        nodes = TAXONOMY.get_parent_nodes(tax_id)
+        ranks = [TAXONOMY.get_rank(node) for node in nodes]
+        assert ancestor == (nodes[ranks.index("class")] if "class" in ranks else -1)
+
+    with pytest.raises(ValueError):
+        TAXONOMY.ancestor_at_rank(tax_ids, "unknown rank")
+
+
+def test_group_by_rank() -> None:
+    """Test grouping of species by rank."""
+    groups = TAXONOMY.group_by_rank([9606, 7227, 10090, 9606, None], "family")
+    assert {tax_id: list(indices) for tax_id, indices in groups.items()} == {
+        -1: [1, 4],
+        9604: [0, 3],
+        10066: [2],
+    }
+
+
+def test_preorder_postorder() -> None:
+    """Test numbering of the nodes."""
+    assert TAXONOMY.preorder[1] == 0
+    assert TAXONOMY.postorder[1] == (TAXONOMY.depth >= 0).sum() - 1
+    for tax_id in [9606, 10090, 7227]:
+        for node in TAXONOMY.get_parent_nodes(tax_id)[1:]:
+            assert TAXONOMY.preorder[node] <= TAXONOMY.preorder[tax_id]
+            assert TAXONOMY.postorder[node] >= TAXONOMY.postorder[tax_id]
+    assert TAXONOMY.preorder[10**4 - 1] == -1
+
+
+def test_is_descendant() -> None:
+    """Test subtree check for single species."""
+    assert TAXONOMY.is_descendant(9606, 40674)
+    assert TAXONOMY.is_descendant("TAX:10090", 40674)
+    assert TAXONOMY.is_descendant(9606, 9606)
+    assert TAXONOMY.is_descendant(9606, 1)
+    assert not TAXONOMY.is_descendant(7227, 40674)
+    assert not TAXONOMY.is_descendant(40674, 9606)
+    assert not TAXONOMY.is_descendant(None, 40674)
+    assert not TAXONOMY.is_descendant(9606, 10**9)
+
+
+def test_in_subtree() -> None:
+    """Test subtree check for multiple species."""
+    tax_ids = [9606, 10090, 7227, 9031, None, 10**9]
+    mask = TAXONOMY.in_subtree(tax_ids, 40674)
+    assert list(mask) == [True, True, False, False, False, False]
+    for tax_id, in_clade in zip(tax_ids[:4], TAXONOMY.in_subtree(tax_ids, 7711)):
+        assert in_clade == (7711 in TAXONOMY.get_parent_nodes(tax_id))
+
+
 def test_parent_nodes() -> None:
     """Test parent nodes."""
     p1 = TAXONOMY.get_parent_nodes(tax_id=7227)
@@ -71,3 +206,40 @@ def test_parent_nodes() -> None:
 
     assert p1 == p2
     assert p1 == p3
+
+
+def test_taxonomy_file(tmp_path: Path) -> None:
+    """Test writing and memory-mapping of binary taxonomy file."""
+    path = tmp_path / "taxonomy.bin"
+    parse_taxonomy_data(f_zip=TAXONOMY_ZIP, f_out=path)
+    taxonomy = Taxonomy(path)
+    assert taxonomy.get_taxonomy_id("Homo sapiens") == 9606
+    assert taxonomy.get_scientific_name(9606) == "Homo sapiens"
+    assert taxonomy.get_parent_nodes(9606) == TAXONOMY.get_parent_nodes(9606)
+    assert not taxonomy.parent.flags.writeable
+    assert not Path(f"{path}.tmp").exists()
+
+
+def test_taxonomy_file_invalid(tmp_path: Path) -> None:
+    """Test that invalid taxonomy files are rejected."""
+    path = tmp_path / "taxonomy.bin"
+    with open(path, "wb") as f_out:
+        f_out.write(b"no taxonomy")
+    with pytest.raises(IOError):
+        Taxonomy(path)
+
+
+def test_missing_taxonomy_id() -> None:
+    """Test missing taxonomy information."""
+    assert TAXONOMY.get_taxonomy_id("Unknownia strangeii") is None
+    assert TAXONOMY.get_scientific_name(-1) is None
+    assert TAXONOMY.get_parent_nodes(10**9) is None
+
+
+def test_none_taxonomy_id() -> None:
+    """Test lookups for unresolved taxonomy ids of proteins."""
+    assert TAXONOMY.get_scientific_name(None) is None
+    assert TAXONOMY.get_parent_nodes(None) is None
+    assert TAXONOMY.get_rank(None) is None
+    assert TAXONOMY.find_common_node(None, 9606) == [None, None, -1]
+    assert not TAXONOMY.is_descendant(None, 9606)